@@ -0,0 +1,5 @@
+"""
+Benchmarks for the log viewer's parsing and pagination hot path.
+
+Run ``python -m benchmarks.run --help`` from the repository root.
+"""
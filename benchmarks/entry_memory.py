@@ -0,0 +1,66 @@
+"""
+Memory cost of formatted log entries.
+
+Formats a generated log in each requested format, keeping every entry
+alive, and reports the bytes allocated per entry as measured by
+``tracemalloc`` (the formatted entry and everything it references, such as
+its strings, timestamp and parsed fields).
+
+Usage (from the repository root)::
+
+    python -m benchmarks.entry_memory --entries 20000 --formats django_default,nginx_access
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+
+def measure_entry_memory(path, name, count):
+    """Bytes allocated per formatted entry of the first ``count`` entries of ``path``."""
+    from mamood_django_admin_log_viewer.utils import format_log_entries, iter_log_entries, paginate_log_entries
+
+    raw_entries = paginate_log_entries(iter_log_entries(path, name), 0, count)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        entries = list(format_log_entries(raw_entries, name))
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return (after - before) / len(entries)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--entries', type=int, default=20000)
+    parser.add_argument('--formats', default='django_default,nginx_access,syslog',
+                        help='comma separated LOG_VIEWER_FORMATS names')
+    args = parser.parse_args(argv)
+
+    from .loggen import write_log
+    from .run import setup_django
+
+    setup_django()
+
+    from django.test import override_settings
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        for format_name in args.formats.split(','):
+            name = f'memory-{format_name}.log'
+            path = os.path.join(data_dir, name)
+            # Entries average well under 400 bytes, tracebacks included
+            write_log(path, format_name, args.entries * 400)
+            with override_settings(LOG_VIEWER_FILES=[name], LOG_VIEWER_FILES_DIR=data_dir,
+                                   LOG_VIEWER_FILE_FORMATS={name: format_name}):
+                per_entry = measure_entry_memory(path, name, args.entries)
+            print(f'{format_name:15} {per_entry:8.0f} bytes/entry', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""
+Performance regression guard.
+
+Measures the throughput of a fixed set of hot-path operations
+(``process_log_lines_with_multiline``, ``format_log_line`` and the admin
+views) on small generated logs and compares it with the committed baseline
+in ``baseline.json``, failing when a case got slower than the tolerance
+allows.
+
+Throughputs are divided by the speed of a fixed pure-Python calibration
+workload run at the same time, so a baseline recorded on one machine stays
+meaningful on another.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.guard            # compare, exit 1 on regressions
+    python -m benchmarks.guard --update   # record a new baseline
+
+The same check runs in the test suite when ``LOG_VIEWER_PERF=1`` is set
+(see ``tests/test_performance.py``).
+"""
+
+import argparse
+import gc
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Fraction a normalized throughput may drop below the baseline before failing
+DEFAULT_TOLERANCE = 0.4
+
+GUARD_SIZE = 512 * 1024
+GUARD_FORMATS = ['django_default', 'nginx_access']
+# Only the default format goes through the admin views
+VIEW_FORMAT = 'django_default'
+
+CALIBRATION_LINE = 'INFO 2025-01-01 12:00:00,123 myapp.views: Request 42 processed in 17ms'
+CALIBRATION_PATTERN = re.compile(r'(?P<level>\w+)\s+(?P<timestamp>\S+\s+\S+)\s+(?P<module>[\w\.]+):\s*(?P<message>.*)')
+
+
+def _best_time(func, repeat):
+    """The fastest of ``repeat`` runs of ``func``, in seconds.
+
+    Like ``timeit``, garbage collection is paused while timing.
+    """
+    timings = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return min(timings)
+
+
+def calibrate(repeat=5, iterations=50000):
+    """Operations per second of a fixed regex/string/dict workload on this machine."""
+    def workload():
+        for i in range(iterations):
+            match = CALIBRATION_PATTERN.match(CALIBRATION_LINE)
+            parsed = match.groupdict()
+            parsed['line_number'] = i
+            parsed['message'].split()
+    return iterations / _best_time(workload, repeat)
+
+
+def measure_throughputs(client, data_dir, repeat=5):
+    """Items per second of every guarded case.
+
+    ``client`` must be logged in as a staff user. Logs are generated in
+    ``data_dir`` unless already present.
+    """
+    from django.test import override_settings
+    from django.urls import reverse
+
+    from mamood_django_admin_log_viewer.utils import format_log_line, process_log_lines_with_multiline
+    from .loggen import write_log
+
+    throughputs = {}
+    names = {}
+    for format_name in GUARD_FORMATS:
+        name = names[format_name] = f'guard-{format_name}.log'
+        path = os.path.join(data_dir, name)
+        if not os.path.exists(path):
+            write_log(path, format_name, GUARD_SIZE)
+
+    with override_settings(LOG_VIEWER_FILES=list(names.values()), LOG_VIEWER_FILES_DIR=data_dir,
+                           LOG_VIEWER_FILE_FORMATS={name: fmt for fmt, name in names.items()}):
+        for format_name, name in names.items():
+            with open(os.path.join(data_dir, name), encoding='utf-8') as f:
+                lines = f.readlines()
+
+            elapsed = _best_time(lambda: process_log_lines_with_multiline(lines, 1, name), repeat)
+            throughputs[f'process_log_lines_with_multiline[{format_name}]'] = len(lines) / elapsed
+
+            def format_lines():
+                for number, line in enumerate(lines, 1):
+                    format_log_line(line, number, name)
+            throughputs[f'format_log_line[{format_name}]'] = len(lines) / _best_time(format_lines, repeat)
+
+        name = names[VIEW_FORMAT]
+        views = {
+            'detail_view': (reverse('admin:log_viewer_detail', args=[name]), {}),
+            'live_ajax_view': (reverse('admin:log_viewer_ajax', args=[name]), {'live': 'true'}),
+            'page_ajax_view': (reverse('admin:log_viewer_ajax', args=[name]), {'page': 2}),
+        }
+        for case, (url, params) in views.items():
+            def request():
+                response = client.get(url, params)
+                assert response.status_code == 200, response.status_code
+            throughputs[f'{case}[{VIEW_FORMAT}]'] = 1 / _best_time(request, repeat)
+
+    return throughputs
+
+
+def measure_scores(client, data_dir, repeat=5):
+    """Throughputs of every guarded case, normalized by the calibration speed."""
+    speed = calibrate(repeat)
+    throughputs = measure_throughputs(client, data_dir, repeat)
+    # Calibrate again and keep the faster result, in case the machine was busy
+    speed = max(speed, calibrate(repeat))
+    return {case: throughput / speed for case, throughput in throughputs.items()}
+
+
+def load_baseline(path=BASELINE_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def find_regressions(scores, baseline, tolerance=None):
+    """Cases whose score dropped more than ``tolerance`` below the baseline.
+
+    Returns ``(case, baseline_score, score)`` tuples. Cases missing from
+    either side are ignored.
+    """
+    if tolerance is None:
+        tolerance = baseline.get('tolerance', DEFAULT_TOLERANCE)
+    regressions = []
+    for case, expected in baseline['scores'].items():
+        score = scores.get(case)
+        if score is not None and score < expected * (1 - tolerance):
+            regressions.append((case, expected, score))
+    return regressions
+
+
+def _run_with_client(data_dir, repeat):
+    from .run import setup_django
+
+    setup_django()
+
+    from django.contrib.auth.models import User
+    from django.test import Client
+
+    client = Client()
+    client.force_login(User.objects.create_superuser('benchmark', 'benchmark@example.com', 'benchmark'))
+    return measure_scores(client, data_dir, repeat)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update', action='store_true', help='record the measured scores as the new baseline')
+    parser.add_argument('--tolerance', type=float,
+                        help=f'allowed fractional drop (default: from the baseline, else {DEFAULT_TOLERANCE})')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        scores = _run_with_client(data_dir, args.repeat)
+
+    if args.update:
+        with open(args.baseline, 'w') as f:
+            json.dump({'tolerance': args.tolerance or DEFAULT_TOLERANCE, 'scores': scores}, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'Baseline written to {args.baseline}')
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    for case, score in sorted(scores.items()):
+        expected = baseline['scores'].get(case)
+        change = f'{(score / expected - 1) * 100:+7.1f}%' if expected else '    new'
+        print(f'{case:50} {change}')
+
+    regressions = find_regressions(scores, baseline, args.tolerance)
+    for case, expected, score in regressions:
+        print(f'REGRESSION {case}: {score:.6g} vs baseline {expected:.6g}', file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
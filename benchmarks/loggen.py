@@ -0,0 +1,128 @@
+"""
+Synthetic log generator for benchmarks.
+
+Generates deterministic log files of a given size in any of the formats in
+``defaults.LOG_VIEWER_FORMATS``, with a configurable share of multi-line
+entries (Python tracebacks), plus plain and gzip-compressed rotations.
+"""
+
+import gzip
+import os
+import random
+from datetime import datetime, timedelta
+
+LEVELS = ['DEBUG', 'INFO', 'INFO', 'INFO', 'INFO', 'WARNING', 'ERROR']
+MODULES = ['django.request', 'django.db.backends', 'myapp.views', 'myapp.tasks', 'celery.beat']
+MESSAGES = [
+    'Request {n} processed in {ms}ms',
+    'User {n} logged in from 10.0.{a}.{b}',
+    'Cache miss for key "session:{n}"',
+    'Task myapp.tasks.sync[{n}] succeeded in {ms}ms',
+    'Slow query ({ms}ms): SELECT * FROM app_item WHERE id = {n}',
+]
+URLS = ['/', '/admin/', '/api/items/{n}/', '/static/app.css', '/login/?next=/admin/']
+
+# Entries rendered per write() call
+WRITE_CHUNK_ENTRIES = 1000
+
+
+def _format_line(format_name, when, level, module, message, rng):
+    """Render the first line of one entry in the given format."""
+    if format_name in ('django_default', 'celery_beat'):
+        return f"{level} {when:%Y-%m-%d %H:%M:%S},{when.microsecond // 1000:03d} {module}: {message}"
+    if format_name == 'simple':
+        return f"{level}: {message}"
+    if format_name == 'celery_worker':
+        return f"[{when:%Y-%m-%d %H:%M:%S},{when.microsecond // 1000:03d}: {level}/MainProcess] {message}"
+    if format_name in ('nginx_access', 'apache_common'):
+        url = rng.choice(URLS).format(n=rng.randint(1, 9999))
+        status = rng.choice([200, 200, 200, 302, 404, 500])
+        protocol = 'HTTP/1.1'
+        return (f'192.168.{rng.randint(0, 255)}.{rng.randint(1, 254)} - - '
+                f'[{when:%d/%b/%Y:%H:%M:%S} +0000] "GET {url} {protocol}" {status} {rng.randint(100, 99999)}')
+    if format_name == 'nginx_error':
+        return f"{when:%Y/%m/%d %H:%M:%S} [{level.lower()}] {rng.randint(1, 999)}#0: *{rng.randint(1, 9999)} {message}"
+    if format_name == 'syslog':
+        return f"{when:%b %d %H:%M:%S} web01 {module}[{rng.randint(100, 9999)}]: {message}"
+    raise ValueError(f"No generator for log format '{format_name}'")
+
+
+def _traceback(rng, depth):
+    """Continuation lines of a Python traceback with ``depth`` frames."""
+    lines = ['Traceback (most recent call last):']
+    for frame in range(depth):
+        lines.append(f'  File "/srv/app/myapp/module_{frame}.py", line {rng.randint(1, 500)}, in handler_{frame}')
+        lines.append(f'    result = process(item_{frame})')
+    lines.append(f'ValueError: invalid value {rng.randint(1, 99999)}')
+    return lines
+
+
+def iter_entries(format_name, multiline_ratio=0.05, traceback_depth=10, seed=0,
+                 start=datetime(2025, 1, 1)):
+    """Yield ``(timestamp, text)`` of log entries forever, oldest first.
+
+    ``multiline_ratio`` is the share of entries followed by a traceback of
+    ``traceback_depth`` frames.
+    """
+    rng = random.Random(seed)
+    when = start
+    n = 0
+    while True:
+        n += 1
+        when += timedelta(milliseconds=rng.randint(1, 2000))
+        level = rng.choice(LEVELS)
+        message = rng.choice(MESSAGES).format(n=n, ms=rng.randint(1, 3000),
+                                              a=rng.randint(0, 255), b=rng.randint(1, 254))
+        lines = [_format_line(format_name, when, level, rng.choice(MODULES), message, rng)]
+        if rng.random() < multiline_ratio:
+            lines.extend(_traceback(rng, traceback_depth))
+        yield when, '\n'.join(lines) + '\n'
+
+
+def write_log(path, format_name, size_bytes, multiline_ratio=0.05, traceback_depth=10, seed=0,
+              start=datetime(2025, 1, 1)):
+    """Write a log file of about ``size_bytes`` (whole entries only).
+
+    Paths ending in ``.gz`` are gzip-compressed; ``size_bytes`` is then the
+    uncompressed size. Returns the number of entries written and the
+    timestamp of the last one.
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    entries = iter_entries(format_name, multiline_ratio, traceback_depth, seed, start)
+    written = count = 0
+    when = start
+    with opener(path, 'wt', encoding='utf-8', newline='\n') as f:
+        while written < size_bytes:
+            chunk = []
+            for _ in range(WRITE_CHUNK_ENTRIES):
+                when, entry = next(entries)
+                chunk.append(entry)
+                written += len(entry)
+                count += 1
+                if written >= size_bytes:
+                    break
+            f.write(''.join(chunk))
+    return count, when
+
+
+def write_rotated_logs(log_dir, name, format_name, size_bytes, rotations=1, **options):
+    """Write ``name`` plus ``rotations`` older rotations of the same size.
+
+    ``name.1`` is plain text and older rotations are gzip-compressed, the way
+    ``logrotate`` with ``delaycompress`` leaves them. Rotations hold earlier
+    timestamps than the current file. Returns the written paths, oldest first.
+    """
+    paths = []
+    start = datetime(2025, 1, 1)
+    for index in range(rotations, -1, -1):
+        if index == 0:
+            filename = name
+        elif index == 1:
+            filename = f'{name}.1'
+        else:
+            filename = f'{name}.{index}.gz'
+        path = os.path.join(log_dir, filename)
+        # Each file continues where the previous (older) one ended
+        _, start = write_log(path, format_name, size_bytes, start=start, seed=index, **options)
+        paths.append(path)
+    return paths
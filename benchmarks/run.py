@@ -0,0 +1,243 @@
+"""
+Benchmark runner for the parsing and pagination hot path.
+
+Generates synthetic logs (see loggen.py) for each requested format and size,
+then times the first page, last page, live refresh, full-file search and the
+admin views against them, using Django's test client on the ``myproject``
+sample project. Results are written as JSON so runs of different commits can
+be compared.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.run --sizes 1MB,10MB --formats django_default,nginx_access \\
+        --output benchmark.json
+
+Generated logs are kept in ``--data-dir`` and reused by later runs, so large
+sizes (up to several GB) are only generated once.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SIZE_UNITS = {'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
+
+SEARCH_PATTERN = re.compile(r'ValueError|Slow query')
+
+
+def parse_size(text):
+    """Parse a size such as ``512KB``, ``10MB`` or ``5GB`` into bytes."""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)\s*(KB|MB|GB)?', text.strip(), re.IGNORECASE)
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid size '{text}'")
+    number, unit = match.groups()
+    return int(float(number) * SIZE_UNITS.get((unit or '').upper(), 1))
+
+
+def setup_django():
+    """Configure Django with the sample project and an in-memory test database."""
+    sys.path[:0] = [ROOT, os.path.join(ROOT, 'myproject')]
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+
+    import django
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    from mamood_django_admin_log_viewer import defaults
+
+    django.setup()
+    setup_test_environment()
+    # Don't let the benchmark requests flood the sample project's logs
+    settings.LOGVIEWER_DISABLE_ACCESS_LOGS = True
+    # The sample project only configures a few formats; benchmark all built-in ones
+    settings.LOG_VIEWER_FORMATS = defaults.LOG_VIEWER_FORMATS
+    connection.creation.create_test_db(verbosity=0)
+
+
+def prepare_data(data_dir, format_name, size_bytes, options):
+    """Generate (or reuse) the logs of one benchmark case; returns its file name."""
+    from .loggen import write_rotated_logs
+
+    name = (f'{format_name}-{size_bytes}-r{options["rotations"]}'
+            f'-m{options["multiline_ratio"]}-d{options["traceback_depth"]}.log')
+    # The current file is written last, so its presence marks a complete set
+    if not os.path.exists(os.path.join(data_dir, name)):
+        write_rotated_logs(data_dir, name, format_name, size_bytes, options['rotations'],
+                           multiline_ratio=options['multiline_ratio'],
+                           traceback_depth=options['traceback_depth'])
+    return name
+
+
+def measure(func, repeat, setup=None):
+    """Time ``func`` ``repeat`` times, then once more under tracemalloc for its peak memory."""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+        'peak_alloc_bytes': peak,
+    }
+
+
+def get_cases(client, path, name, page_length):
+    """The benchmarked operations for one generated log, as ``(case, func, setup)``."""
+    from django.urls import reverse
+
+    from mamood_django_admin_log_viewer.index import clear_log_indexes
+    from mamood_django_admin_log_viewer.pagination import read_log_page
+    from mamood_django_admin_log_viewer.utils import filter_log_entries, iter_log_entries, read_log_file_multiline_aware
+
+    def first_page():
+        read_log_file_multiline_aware(path, page_length, 0, name)
+
+    def last_page():
+        # What live mode does
+        read_log_page(path, -1, page_length, name)
+
+    def search():
+        sum(1 for _ in filter_log_entries(iter_log_entries(path, name), SEARCH_PATTERN))
+
+    def get(url, params=None):
+        def request():
+            response = client.get(url, params)
+            assert response.status_code == 200, response.status_code
+            if hasattr(response, 'render'):
+                response.render()
+        return request
+
+    return [
+        ('first_page', first_page, None),
+        ('last_page', last_page, None),
+        ('search', search, None),
+        ('detail_view', get(reverse('admin:log_viewer_detail', args=[name])), None),
+        ('live_ajax_view', get(reverse('admin:log_viewer_ajax', args=[name]), {'live': 'true'}), None),
+        ('page_ajax_view', get(reverse('admin:log_viewer_ajax', args=[name]), {'page': 2}), None),
+        # Cold: the rotation group is indexed from scratch, gzip rotations included
+        ('group_view', get(reverse('admin:log_viewer_group', args=[name]), {'page': 1}), clear_log_indexes),
+    ]
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    """Run every benchmark case and return the results document."""
+    setup_django()
+
+    from django.contrib.auth.models import User
+    from django.test import Client, override_settings
+
+    from mamood_django_admin_log_viewer import defaults
+
+    formats = list(defaults.LOG_VIEWER_FORMATS) if args.formats == 'all' else args.formats.split(',')
+    os.makedirs(args.data_dir, exist_ok=True)
+    options = {
+        'rotations': args.rotations,
+        'multiline_ratio': args.multiline_ratio,
+        'traceback_depth': args.traceback_depth,
+    }
+
+    client = Client()
+    client.force_login(User.objects.create_superuser('benchmark', 'benchmark@example.com', 'benchmark'))
+
+    results = []
+    for size_bytes in args.sizes:
+        for format_name in formats:
+            name = prepare_data(args.data_dir, format_name, size_bytes, options)
+            path = os.path.join(args.data_dir, name)
+
+            with override_settings(LOG_VIEWER_FILES=[name], LOG_VIEWER_FILES_DIR=args.data_dir,
+                                   LOG_VIEWER_FILE_FORMATS={name: format_name},
+                                   LOG_VIEWER_PAGE_LENGTH=args.page_length):
+                for case, func, setup in get_cases(client, path, name, args.page_length):
+                    if args.cases and case not in args.cases:
+                        continue
+                    result = measure(func, args.repeat, setup)
+                    results.append({
+                        'case': case,
+                        'format': format_name,
+                        'size_bytes': size_bytes,
+                        **result,
+                    })
+                    print(f'{case:16} {format_name:15} {size_bytes:>12} '
+                          f'{result["median"] * 1000:10.2f} ms', file=sys.stderr)
+
+    return {
+        'created': datetime.now().isoformat(),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'options': {**options, 'repeat': args.repeat, 'page_length': args.page_length},
+        'results': results,
+        # Peak resident set size of the whole run, in KB (Linux) or bytes (macOS)
+        'peak_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='1MB',
+                        type=lambda value: [parse_size(size) for size in value.split(',')],
+                        help='comma separated file sizes, e.g. 1MB,100MB,5GB (default: 1MB)')
+    parser.add_argument('--formats', default='all',
+                        help='comma separated LOG_VIEWER_FORMATS names (default: all)')
+    parser.add_argument('--cases', type=lambda value: value.split(','),
+                        help='comma separated cases to run (default: all)')
+    parser.add_argument('--rotations', type=int, default=1,
+                        help='rotations per log; the first is plain, older ones gzip (default: 1)')
+    parser.add_argument('--multiline-ratio', type=float, default=0.05,
+                        help='share of entries followed by a traceback (default: 0.05)')
+    parser.add_argument('--traceback-depth', type=int, default=10,
+                        help='frames per traceback (default: 10)')
+    parser.add_argument('--page-length', type=int, default=25)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'log-viewer-benchmarks'),
+                        help='where generated logs are kept between runs')
+    parser.add_argument('--output', help='write the JSON results here instead of stdout')
+    args = parser.parse_args(argv)
+
+    document = run(args)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -43,11 +43,23 @@ LOG_VIEWER_FILES = [
 # Directory containing log files
 LOG_VIEWER_FILES_DIR = LOG_DIR
 
+# Further directories to list log files from (glob pattern and optional format per source)
+LOG_VIEWER_SOURCES = [
+    # {'directory': '/var/log/nginx', 'pattern': 'access*.log', 'format': 'nginx_access'},
+]
+
 # Display settings
 LOG_VIEWER_PAGE_LENGTH = 25                    # Log entries per page
-LOG_VIEWER_MAX_READ_LINES = 1000              # Max lines to read per request
+LOG_VIEWER_MAX_READ_LINES = 1000000           # Max lines to read per request (None: unlimited)
+LOG_VIEWER_MAX_READ_BYTES = None              # Max bytes to read per request (None: unlimited)
+LOG_VIEWER_MAX_READ_SECONDS = 10              # Max seconds spent reading per request (None: unlimited)
 LOG_VIEWER_FILE_LIST_MAX_ITEMS_PER_PAGE = 25  # Files per page in file list
 LOG_VIEWER_FILE_LIST_TITLE = "Application Log Viewer"
+LOG_VIEWER_SEARCH_WORKERS = None              # Processes scanning files per search (None: up to 4, one per CPU)
+LOG_VIEWER_SEARCH_CPU_SECONDS = 30            # CPU seconds a search may use across its workers (None: unlimited)
+LOG_VIEWER_MAX_CONCURRENT_SCANS = None        # Heavy scans running at once per process (None: unlimited)
+LOG_VIEWER_MAX_CONCURRENT_SCANS_PER_USER = 2  # Heavy scans one user may run at once per process (None: unlimited)
+LOG_VIEWER_SCAN_RETRY_AFTER = 2               # Seconds to wait before retrying when the viewer is busy
 
 # =============================================================================
 # REAL-TIME MONITORING SETTINGS
@@ -60,8 +72,17 @@ LOGVIEWER_AUTO_SCROLL_TO_BOTTOM = True        # Auto-scroll to latest logs
 LOGVIEWER_ONLY_REFRESH_WHEN_ACTIVE = True     # Only refresh when tab is active
 
 # Performance settings
-LOGVIEWER_INITIAL_NUMBER_OF_CHARS = 2048      # Initial load size
+LOGVIEWER_INITIAL_NUMBER_OF_CHARS = 2048      # Bytes of the file end shown first (None: off)
 LOGVIEWER_DISABLE_ACCESS_LOGS = True          # Don't log AJAX requests
+LOG_VIEWER_PROFILING = False                  # Per-phase timings in Server-Timing header
+LOG_VIEWER_MAX_MATCH_LENGTH = None            # Match only this many chars of a line (None: all)
+LOG_VIEWER_PATTERN_SAMPLE_INTERVAL = 0        # Time every n-th pattern match (0: off)
+LOG_VIEWER_SLOW_MATCH_MS = 5                  # Sampled matches slower than this are reported
+LOG_VIEWER_ESTIMATE_TOTALS_ABOVE = 100 * 1024 * 1024  # Estimate totals of larger files (None: always count)
+LOG_VIEWER_INDEX_DIR = None                   # Where entry indexes are saved and shared by all processes (None: not saved)
+LOG_VIEWER_INDEX_LOCK_TIMEOUT = 5             # Seconds to wait for another process building the same index
+LOG_VIEWER_RESULT_CACHE = None                # Django cache alias sharing page/stats/search results (None: off)
+LOG_VIEWER_RESULT_CACHE_TIMEOUT = 300         # Seconds results stay in the shared result cache
 
 # =============================================================================
 # ADVANCED LOG FORMAT CONFIGURATION
@@ -178,6 +199,12 @@ LOG_VIEWER_LEVEL_COLORS = {
 LOG_VIEWER_EXCLUDE_TEXT_PATTERN = None  # String regex expression to exclude log lines
 # Example: LOG_VIEWER_EXCLUDE_TEXT_PATTERN = r'.*health.*check.*'
 
+# Per-file exclusion patterns, overriding the one above (None: exclude nothing from that file)
+LOG_VIEWER_FILE_EXCLUDE_PATTERNS = {
+    # 'nginx_access.log': r'GET /health',
+    # 'django.log': None,
+}
+
 # =============================================================================
 # DJANGO LOGGING CONFIGURATION (optional but recommended)
 # =============================================================================
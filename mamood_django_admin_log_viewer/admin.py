@@ -1,12 +1,148 @@
+import math
+import re
 from django.contrib import admin
 from django.shortcuts import render
-from django.urls import path
-from django.http import JsonResponse
+from django.urls import path, reverse
+from django.http import HttpResponseRedirect, JsonResponse
 from django.template.response import TemplateResponse
 from django.contrib.admin import AdminSite
-from .utils import get_log_files, read_log_file_multiline_aware
-from .conf import (get_file_list_title, get_page_length, get_refresh_interval, 
-                   get_auto_refresh_default, get_auto_scroll_to_bottom, get_only_refresh_when_active)
+from django.core.paginator import Paginator
+from django.template.defaultfilters import filesizeformat
+from bisect import bisect_left
+from django.utils.dateparse import parse_datetime
+from .utils import (get_log_files, get_log_file_names, find_log_file, get_rotational_files,
+                    open_log_file, read_log_entry, stat_log_files)
+from .pagination import read_log_page, read_log_page_at, read_log_tail
+from .timeline import read_timeline
+from .rotation import read_group_log
+from .search import compile_search, parse_search_cursor, search_log
+from .seek import seek_log_file
+from .index import get_cached_log_index, get_index_status
+from .stats import get_log_stats
+from .profiling import phase, profile_view
+from .budget import limit_reads
+from .concurrency import file_generation, limit_scans, run_scan
+from .compression import get_compression_suffix
+from .patterns import clear_pattern_stats, get_pattern_report
+from .entries import LogEntryJSONEncoder
+from .conf import (get_file_list_title, get_file_list_max_items_per_page, get_page_length, get_refresh_interval, 
+                   get_auto_refresh_default, get_auto_scroll_to_bottom, get_only_refresh_when_active,
+                   get_level_colors, get_max_match_length, get_pattern_sample_interval, get_slow_match_ms)
+
+
+def _json_response(data, **kwargs):
+    """Build a JsonResponse that serializes log entries, timing the serialization when profiling."""
+    with phase('serialize'):
+        return JsonResponse(data, encoder=LogEntryJSONEncoder, **kwargs)
+
+
+def _get_timeline_data(request, log_files):
+    """Read the timeline page selected by the request's query parameters."""
+    try:
+        page = max(1, int(request.GET.get('page', 1)))
+    except ValueError:
+        page = 1
+
+    # Unparseable "since" values are ignored rather than rejected
+    since = request.GET.get('since', '')
+    try:
+        since = parse_datetime(since) if since else None
+    except ValueError:
+        since = None
+
+    names = request.GET.getlist('files')
+    generations = tuple((log_file['path'], file_generation(log_file['path'])) for log_file in log_files)
+    key = (generations, tuple(names), page, get_page_length(), since)
+    return run_scan(key, read_timeline, log_files, names, page, get_page_length(), since)
+
+
+def _get_group_data(request, group, current_app):
+    """Read the rotation group page selected by the request's query parameters."""
+    # If page parameter exists, it should override live mode to false
+    if 'page' in request.GET:
+        live_mode = False
+        try:
+            page = int(request.GET.get('page', 1))
+        except ValueError:
+            page = 1
+    else:
+        live_mode = request.GET.get('live', 'true').lower() == 'true'
+        page = None if live_mode else 1
+
+    # Rotating the group replaces its current file, so that file's generation covers the group
+    key = (group['path'], file_generation(group['path']), get_page_length(), page)
+    # The result is shared with concurrent identical requests, so copy what is changed
+    log_data = {**run_scan(key, read_group_log, group, get_page_length(), page), 'live_mode': live_mode}
+
+    # Entries come from different physical files, so link each to its own file
+    log_data['entries'] = [{
+        **entry,
+        'entry_url': reverse(
+            'admin:log_viewer_entry', args=[entry['source_file'], entry['offset']], current_app=current_app
+        ) + f"?line={entry['number']}",
+    } for entry in log_data['entries']]
+
+    return log_data
+
+
+def _read_page(file_path, page, page_length, format_name):
+    """Read a page of a log file, sharing the read with concurrent requests for the same page."""
+    key = (file_path, file_generation(file_path), page, page_length, format_name)
+    return run_scan(key, read_log_page, file_path, page, page_length, format_name)
+
+
+def _get_page_for_offset(index, offset, page_length):
+    """Get the page number holding the entry that starts at a byte offset, from a complete index."""
+    return bisect_left(index.offsets, offset) // page_length + 1
+
+
+def _read_page_at(file_path, offset, page_length, format_name):
+    """Read the page holding the entry at a byte offset, sharing the read like ``_read_page``."""
+    key = (file_path, file_generation(file_path), 'offset', offset, page_length, format_name)
+    return run_scan(key, read_log_page_at, file_path, offset, page_length, format_name)
+
+
+def _with_index_status(log_files):
+    """Copy the listed log files with the status of their entry indexes.
+
+    A rotation group shows the status of its newest file; the status of each
+    rotation is listed when the group is expanded (see ``log_rotations_view``).
+    """
+    annotated = []
+    for log_file in log_files:
+        log_file = dict(log_file)
+        if log_file['type'] == 'rotational_group':
+            newest = log_file['rotational_files'][0]
+            status = get_index_status(newest['path'], log_file['name'])
+        else:
+            status = get_index_status(log_file['path'], log_file['name'])
+        log_file['index_status'] = status
+        annotated.append(log_file)
+    return annotated
+
+
+def _iter_chunks(f, chunk_size=64 * 1024):
+    """Yield the content of an open binary file in chunks, closing it at the end."""
+    with f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _rotation_data(rot_file, group_name, current_app):
+    """Describe one rotation of a group for the file list's lazy rotation lists."""
+    return {
+        'name': rot_file['name'],
+        'size': rot_file['size'],
+        'size_display': filesizeformat(rot_file['size']),
+        'modified': rot_file['modified'],
+        'is_current': rot_file['is_current'],
+        'index_status': get_index_status(rot_file['path'], group_name),
+        'url': reverse('admin:log_viewer_detail', args=[rot_file['name']], current_app=current_app),
+        'download_url': reverse('admin:log_viewer_download', args=[rot_file['name']], current_app=current_app),
+    }
 
 
 class LogViewerAdminMixin:
@@ -17,21 +153,37 @@ class LogViewerAdminMixin:
         urls = super().get_urls()
         log_urls = [
             path('logs/', self.admin_view(self.log_list_view), name='log_viewer_list'),
+            path('logs/timeline/', self.admin_view(self.log_timeline_view), name='log_viewer_timeline'),
+            path('logs/timeline/ajax/', self.admin_view(self.log_timeline_ajax_view), name='log_viewer_timeline_ajax'),
+            path('logs/patterns/', self.admin_view(self.log_patterns_view), name='log_viewer_patterns'),
             path('logs/<str:filename>/', self.admin_view(self.log_detail_view), name='log_viewer_detail'),
             path('logs/<str:filename>/ajax/', self.admin_view(self.log_ajax_view), name='log_viewer_ajax'),
+            path('logs/<str:filename>/group/', self.admin_view(self.log_group_view), name='log_viewer_group'),
+            path('logs/<str:filename>/group/ajax/', self.admin_view(self.log_group_ajax_view), name='log_viewer_group_ajax'),
+            path('logs/<str:filename>/rotations/', self.admin_view(self.log_rotations_view), name='log_viewer_rotations'),
+            path('logs/<str:filename>/entry/<int:offset>/', self.admin_view(self.log_entry_view), name='log_viewer_entry'),
+            path('logs/<str:filename>/seek/', self.admin_view(self.log_seek_view), name='log_viewer_seek'),
+            path('logs/<str:filename>/stats/', self.admin_view(self.log_stats_view), name='log_viewer_stats'),
+            path('logs/<str:filename>/search/', self.admin_view(self.log_search_view), name='log_viewer_search'),
             path('logs/<str:filename>/download/', self.admin_view(self.log_download_view), name='log_viewer_download'),
         ]
         return log_urls + urls
     
+    @profile_view
     def log_list_view(self, request):
-        """View to list all available log files."""
+        """View to list the available log files, one page at a time."""
         
-        log_files = get_log_files()
+        # Only the files on the requested page are stat'ed, and of a rotation
+        # group only its newest file: the rotations are listed on expand
+        paginator = Paginator(get_log_file_names(), get_file_list_max_items_per_page())
+        page_obj = paginator.get_page(request.GET.get('page'))
+        log_files = _with_index_status(get_log_files(page_obj.object_list, stat_rotations=False))
         
         context = {
             **self.each_context(request),
             'title': get_file_list_title(),
             'log_files': log_files,
+            'page_obj': page_obj,
             'has_permission': True,
             'opts': {
                 'app_label': 'mamood_django_admin_log_viewer',
@@ -41,43 +193,41 @@ class LogViewerAdminMixin:
             }
         }
         
-        return render(request, 'mamood_django_admin_log_viewer/log_list.html', context)
+        with phase('render'):
+            return render(request, 'mamood_django_admin_log_viewer/log_list.html', context)
     
+    @profile_view
+    @limit_reads
+    @limit_scans
     def log_detail_view(self, request, filename):
         """View to display log file content."""
         from django.conf import settings
         
         log_files = get_log_files()
-        selected_file = None
-        
-        # First, try to find exact match
-        for log_file in log_files:
-            if log_file['name'] == filename:
-                selected_file = log_file
-                break
-            # If it's a rotational group, check individual files
-            if log_file.get('type') == 'rotational_group':
-                for rot_file in log_file['rotational_files']:
-                    if rot_file['name'] == filename:
-                        selected_file = {
-                            'name': filename,
-                            'path': rot_file['path'],
-                            'size': rot_file['size'],
-                            'modified': rot_file['modified'],
-                            'is_rotational': True,
-                            'parent_group': log_file['name']
-                        }
-                        break
-                if selected_file:
-                    break
+        selected_file = find_log_file(log_files, filename)
         
         if not selected_file:
             from django.http import Http404
             raise Http404("Log file not found")
         
+        page_length = get_page_length()
+        # Rotations are parsed with the format configured for their group's base file
+        format_name = selected_file.get('parent_group', filename)
+        
         # Check if we're in live mode or specific page mode
         # If page parameter exists, it should override live mode to false
-        if 'page' in request.GET:
+        log_data = None
+        if 'offset' in request.GET:
+            # Show the page holding the entry at a byte offset (see log_seek_view)
+            live_mode = False
+            page = 1
+            try:
+                offset = int(request.GET['offset'])
+            except ValueError:
+                offset = None
+            if offset is not None and offset >= 0:
+                log_data = _read_page_at(selected_file['path'], offset, page_length, format_name)
+        elif 'page' in request.GET:
             live_mode = False
             page = int(request.GET.get('page', 1))
         else:
@@ -88,31 +238,19 @@ class LogViewerAdminMixin:
         if selected_file.get('is_rotational'):
             live_mode = False
         
-        page_length = get_page_length()
-        
-        if live_mode and not selected_file.get('is_rotational'):
-            # In live mode, always show the latest entries (last page)
-            # First get total entries to calculate the last page
-            temp_data = read_log_file_multiline_aware(selected_file['path'], page_length, 0, filename)
-            total_pages = max(1, (temp_data['total_entries'] + page_length - 1) // page_length)
-            page = total_pages
-            start_entry = (page - 1) * page_length
-            log_data = read_log_file_multiline_aware(selected_file['path'], page_length, start_entry, filename)
-        else:
-            # In manual mode, show specific page
-            # First get total entries to validate page number
-            temp_data = read_log_file_multiline_aware(selected_file['path'], page_length, 0, filename)
-            total_pages = max(1, (temp_data['total_entries'] + page_length - 1) // page_length)
-            # Ensure page is within valid range
-            page = max(1, min(page, total_pages))
-            start_entry = (page - 1) * page_length
-            log_data = read_log_file_multiline_aware(selected_file['path'], page_length, start_entry, filename)
+        # In live mode, first render only the end of the file; the page loads
+        # the whole last page and its totals over AJAX right away
+        if live_mode:
+            log_data = read_log_tail(selected_file['path'], page_length, format_name)
+        if log_data is None:
+            # The latest entries (last page) in live mode, otherwise the
+            # requested page, clamped to the valid range. Either takes one pass.
+            log_data = _read_page(selected_file['path'], -1 if live_mode else page, page_length, format_name)
         
         # Get formatted entries (already processed with multi-line support)
         formatted_lines = log_data['entries']
-        
-        # Calculate pagination info
-        total_pages = max(1, (log_data['total_entries'] + page_length - 1) // page_length)
+        page = log_data['current_page']
+        total_pages = log_data['total_pages']
         
         context = {
             **self.each_context(request),
@@ -125,6 +263,8 @@ class LogViewerAdminMixin:
             'total_pages': total_pages,
             'total_lines': log_data['total_lines'],
             'total_entries': log_data['total_entries'],
+            'approximate': log_data['approximate'],
+            'tail': log_data.get('tail', False),
             'start_line': log_data['actual_start_line'],
             'end_line': log_data['actual_end_line'],
             'page_length': page_length,
@@ -134,6 +274,7 @@ class LogViewerAdminMixin:
             'only_refresh_when_active': get_only_refresh_when_active(),
             'auto_refresh_default': get_auto_refresh_default(),
             'auto_scroll_to_bottom': get_auto_scroll_to_bottom(),
+            'level_colors': get_level_colors(),
             'has_permission': True,
             'opts': {
                 'app_label': 'mamood_django_admin_log_viewer',
@@ -145,38 +286,22 @@ class LogViewerAdminMixin:
         
         return TemplateResponse(request, 'mamood_django_admin_log_viewer/log_detail.html', context)
     
+    @profile_view
+    @limit_reads
+    @limit_scans
     def log_ajax_view(self, request, filename):
         """AJAX endpoint for refreshing log content."""
         from django.conf import settings
         
         log_files = get_log_files()
-        selected_file = None
-        
-        # First, try to find exact match
-        for log_file in log_files:
-            if log_file['name'] == filename:
-                selected_file = log_file
-                break
-            # If it's a rotational group, check individual files
-            if log_file.get('type') == 'rotational_group':
-                for rot_file in log_file['rotational_files']:
-                    if rot_file['name'] == filename:
-                        selected_file = {
-                            'name': filename,
-                            'path': rot_file['path'],
-                            'size': rot_file['size'],
-                            'modified': rot_file['modified'],
-                            'is_rotational': True,
-                            'parent_group': log_file['name']
-                        }
-                        break
-                if selected_file:
-                    break
+        selected_file = find_log_file(log_files, filename)
         
         if not selected_file:
             return JsonResponse({'error': 'Log file not found'}, status=404)
         
         page_length = get_page_length()
+        # Rotations are parsed with the format configured for their group's base file
+        format_name = selected_file.get('parent_group', filename)
         
         # Check if we're in live mode or specific page mode
         # If page parameter exists, it should override live mode to false
@@ -187,31 +312,16 @@ class LogViewerAdminMixin:
             live_mode = request.GET.get('live', 'true').lower() == 'true'
             page = 1
         
-        if live_mode:
-            # In live mode, always get the latest entries (last page)
-            # First get total entries to calculate the last page
-            temp_data = read_log_file_multiline_aware(selected_file['path'], page_length, 0, filename)
-            total_pages = max(1, (temp_data['total_entries'] + page_length - 1) // page_length)
-            page = total_pages
-            start_entry = (page - 1) * page_length
-            log_data = read_log_file_multiline_aware(selected_file['path'], page_length, start_entry, filename)
-        else:
-            # In normal mode, get specific page
-            # First get total entries to validate page number
-            temp_data = read_log_file_multiline_aware(selected_file['path'], page_length, 0, filename)
-            total_pages = max(1, (temp_data['total_entries'] + page_length - 1) // page_length)
-            # Ensure page is within valid range
-            page = max(1, min(page, total_pages))
-            start_entry = (page - 1) * page_length
-            log_data = read_log_file_multiline_aware(selected_file['path'], page_length, start_entry, filename)
+        # In live mode, always get the latest entries (last page); otherwise the
+        # requested page, clamped to the valid range. Either takes one pass.
+        log_data = _read_page(selected_file['path'], -1 if live_mode else page, page_length, format_name)
         
         # Get formatted entries (already processed with multi-line support)
         formatted_lines = log_data['entries']
+        page = log_data['current_page']
+        total_pages = log_data['total_pages']
         
-        # Calculate total pages
-        total_pages = max(1, (log_data['total_entries'] + page_length - 1) // page_length)
-        
-        return JsonResponse({
+        return _json_response({
             'log_lines': formatted_lines,
             'total_lines': log_data['total_lines'],
             'total_entries': log_data['total_entries'],
@@ -219,59 +329,339 @@ class LogViewerAdminMixin:
             'end_line': log_data['actual_end_line'],
             'current_page': page,
             'total_pages': total_pages,
+            'approximate': log_data['approximate'],
+            'incomplete': log_data['incomplete'],
             'live_mode': live_mode,
         })
     
+    @profile_view
+    @limit_reads
+    @limit_scans
+    def log_group_view(self, request, filename):
+        """View to display a whole rotation group as one continuous log."""
+        from django.http import Http404
+        
+        log_files = get_log_files()
+        group = next((f for f in log_files if f['name'] == filename), None)
+        if not group:
+            raise Http404("Log file not found")
+        
+        log_data = _get_group_data(request, group, self.name)
+        page_length = get_page_length()
+        
+        context = {
+            **self.each_context(request),
+            'title': f'Log Viewer - {filename} (all rotations)',
+            'filename': filename,
+            'log_file': group,
+            'all_log_files': log_files,
+            'log_lines': log_data['entries'],
+            'current_page': log_data['current_page'],
+            'total_pages': log_data['total_pages'],
+            'total_lines': log_data['total_lines'],
+            'total_entries': log_data['total_entries'],
+            # Totals of rotations not indexed yet are estimated
+            'approximate': log_data['approximate'],
+            'start_line': log_data['actual_start_line'],
+            'end_line': log_data['actual_end_line'],
+            'page_length': page_length,
+            'live_mode': log_data['live_mode'],
+            'is_rotational': False,
+            'is_group': True,
+            'refresh_interval': get_refresh_interval(),
+            'only_refresh_when_active': get_only_refresh_when_active(),
+            'auto_refresh_default': get_auto_refresh_default(),
+            'auto_scroll_to_bottom': get_auto_scroll_to_bottom(),
+            'level_colors': get_level_colors(),
+            'has_permission': True,
+            'opts': {
+                'app_label': 'mamood_django_admin_log_viewer',
+                'model_name': 'logfile',
+                'verbose_name': 'Log File',
+                'verbose_name_plural': 'Log Files',
+            }
+        }
+        
+        return TemplateResponse(request, 'mamood_django_admin_log_viewer/log_detail.html', context)
+    
+    @profile_view
+    @limit_reads
+    @limit_scans
+    def log_group_ajax_view(self, request, filename):
+        """AJAX endpoint for refreshing a rotation group view."""
+        group = next((f for f in get_log_files() if f['name'] == filename), None)
+        if not group:
+            return JsonResponse({'error': 'Log file not found'}, status=404)
+        
+        log_data = _get_group_data(request, group, self.name)
+        
+        return _json_response({
+            'log_lines': log_data['entries'],
+            'total_lines': log_data['total_lines'],
+            'total_entries': log_data['total_entries'],
+            'start_line': log_data['actual_start_line'],
+            'end_line': log_data['actual_end_line'],
+            'current_page': log_data['current_page'],
+            'total_pages': log_data['total_pages'],
+            'approximate': log_data['approximate'],
+            'incomplete': log_data['incomplete'],
+            'live_mode': log_data['live_mode'],
+        })
+    
+    @profile_view
+    @limit_reads
+    def log_entry_view(self, request, filename, offset):
+        """AJAX endpoint returning the full content of a single log entry."""
+        log_files = get_log_files()
+        selected_file = find_log_file(log_files, filename)
+        
+        if not selected_file:
+            return JsonResponse({'error': 'Log file not found'}, status=404)
+        
+        # The client knows the entry's first line number from the page it rendered
+        try:
+            start_line = max(1, int(request.GET.get('line', 1)))
+        except ValueError:
+            start_line = 1
+        
+        # Rotations are parsed with the format of their group's base file
+        format_name = selected_file.get('parent_group', filename)
+        entry = read_log_entry(selected_file['path'], offset, format_name, start_line)
+        if entry is None:
+            return JsonResponse({'error': 'Log entry not found'}, status=404)
+        
+        return _json_response({
+            'offset': offset,
+            'level': entry['level'],
+            'timestamp': entry['timestamp'],
+            'line_range': entry['line_range'],
+            'line_count': entry['line_count'],
+            'full_content': entry['full_content'],
+        })
+    
+    @profile_view
+    @limit_reads
+    @limit_scans
+    def log_timeline_view(self, request):
+        """View showing several log files merged into one chronological timeline."""
+        log_files = get_log_files()
+        timeline = _get_timeline_data(request, log_files)
+        
+        # Preserve the selection when linking to other pages
+        query = request.GET.copy()
+        query.pop('page', None)
+        
+        context = {
+            **self.each_context(request),
+            'title': 'Log Timeline',
+            'all_log_files': log_files,
+            'selected_sources': timeline['sources'],
+            'log_lines': timeline['entries'],
+            'current_page': timeline['page'],
+            'has_more': timeline['has_more'],
+            'incomplete': timeline['incomplete'],
+            'since': request.GET.get('since', ''),
+            'base_query': query.urlencode(),
+            'has_permission': True,
+            'opts': {
+                'app_label': 'mamood_django_admin_log_viewer',
+                'model_name': 'logfile',
+                'verbose_name': 'Log File',
+                'verbose_name_plural': 'Log Files',
+            }
+        }
+        
+        return TemplateResponse(request, 'mamood_django_admin_log_viewer/log_timeline.html', context)
+    
+    @profile_view
+    @limit_reads
+    @limit_scans
+    def log_timeline_ajax_view(self, request):
+        """AJAX endpoint for the merged timeline."""
+        timeline = _get_timeline_data(request, get_log_files())
+        
+        return _json_response({
+            'log_lines': timeline['entries'],
+            'sources': timeline['sources'],
+            'current_page': timeline['page'],
+            'has_more': timeline['has_more'],
+            'incomplete': timeline['incomplete'],
+        })
+    
+    @profile_view
+    def log_patterns_view(self, request):
+        """View reporting sampled log format pattern match times and slow lines."""
+        if request.method == 'POST':
+            clear_pattern_stats()
+            return HttpResponseRedirect(request.path)
+        
+        context = {
+            **self.each_context(request),
+            'title': 'Slow Patterns',
+            'report': get_pattern_report(),
+            'sample_interval': get_pattern_sample_interval(),
+            'slow_match_ms': get_slow_match_ms(),
+            'max_match_length': get_max_match_length(),
+            'has_permission': True,
+            'opts': {
+                'app_label': 'mamood_django_admin_log_viewer',
+                'model_name': 'logfile',
+                'verbose_name': 'Log File',
+                'verbose_name_plural': 'Log Files',
+            }
+        }
+        
+        return TemplateResponse(request, 'mamood_django_admin_log_viewer/log_patterns.html', context)
+    
+    @profile_view
+    @limit_reads
+    def log_seek_view(self, request, filename):
+        """AJAX endpoint locating the first entry at or after a given time."""
+        log_files = get_log_files()
+        selected_file = find_log_file(log_files, filename)
+        
+        if not selected_file:
+            return JsonResponse({'error': 'Log file not found'}, status=404)
+        
+        try:
+            target = parse_datetime(request.GET.get('time', ''))
+        except ValueError:
+            target = None
+        if target is None:
+            return JsonResponse({'error': 'Invalid or missing time'}, status=400)
+        
+        result = seek_log_file(selected_file, target)
+        file_name = result['file']['name']
+        url = reverse('admin:log_viewer_detail', args=[file_name], current_app=self.name)
+        
+        # The page number is only known for free if the file was already indexed
+        page = None
+        if result['offset'] is not None:
+            format_name = selected_file.get('parent_group', selected_file['name'])
+            index = get_cached_log_index(result['file']['path'], format_name)
+            if index is not None and index.complete:
+                page = _get_page_for_offset(index, result['offset'], get_page_length())
+                url += f'?page={page}'
+            else:
+                url += f"?offset={result['offset']}"
+        
+        return _json_response({
+            'file': file_name,
+            'offset': result['offset'],
+            'page': page,
+            'url': url,
+        })
+    
+    @profile_view
+    @limit_reads
+    @limit_scans
+    def log_stats_view(self, request, filename):
+        """AJAX endpoint with level counts, histograms and top loggers/messages."""
+        log_files = get_log_files()
+        selected_file = find_log_file(log_files, filename)
+        
+        if not selected_file:
+            return JsonResponse({'error': 'Log file not found'}, status=404)
+        
+        try:
+            bucket_seconds = max(1, int(request.GET.get('bucket', 60)))
+            hours = float(request.GET['hours']) if request.GET.get('hours') else None
+            top = min(max(1, int(request.GET.get('top', 10))), 100)
+        except ValueError:
+            return JsonResponse({'error': 'Invalid statistics parameters'}, status=400)
+        if hours is not None and not (math.isfinite(hours) and hours > 0):
+            return JsonResponse({'error': 'Invalid statistics parameters'}, status=400)
+        
+        format_name = selected_file.get('parent_group', filename)
+        key = (selected_file['path'], file_generation(selected_file['path']), format_name, bucket_seconds, hours, top)
+        stats = run_scan(key, get_log_stats, selected_file['path'], format_name, bucket_seconds, hours, top)
+        
+        return _json_response(stats)
+    
+    @profile_view
+    @limit_scans
+    def log_search_view(self, request, filename):
+        """AJAX endpoint with one page of the entries matching a query, across all rotations of a group."""
+        log_files = get_log_files()
+        selected_file = find_log_file(log_files, filename)
+        
+        if not selected_file:
+            return JsonResponse({'error': 'Log file not found'}, status=404)
+        
+        query = request.GET.get('q', '')
+        if not query:
+            return JsonResponse({'error': 'Missing search query'}, status=400)
+        try:
+            regex = compile_search(query, request.GET.get('regex') == '1')
+            cursor = parse_search_cursor(request.GET['cursor']) if request.GET.get('cursor') else None
+        except (re.error, ValueError):
+            return JsonResponse({'error': 'Invalid search parameters'}, status=400)
+        
+        # Searches are limited by LOG_VIEWER_SEARCH_CPU_SECONDS rather than the read budget
+        key = (selected_file['path'], file_generation(selected_file['path']), regex.pattern, regex.flags,
+               cursor, get_page_length())
+        results = run_scan(key, search_log, selected_file, regex, cursor, get_page_length())
+        
+        # Matches come from different physical files, so link each to its own file
+        entries = [{
+            **entry,
+            'entry_url': reverse(
+                'admin:log_viewer_entry', args=[entry['source_file'], entry['offset']], current_app=self.name
+            ) + f"?line={entry['number']}",
+        } for entry in results['entries']]
+        
+        return _json_response({
+            'log_lines': entries,
+            'cursor': results['cursor'],
+            'has_more': results['has_more'],
+            'files_searched': results['files_searched'],
+            'incomplete': results['incomplete'],
+        })
+    
+    @profile_view
+    def log_rotations_view(self, request, filename):
+        """AJAX endpoint listing one page of a rotation group's files."""
+        # Rotations are ordered from their names alone; only the requested page is stat'ed
+        rotational_files = get_rotational_files(filename, with_stat=False)
+        if not rotational_files:
+            return JsonResponse({'error': 'Log file not found'}, status=404)
+        paginator = Paginator(rotational_files, get_file_list_max_items_per_page())
+        page_obj = paginator.get_page(request.GET.get('page'))
+        
+        return _json_response({
+            'files': [_rotation_data(rot_file, filename, self.name)
+                      for rot_file in stat_log_files(page_obj.object_list)],
+            'page': page_obj.number,
+            'total_pages': paginator.num_pages,
+            'total_files': paginator.count,
+            'has_next': page_obj.has_next(),
+        })
+    
+    @profile_view
     def log_download_view(self, request, filename):
-        """Download log file."""
+        """Download log file, decompressed and streamed in chunks."""
         import os
-        from django.http import HttpResponse, Http404
+        from django.http import FileResponse, HttpResponse, Http404, StreamingHttpResponse
         
         log_files = get_log_files()
-        selected_file = None
-        
-        # First, try to find exact match
-        for log_file in log_files:
-            if log_file['name'] == filename:
-                selected_file = log_file
-                break
-            # If it's a rotational group, check individual files
-            if log_file.get('type') == 'rotational_group':
-                for rot_file in log_file['rotational_files']:
-                    if rot_file['name'] == filename:
-                        selected_file = {
-                            'name': filename,
-                            'path': rot_file['path'],
-                            'size': rot_file['size'],
-                            'modified': rot_file['modified'],
-                            'is_rotational': True,
-                            'parent_group': log_file['name']
-                        }
-                        break
-                if selected_file:
-                    break
+        selected_file = find_log_file(log_files, filename)
         
         if not selected_file or not os.path.exists(selected_file['path']):
             raise Http404("Log file not found")
         
         try:
-            # Handle compressed files
-            if selected_file['path'].endswith('.gz'):
-                import gzip
-                with gzip.open(selected_file['path'], 'rt', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                content_type = 'application/gzip'
-                filename_with_ext = filename
-            else:
-                with open(selected_file['path'], 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                content_type = 'text/plain'
+            suffix = get_compression_suffix(selected_file['path'])
+            f = open_log_file(selected_file['path'])
+            if not suffix:
                 filename_with_ext = filename + '.log' if not filename.endswith('.log') else filename
+                return FileResponse(f, as_attachment=True, filename=filename_with_ext,
+                                    content_type='text/plain; charset=utf-8')
             
-            response = HttpResponse(content, content_type=content_type)
+            # Compressed files are decompressed chunk by chunk as they are sent;
+            # their decompressed size is unknown until then
+            filename_with_ext = filename[:-len(suffix)] if filename.endswith(suffix) else filename
+            response = StreamingHttpResponse(_iter_chunks(f), content_type='text/plain; charset=utf-8')
             response['Content-Disposition'] = f'attachment; filename="{filename_with_ext}"'
-            response['Content-Length'] = len(content.encode('utf-8'))
-            
             return response
             
         except Exception as e:
@@ -295,8 +685,18 @@ def _log_viewer_get_urls():
     urls = _original_get_urls()
     log_urls = [
         path('logs/', admin.site.admin_view(admin.site.log_list_view), name='log_viewer_list'),
+        path('logs/timeline/', admin.site.admin_view(admin.site.log_timeline_view), name='log_viewer_timeline'),
+        path('logs/timeline/ajax/', admin.site.admin_view(admin.site.log_timeline_ajax_view), name='log_viewer_timeline_ajax'),
+        path('logs/patterns/', admin.site.admin_view(admin.site.log_patterns_view), name='log_viewer_patterns'),
         path('logs/<str:filename>/', admin.site.admin_view(admin.site.log_detail_view), name='log_viewer_detail'),
         path('logs/<str:filename>/ajax/', admin.site.admin_view(admin.site.log_ajax_view), name='log_viewer_ajax'),
+        path('logs/<str:filename>/group/', admin.site.admin_view(admin.site.log_group_view), name='log_viewer_group'),
+        path('logs/<str:filename>/group/ajax/', admin.site.admin_view(admin.site.log_group_ajax_view), name='log_viewer_group_ajax'),
+        path('logs/<str:filename>/rotations/', admin.site.admin_view(admin.site.log_rotations_view), name='log_viewer_rotations'),
+        path('logs/<str:filename>/entry/<int:offset>/', admin.site.admin_view(admin.site.log_entry_view), name='log_viewer_entry'),
+        path('logs/<str:filename>/seek/', admin.site.admin_view(admin.site.log_seek_view), name='log_viewer_seek'),
+        path('logs/<str:filename>/stats/', admin.site.admin_view(admin.site.log_stats_view), name='log_viewer_stats'),
+        path('logs/<str:filename>/search/', admin.site.admin_view(admin.site.log_search_view), name='log_viewer_search'),
         path('logs/<str:filename>/download/', admin.site.admin_view(admin.site.log_download_view), name='log_viewer_download'),
     ]
     return log_urls + urls
@@ -305,6 +705,16 @@ def _log_viewer_get_urls():
 admin.site.log_list_view = LogViewerAdminMixin.log_list_view.__get__(admin.site, type(admin.site))
 admin.site.log_detail_view = LogViewerAdminMixin.log_detail_view.__get__(admin.site, type(admin.site))
 admin.site.log_ajax_view = LogViewerAdminMixin.log_ajax_view.__get__(admin.site, type(admin.site))
+admin.site.log_timeline_view = LogViewerAdminMixin.log_timeline_view.__get__(admin.site, type(admin.site))
+admin.site.log_timeline_ajax_view = LogViewerAdminMixin.log_timeline_ajax_view.__get__(admin.site, type(admin.site))
+admin.site.log_patterns_view = LogViewerAdminMixin.log_patterns_view.__get__(admin.site, type(admin.site))
+admin.site.log_group_view = LogViewerAdminMixin.log_group_view.__get__(admin.site, type(admin.site))
+admin.site.log_group_ajax_view = LogViewerAdminMixin.log_group_ajax_view.__get__(admin.site, type(admin.site))
+admin.site.log_rotations_view = LogViewerAdminMixin.log_rotations_view.__get__(admin.site, type(admin.site))
+admin.site.log_entry_view = LogViewerAdminMixin.log_entry_view.__get__(admin.site, type(admin.site))
+admin.site.log_seek_view = LogViewerAdminMixin.log_seek_view.__get__(admin.site, type(admin.site))
+admin.site.log_stats_view = LogViewerAdminMixin.log_stats_view.__get__(admin.site, type(admin.site))
+admin.site.log_search_view = LogViewerAdminMixin.log_search_view.__get__(admin.site, type(admin.site))
 admin.site.log_download_view = LogViewerAdminMixin.log_download_view.__get__(admin.site, type(admin.site))
 
 # Replace the get_urls method
@@ -0,0 +1,114 @@
+"""
+Per-request read budget.
+
+Without a limit, a single request for a huge file (counting its entries,
+building its index, merging a timeline) can pin a worker for minutes. Views
+decorated with :func:`limit_reads` get a budget of
+``LOG_VIEWER_MAX_READ_LINES`` lines, ``LOG_VIEWER_MAX_READ_BYTES`` bytes
+and ``LOG_VIEWER_MAX_READ_SECONDS`` seconds, charged line by line in
+``utils.iter_log_lines``. Once it runs out, reading stops and the readers
+return what they have so far, marked ``incomplete`` with the byte offset
+reading stopped at as the ``cursor`` to continue from.
+
+Reads outside a budgeted view (the index warmer, background index builds,
+benchmarks) are not limited.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from .conf import get_max_read_bytes, get_max_read_lines, get_max_read_seconds
+
+# Lines read between two checks of the clock
+CLOCK_CHECK_INTERVAL = 1024
+
+_current_budget = ContextVar('log_viewer_read_budget', default=None)
+
+
+class ReadBudget:
+    """Lines, bytes and seconds left for reading log files in one request."""
+
+    __slots__ = ('lines_left', 'bytes_left', 'deadline', 'exhausted', 'cursor', '_countdown')
+
+    def __init__(self, max_lines=None, max_bytes=None, max_seconds=None):
+        self.lines_left = sys.maxsize if max_lines is None else max_lines
+        self.bytes_left = sys.maxsize if max_bytes is None else max_bytes
+        self.deadline = None if max_seconds is None else time.monotonic() + max_seconds
+        self.exhausted = False
+        # Byte offset reading stopped at, in the file being read then
+        self.cursor = None
+        self._countdown = CLOCK_CHECK_INTERVAL
+
+    def charge(self, nbytes, lines=1):
+        """Account for ``lines`` lines of ``nbytes`` bytes in all; False once the budget is used up."""
+        if self.exhausted:
+            return False
+        self.lines_left -= lines
+        self.bytes_left -= nbytes
+        if self.lines_left < 0 or self.bytes_left < 0:
+            return False
+        if self.deadline is not None:
+            self._countdown -= lines
+            if self._countdown <= 0:
+                self._countdown = CLOCK_CHECK_INTERVAL
+                return time.monotonic() < self.deadline
+        return True
+
+    def stop(self, cursor):
+        """Record that reading stopped at byte offset ``cursor``."""
+        self.exhausted = True
+        self.cursor = cursor
+
+
+def get_current_budget():
+    """Get the read budget of the request in progress, or None when reads are unlimited."""
+    return _current_budget.get()
+
+
+def reads_exhausted():
+    """Whether the current request ran out of its read budget."""
+    budget = _current_budget.get()
+    return budget is not None and budget.exhausted
+
+
+def budget_state():
+    """The ``incomplete`` flag and continuation ``cursor`` to add to a reader's result."""
+    budget = _current_budget.get()
+    if budget is None or not budget.exhausted:
+        return {'incomplete': False, 'cursor': None}
+    return {'incomplete': True, 'cursor': budget.cursor}
+
+
+@contextmanager
+def read_budget(budget=None):
+    """Limit the reads in the block to ``budget``, by default one built from the settings."""
+    if budget is None:
+        budget = ReadBudget(get_max_read_lines(), get_max_read_bytes(), get_max_read_seconds())
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+@contextmanager
+def unlimited_reads():
+    """Lift the read budget for reads that are bounded by themselves (e.g. seeking to a page)."""
+    token = _current_budget.set(None)
+    try:
+        yield
+    finally:
+        _current_budget.reset(token)
+
+
+def limit_reads(view):
+    """Run a view with a read budget built from the settings."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with read_budget():
+            return view(*args, **kwargs)
+
+    return wrapper
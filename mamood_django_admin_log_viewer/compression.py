@@ -0,0 +1,96 @@
+"""
+Streaming decoders for compressed log rotations.
+
+Rotated logs compressed as ``.gz``, ``.bz2``, ``.xz`` or ``.zst`` are read
+through a decoder picked by their suffix. Every decoder returns a binary
+file object that decompresses in chunks as it is read, so reading, indexing
+and downloading a compressed rotation never holds the whole decompressed
+file in memory. Offsets into a compressed file are offsets into its
+decompressed stream; seeking to one decompresses up to it.
+
+``gzip``, ``bz2`` and ``lzma`` are in the standard library. ``.zst`` files
+need the optional ``zstandard`` package (``pip install zstandard``); without
+it they are listed but opening them raises ``OSError``. Further formats can
+be added with :func:`register_decoder`.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+class _ZstdFile(io.BufferedReader):
+    """Buffered zstd stream that seeks forward by decompressing up to the target offset.
+
+    The files are opened anew for every read, so seeking backwards is never needed.
+    """
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.tell()
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation('zstd streams can only seek from the start or current position')
+        skip = offset - self.tell()
+        if skip < 0:
+            raise io.UnsupportedOperation('zstd streams can only seek forward')
+        while skip > 0:
+            chunk = self.read(min(skip, io.DEFAULT_BUFFER_SIZE * 16))
+            if not chunk:
+                break
+            skip -= len(chunk)
+        return self.tell()
+
+
+def _open_zstd(file_path):
+    if zstandard is None:
+        raise OSError(f"Reading {file_path} requires the zstandard package")
+    return _ZstdFile(zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True))
+
+
+# Suffix -> function opening a file of that type as a decompressed binary stream
+_DECODERS = {
+    '.gz': lambda file_path: gzip.open(file_path, 'rb'),
+    '.bz2': lambda file_path: bz2.open(file_path, 'rb'),
+    '.xz': lambda file_path: lzma.open(file_path, 'rb'),
+    '.zst': _open_zstd,
+}
+
+
+def register_decoder(suffix, opener):
+    """Read files ending in ``suffix`` (e.g. ``'.lz4'``) through ``opener(file_path)``.
+
+    ``opener`` must return a binary file object yielding the decompressed data.
+    """
+    _DECODERS[suffix] = opener
+
+
+def compression_suffixes():
+    """Get the suffixes of all compressed file types that can be read."""
+    return tuple(_DECODERS)
+
+
+def get_compression_suffix(file_path):
+    """Get the compression suffix of a file name (e.g. ``'.gz'``), or None for a plain file."""
+    for suffix in _DECODERS:
+        if file_path.endswith(suffix):
+            return suffix
+    return None
+
+
+def is_compressed(file_path):
+    """Whether a file is read through a decoder, and so can't be seeked cheaply or sampled."""
+    return get_compression_suffix(file_path) is not None
+
+
+def open_compressed(file_path):
+    """Open a compressed file as a decompressed binary stream."""
+    return _DECODERS[get_compression_suffix(file_path)](file_path)
@@ -0,0 +1,208 @@
+"""
+Request coalescing and concurrency limits for heavy scans.
+
+Opening a page of a large log reads, parses and indexes much of the file.
+When several admins open the same page at once, :func:`run_scan` runs that
+scan once: concurrent calls with the same key (file generation, page and
+parameters) wait for the call in flight and share its result, which callers
+must therefore not modify.
+
+Scans that do run are limited to ``LOG_VIEWER_MAX_CONCURRENT_SCANS`` at a
+time, and to ``LOG_VIEWER_MAX_CONCURRENT_SCANS_PER_USER`` per user. A scan
+over either limit raises :class:`ScansBusy` rather than tying up another
+worker thread; views decorated with :func:`limit_scans` answer it with a
+``503`` response and a ``Retry-After`` header. Waiting for a coalesced
+scan does not count against the limits.
+
+Both the coalescing and the limits apply per process. To share results
+between processes and nodes, set ``LOG_VIEWER_RESULT_CACHE`` to the alias
+of a Django cache they all use (e.g. Redis or Memcached): exact, complete
+results are then stored there for ``LOG_VIEWER_RESULT_CACHE_TIMEOUT``
+seconds under their key, which includes the generation of the files read,
+so a scan done by one worker is served by all of them until the file
+changes. Results served from there don't take a scan slot.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from contextvars import ContextVar
+from functools import wraps
+
+from django.core.cache import caches
+from django.http import HttpResponse, JsonResponse
+
+from .conf import (get_max_concurrent_scans, get_max_concurrent_scans_per_user, get_result_cache,
+                   get_result_cache_timeout, get_scan_retry_after)
+from .profiling import add_count
+
+logger = logging.getLogger(__name__)
+
+BUSY_MESSAGE = 'The log viewer is busy with other scans, please retry shortly.'
+
+_current_user = ContextVar('log_viewer_scan_user', default=None)
+
+_lock = threading.Lock()
+# (function, key) -> _Call of the scan in flight
+_in_flight = {}
+_active = 0
+# User pk -> number of scans running for that user
+_active_per_user = {}
+
+
+class ScansBusy(Exception):
+    """Raised when starting a scan would exceed the concurrency limits."""
+
+
+class _Call:
+    """A scan in flight, whose result is shared with the callers waiting for it."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def file_generation(file_path):
+    """Identify a file's current content by its inode, size and modification time (None if missing)."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def _acquire(user):
+    """Take a scan slot for ``user``, or return False at a limit. Called with the lock held."""
+    global _active
+    max_scans = get_max_concurrent_scans()
+    if max_scans is not None and _active >= max_scans:
+        return False
+    max_per_user = get_max_concurrent_scans_per_user()
+    if user is not None and max_per_user is not None and _active_per_user.get(user, 0) >= max_per_user:
+        return False
+
+    _active += 1
+    if user is not None:
+        _active_per_user[user] = _active_per_user.get(user, 0) + 1
+    return True
+
+
+def _release(user):
+    """Give back a scan slot of ``user``. Called with the lock held."""
+    global _active
+    _active -= 1
+    if user is not None:
+        _active_per_user[user] -= 1
+        if not _active_per_user[user]:
+            del _active_per_user[user]
+
+
+def _shared_key(func, key):
+    """Key of a scan's result in the shared result cache, the same in every process."""
+    digest = hashlib.sha1(repr((func.__module__, func.__qualname__, key)).encode('utf-8')).hexdigest()
+    return f'log_viewer:scan:{digest}'
+
+
+def _is_final(result):
+    """Whether a result is exact and complete, so other processes may be served it."""
+    return isinstance(result, dict) and not result.get('incomplete') and not result.get('approximate')
+
+
+def _get_shared(func, key):
+    """Get a scan's result from the shared result cache, or None when it isn't there or not configured."""
+    alias = get_result_cache()
+    if alias is None:
+        return None
+    try:
+        result = caches[alias].get(_shared_key(func, key))
+    except Exception:
+        logger.warning('Reading the shared result cache %r failed', alias, exc_info=True)
+        return None
+    if result is not None:
+        add_count('scans_shared', 1)
+    return result
+
+
+def _compute(key, func, args, kwargs):
+    """Run a scan, sharing its result through the shared result cache when one is configured."""
+    result = func(*args, **kwargs)
+    alias = get_result_cache()
+    if alias is not None and _is_final(result):
+        try:
+            caches[alias].set(_shared_key(func, key), result, get_result_cache_timeout())
+        except Exception:
+            logger.warning('Writing the shared result cache %r failed', alias, exc_info=True)
+    return result
+
+
+def run_scan(key, func, *args, **kwargs):
+    """Call ``func(*args, **kwargs)``, sharing one call between concurrent callers with the same ``key``.
+
+    ``key`` must identify the result, including the generation of the files
+    read (see :func:`file_generation`). Results found in the shared result
+    cache are returned without taking a scan slot. Raises
+    :class:`ScansBusy` when no identical scan is in flight and a new one
+    would exceed the limits.
+    """
+    shared = _get_shared(func, key)
+    if shared is not None:
+        return shared
+
+    flight_key = (func, key)
+    user = _current_user.get()
+    with _lock:
+        call = _in_flight.get(flight_key)
+        leader = call is None
+        if leader:
+            if not _acquire(user):
+                raise ScansBusy()
+            call = _in_flight[flight_key] = _Call()
+
+    if not leader:
+        add_count('scans_coalesced', 1)
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = _compute(key, func, args, kwargs)
+    except Exception as error:
+        call.error = error
+        raise
+    finally:
+        with _lock:
+            del _in_flight[flight_key]
+            _release(user)
+        call.done.set()
+    return call.result
+
+
+def busy_response(request):
+    """Build the "busy, retry" response: plain text for page loads, JSON for AJAX requests."""
+    retry_after = get_scan_retry_after()
+    if 'text/html' in request.headers.get('Accept', ''):
+        response = HttpResponse(BUSY_MESSAGE, status=503, content_type='text/plain')
+    else:
+        response = JsonResponse({'error': BUSY_MESSAGE, 'busy': True, 'retry_after': retry_after}, status=503)
+    response['Retry-After'] = str(retry_after)
+    return response
+
+
+def limit_scans(view):
+    """Run a view's scans under its user's limits, answering "busy, retry" when they are reached."""
+    @wraps(view)
+    def wrapper(self, request, *args, **kwargs):
+        token = _current_user.set(getattr(request.user, 'pk', None))
+        try:
+            return view(self, request, *args, **kwargs)
+        except ScansBusy:
+            return busy_response(request)
+        finally:
+            _current_user.reset(token)
+
+    return wrapper
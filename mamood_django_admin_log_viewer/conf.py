@@ -42,14 +42,59 @@ def get_log_files_dir():
     return get_setting('LOG_VIEWER_FILES_DIR', '')
 
 
+def get_log_sources():
+    """Get the log sources (directory, glob pattern and format) whose files are listed."""
+    return get_setting('LOG_VIEWER_SOURCES', [])
+
+
 def get_page_length():
     """Get the number of log entries per page."""
     return get_setting('LOG_VIEWER_PAGE_LENGTH', 25)
 
 
 def get_max_read_lines():
-    """Get the maximum number of lines to read per request."""
-    return get_setting('LOG_VIEWER_MAX_READ_LINES', 1000)
+    """Get the maximum number of lines to read per request (None: unlimited)."""
+    return get_setting('LOG_VIEWER_MAX_READ_LINES', 1000000)
+
+
+def get_max_read_bytes():
+    """Get the maximum number of bytes to read per request (None: unlimited)."""
+    return get_setting('LOG_VIEWER_MAX_READ_BYTES', None)
+
+
+def get_max_read_seconds():
+    """Get the maximum number of seconds a request may spend reading log files (None: unlimited)."""
+    return get_setting('LOG_VIEWER_MAX_READ_SECONDS', 10)
+
+
+def get_file_list_max_items_per_page():
+    """Get the number of log files, and of rotations of a group, listed per page."""
+    return get_setting('LOG_VIEWER_FILE_LIST_MAX_ITEMS_PER_PAGE', 25)
+
+
+def get_search_workers():
+    """Get the number of processes scanning files in parallel for a search (None: up to 4, one per CPU)."""
+    return get_setting('LOG_VIEWER_SEARCH_WORKERS', None)
+
+
+def get_search_cpu_seconds():
+    """Get the CPU seconds a search may spend across its workers (None: unlimited)."""
+    return get_setting('LOG_VIEWER_SEARCH_CPU_SECONDS', 30)
+
+
+def get_max_concurrent_scans():
+    """Get the number of heavy scans that may run at once per process (None: unlimited)."""
+    return get_setting('LOG_VIEWER_MAX_CONCURRENT_SCANS', None)
+
+
+def get_max_concurrent_scans_per_user():
+    """Get the number of heavy scans one user may run at once per process (None: unlimited)."""
+    return get_setting('LOG_VIEWER_MAX_CONCURRENT_SCANS_PER_USER', 2)
+
+
+def get_scan_retry_after():
+    """Get the seconds clients are asked to wait before retrying a request refused as busy."""
+    return get_setting('LOG_VIEWER_SCAN_RETRY_AFTER', 2)
 
 
 def get_file_list_title():
@@ -77,11 +122,61 @@ def get_only_refresh_when_active():
     return get_setting('LOGVIEWER_ONLY_REFRESH_WHEN_ACTIVE', True)
 
 
+def get_initial_number_of_chars():
+    """Get the number of bytes read from the end of a log file for the first render (None: whole page)."""
+    return get_setting('LOGVIEWER_INITIAL_NUMBER_OF_CHARS', 2048)
+
+
 def get_disable_access_logs():
     """Get whether to disable access logging for AJAX requests."""
     return get_setting('LOGVIEWER_DISABLE_ACCESS_LOGS', True)
 
 
+def get_profiling_enabled():
+    """Get whether views record per-phase timings (Server-Timing header, debug footer)."""
+    return get_setting('LOG_VIEWER_PROFILING', False)
+
+
+def get_max_match_length():
+    """Get the number of characters of a line matched against a format pattern (None for all)."""
+    return get_setting('LOG_VIEWER_MAX_MATCH_LENGTH', None)
+
+
+def get_pattern_sample_interval():
+    """Get how often format pattern matches are timed (every n-th line, 0 to disable)."""
+    return get_setting('LOG_VIEWER_PATTERN_SAMPLE_INTERVAL', 0)
+
+
+def get_slow_match_ms():
+    """Get the match time in milliseconds above which a sampled line is reported as slow."""
+    return get_setting('LOG_VIEWER_SLOW_MATCH_MS', 5)
+
+
+def get_estimate_totals_above():
+    """Get the file size in bytes above which entry totals are estimated (None to always count)."""
+    return get_setting('LOG_VIEWER_ESTIMATE_TOTALS_ABOVE', None)
+
+
+def get_index_dir():
+    """Get the directory entry indexes are saved to and shared between processes in (None: not saved)."""
+    return get_setting('LOG_VIEWER_INDEX_DIR', None)
+
+
+def get_index_lock_timeout():
+    """Get the seconds a request waits for another process building the same index."""
+    return get_setting('LOG_VIEWER_INDEX_LOCK_TIMEOUT', 5)
+
+
+def get_result_cache():
+    """Get the alias of the Django cache that page, statistics and search results are shared in (None: off)."""
+    return get_setting('LOG_VIEWER_RESULT_CACHE', None)
+
+
+def get_result_cache_timeout():
+    """Get the seconds results are kept in the shared result cache."""
+    return get_setting('LOG_VIEWER_RESULT_CACHE_TIMEOUT', 300)
+
+
 def get_log_formats():
     """Get the dictionary of log format configurations."""
     return get_setting('LOG_VIEWER_FORMATS', {})
@@ -107,6 +202,11 @@ def get_exclude_pattern():
     return get_setting('LOG_VIEWER_EXCLUDE_TEXT_PATTERN', None)
 
 
+def get_file_exclude_patterns():
+    """Get the per-file exclusion patterns, overriding the global one (None: exclude nothing)."""
+    return get_setting('LOG_VIEWER_FILE_EXCLUDE_PATTERNS', {})
+
+
 def get_disable_access_logs():
     """Get whether access logs should be disabled in middleware."""
     return get_setting('LOGVIEWER_DISABLE_ACCESS_LOGS', True)
@@ -0,0 +1,169 @@
+"""
+Compact representation of formatted log entries.
+
+Formatted entries used to be plain dicts of 13 keys plus the parsed fields,
+about 1.2 KB each. :class:`LogEntry` stores only the parsed fields in
+``__slots__`` and derives the preview (``content``, ``is_long``) and the
+display fields (``is_multiline``, ``line_range``) when they are read. The
+parsed regex groups (``raw_data``) are re-parsed from the first line only
+when asked for.
+
+Entries still behave like the old dicts (``entry['level']``,
+``entry.get(...)``, ``'full_content' in entry``, ``entry.pop(...)``), so
+templates and callers that add keys of their own keep working, and
+:class:`LogEntryJSONEncoder` serializes them in the same shape.
+"""
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+# Characters of an entry shown before it is cut off with "..."
+PREVIEW_LENGTH = 200
+
+_MISSING = object()
+
+
+class LogEntry:
+    """One formatted log entry, accessible like the dict it replaces."""
+
+    __slots__ = ('number', 'level', 'timestamp', 'parsed_timestamp', 'logger', 'module', 'text',
+                 'line_count', 'offset', 'raw_line', 'format_config', 'has_full_content', 'extra')
+
+    # Keys in the order of the old dict shape
+    KEYS = ('number', 'level', 'timestamp', 'parsed_timestamp', 'logger', 'module', 'content',
+            'full_content', 'is_long', 'is_multiline', 'line_count', 'line_range', 'raw_data', 'offset')
+    STORED_KEYS = frozenset(('number', 'level', 'timestamp', 'parsed_timestamp', 'logger', 'module',
+                             'line_count', 'offset'))
+
+    def __init__(self, number, level, timestamp, parsed_timestamp, logger, module, text,
+                 line_count=1, offset=None, raw_line=None, format_config=None):
+        self.number = number
+        self.level = level
+        self.timestamp = timestamp
+        self.parsed_timestamp = parsed_timestamp
+        self.logger = logger
+        self.module = module
+        # The full (possibly multi-line) message
+        self.text = text
+        self.line_count = line_count
+        self.offset = offset
+        # The parsed first line and its format, to derive raw_data from
+        self.raw_line = raw_line
+        self.format_config = format_config
+        # Page entries drop their full content; it is fetched on demand
+        self.has_full_content = True
+        # Keys added by callers, e.g. source_file
+        self.extra = None
+
+    @property
+    def content(self):
+        if len(self.text) > PREVIEW_LENGTH:
+            return self.text[:PREVIEW_LENGTH] + '...'
+        return self.text
+
+    @property
+    def full_content(self):
+        return self.text
+
+    @property
+    def is_long(self):
+        return len(self.text) > PREVIEW_LENGTH
+
+    @property
+    def raw_data(self):
+        if self.raw_line is None:
+            return {}
+        from .utils import parse_log_line_with_format
+        parsed = parse_log_line_with_format(self.raw_line, self.format_config)
+        return parsed['all_groups'] if parsed else {}
+
+    @property
+    def is_multiline(self):
+        return self.line_count > 1
+
+    @property
+    def end_number(self):
+        """Line number of the entry's last line."""
+        return self.number + self.line_count - 1
+
+    @property
+    def line_range(self):
+        if self.line_count > 1:
+            return f"{self.number}-{self.end_number}"
+        return str(self.number)
+
+    def keys(self):
+        keys = [key for key in self.KEYS if key != 'full_content' or self.has_full_content]
+        if self.extra:
+            keys.extend(self.extra)
+        return keys
+
+    def __getitem__(self, key):
+        if key in self.STORED_KEYS or (key in self.KEYS and (key != 'full_content' or self.has_full_content)):
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self.STORED_KEYS:
+            setattr(self, key, value)
+        elif key == 'full_content':
+            self.text = value
+            self.has_full_content = True
+        elif key in self.KEYS:
+            raise KeyError(f"'{key}' is derived from full_content and can't be set")
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key, default=_MISSING):
+        """Remove an added key, or hide ``full_content``; other fields can't be removed."""
+        if key == 'full_content':
+            if self.has_full_content:
+                self.has_full_content = False
+                return self.text
+        elif self.extra and key in self.extra:
+            return self.extra.pop(key)
+        elif key in self.KEYS:
+            raise KeyError(f"'{key}' can't be removed")
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def as_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f'<LogEntry {self.line_range} {self.level}: {self.content[:40]!r}>'
+
+
+class LogEntryJSONEncoder(DjangoJSONEncoder):
+    """JSON encoder that serializes :class:`LogEntry` objects as dicts."""
+
+    def default(self, o):
+        if isinstance(o, LogEntry):
+            return o.as_dict()
+        return super().default(o)
@@ -0,0 +1,71 @@
+"""
+Approximate entry and line totals for huge log files.
+
+Counting the entries of a multi-GB file means reading all of it. For plain
+files larger than ``LOG_VIEWER_ESTIMATE_TOTALS_ABOVE`` bytes, the entry and
+line density is instead sampled from a few byte ranges spread over the file
+and extrapolated by its size, so the first page renders in time independent
+of the file size. The exact totals come from the entry index, which is built
+in the background meanwhile (see :func:`index.build_log_index_in_background`).
+"""
+
+import os
+
+from .compression import is_compressed
+from .conf import get_estimate_totals_above
+from .profiling import add_count, phase
+from .utils import get_log_start_pattern, open_log_file
+
+# Byte ranges sampled per file, and the bytes read from each
+SAMPLE_RANGES = 8
+SAMPLE_BYTES = 64 * 1024
+
+
+def should_estimate_totals(file_path, size=None):
+    """Whether a file is large enough for approximate totals.
+
+    Only plain files qualify; compressed ones can't be sampled by seeking.
+    """
+    threshold = get_estimate_totals_above()
+    if not threshold or is_compressed(file_path):
+        return False
+    if size is None:
+        size = os.path.getsize(file_path)
+    return size > threshold
+
+
+def estimate_log_totals(file_path, filename=None, size=None):
+    """Estimate the number of entries and lines of a log file.
+
+    Returns ``(total_entries, total_lines, entries_per_byte, lines_per_byte)``.
+    """
+    if size is None:
+        size = os.path.getsize(file_path)
+    log_start_pattern = get_log_start_pattern(filename)
+    sampled_bytes = entry_starts = lines = 0
+
+    with phase('read'), open_log_file(file_path) as f:
+        last_start = max(0, size - SAMPLE_BYTES)
+        for i in range(SAMPLE_RANGES):
+            start = last_start * i // (SAMPLE_RANGES - 1)
+            f.seek(start)
+            if start:
+                # Skip the partial line the range starts in
+                f.readline()
+            range_bytes = 0
+            for raw_line in f:
+                range_bytes += len(raw_line)
+                lines += 1
+                if log_start_pattern.match(raw_line.decode('utf-8', errors='replace').lstrip()):
+                    entry_starts += 1
+                if range_bytes >= SAMPLE_BYTES:
+                    break
+            sampled_bytes += range_bytes
+    add_count('bytes_read', sampled_bytes)
+
+    if not sampled_bytes:
+        return 0, 0, 0.0, 0.0
+    entries_per_byte = max(entry_starts, 1) / sampled_bytes
+    lines_per_byte = lines / sampled_bytes
+    return (max(1, round(size * entries_per_byte)), max(1, round(size * lines_per_byte)),
+            entries_per_byte, lines_per_byte)
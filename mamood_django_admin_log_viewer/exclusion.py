@@ -0,0 +1,115 @@
+"""
+Exclusion of noise entries (health checks, pings) while log files are read.
+
+Entries whose text matches ``LOG_VIEWER_EXCLUDE_TEXT_PATTERN``, or the
+pattern given for their file in ``LOG_VIEWER_FILE_EXCLUDE_PATTERNS``, are
+dropped as lines are grouped into entries (see ``utils.group_log_lines``),
+so they are never formatted, never indexed and never counted in totals.
+
+Most exclusion patterns contain a literal every match needs (``health`` in
+``.*health.*check.*``, one of ``healthcheck``/``ping`` in
+``healthcheck|ping``). Such literals are extracted once per pattern and
+checked with a plain substring search first; the regex only runs on entries
+that contain one of them.
+"""
+
+import re
+from functools import lru_cache
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+from .conf import get_exclude_pattern, get_file_exclude_patterns
+
+
+class Exclusion:
+    """A compiled exclusion pattern with its required literals, if any."""
+
+    __slots__ = ('pattern', 'literals')
+
+    def __init__(self, pattern):
+        self.pattern = re.compile(pattern)
+        # One of these substrings occurs in every match (None: unknown)
+        self.literals = required_literals(pattern)
+
+    def matches(self, lines):
+        """Whether an entry, given as its lines, is excluded."""
+        text = lines[0] if len(lines) == 1 else ''.join(lines)
+        if self.literals is not None and not any(literal in text for literal in self.literals):
+            return False
+        return self.pattern.search(text) is not None
+
+
+def required_literals(pattern):
+    """Substrings of which at least one occurs in every match of ``pattern``.
+
+    Returns None when no such literal can be found, e.g. for case-insensitive
+    patterns or patterns made of character classes only.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (re.error, TypeError):
+        return None
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+    return _required_literals(list(parsed))
+
+
+def _required_literals(items):
+    best = None
+    run = []
+
+    def consider(candidate):
+        nonlocal best
+        if candidate and (best is None or min(map(len, candidate)) > min(map(len, best))):
+            best = candidate
+
+    for op, value in items:
+        if op is sre_constants.LITERAL:
+            run.append(chr(value))
+            continue
+        consider([''.join(run)] if run else None)
+        run = []
+        if op is sre_constants.BRANCH:
+            alternatives = [_required_literals(list(branch)) for branch in value[1]]
+            if all(alternatives):
+                consider([literal for literal_set in alternatives for literal in literal_set])
+        elif op is sre_constants.SUBPATTERN:
+            _, add_flags, _, subpattern = value
+            if not add_flags & re.IGNORECASE:
+                consider(_required_literals(list(subpattern)))
+    consider([''.join(run)] if run else None)
+    return best
+
+
+@lru_cache(maxsize=32)
+def compile_exclusion(pattern):
+    """Compile an exclusion pattern (cached per pattern string)."""
+    return Exclusion(pattern)
+
+
+def get_exclude_pattern_for_file(filename=None):
+    """The exclusion pattern of a log file: its own override, else the global one.
+
+    A file listed in ``LOG_VIEWER_FILE_EXCLUDE_PATTERNS`` with ``None`` has no
+    exclusion, even when the global pattern is set.
+    """
+    overrides = get_file_exclude_patterns()
+    if filename and filename in overrides:
+        return overrides[filename]
+    return get_exclude_pattern()
+
+
+def get_exclusion(filename=None):
+    """The compiled exclusion of a log file, or None when nothing is excluded."""
+    pattern = get_exclude_pattern_for_file(filename)
+    if not pattern:
+        return None
+    try:
+        return compile_exclusion(pattern)
+    except re.error:
+        # An invalid pattern excludes nothing rather than breaking the viewer
+        return None
@@ -0,0 +1,619 @@
+"""
+Entry index for log files.
+
+An index records where every entry of a log file starts (byte offset and
+first line number), so a page of entries can be read by seeking straight to
+it instead of re-grouping the whole file. Indexes are cached per process and
+brought up to date incrementally when a live log file grows.
+
+With ``LOG_VIEWER_INDEX_DIR`` set, ``manage.py logviewer_index`` builds the
+indexes ahead of time and saves them there; a process that has no index of a
+file yet loads the saved one and only scans what was appended since.
+
+The directory is also shared by the worker processes of the site, on one
+node or several (on a shared filesystem). A process that has to scan a file
+from scratch takes the file's build lock (``fcntl.flock`` on a ``.lock``
+file next to the saved index) and saves the index it built, so one process
+builds it and the others load it. A request that finds the lock taken waits
+up to ``LOG_VIEWER_INDEX_LOCK_TIMEOUT`` seconds for the other build, then
+scans within its own read budget; a background build finding the lock taken
+is dropped, and requests serve estimated pages until the index is saved.
+
+Each entry's level, timestamp, logger and message template are recorded as
+well (as ids into small per-index tables) so statistics never have to re-read
+the file. Their counts are also kept up to date as entries are indexed, in
+total and per minute (levels) or hour (loggers and templates), so statistics
+don't walk the entries either. Entries before the first timestamp of a file
+have a NaN timestamp and are left out of the per-minute and per-hour counts.
+
+Entries dropped by the file's exclusion pattern (see exclusion.py) are not
+indexed, so totals and pages reflect the filtered log. An index built with
+a different pattern is rebuilt.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, where builds are not coordinated
+    fcntl = None
+
+from .budget import reads_exhausted, unlimited_reads
+from .compression import is_compressed
+from .conf import get_index_dir, get_index_lock_timeout
+from .exclusion import get_exclude_pattern_for_file
+from .profiling import add_count, phase
+from .utils import (format_log_entries, get_log_format_for_file, get_message_template, iter_log_entries,
+                    normalize_timestamp, paginate_log_entries, parse_log_line_with_format)
+
+logger = logging.getLogger(__name__)
+
+# Timestamps are stored as seconds since this naive epoch
+EPOCH = datetime(1970, 1, 1)
+
+# Bumped whenever the layout of saved index files changes
+INDEX_FILE_VERSION = 3
+
+# Seconds covered by each aggregated count of levels, and of loggers and templates
+LEVEL_BUCKET_SECONDS = 60
+NAME_BUCKET_SECONDS = 3600
+
+# Distinct message templates kept per index; later new ones are counted as one
+MAX_TEMPLATES = 1000
+OTHER_TEMPLATE = '(other messages)'
+
+# Seconds between two attempts to take a build lock held by another process
+LOCK_POLL_SECONDS = 0.05
+
+# Per-entry arrays in the order they are saved
+_ARRAYS = (('offsets', 'Q'), ('line_numbers', 'Q'), ('levels', 'I'),
+           ('timestamps', 'd'), ('loggers', 'I'), ('templates', 'I'))
+
+
+class LogIndex:
+    """Byte offset, first line number and summary fields of every entry in one log file."""
+
+    def __init__(self, file_path, filename=None):
+        self.file_path = file_path
+        self.filename = filename
+        self.generation = None
+        # The exclusion pattern the entries were indexed with
+        self.exclude = get_exclude_pattern_for_file(filename)
+        self.lock = threading.Lock()
+        # Lookup tables (names and name -> id) for the per-entry ids below
+        self.level_names, self._level_ids = [], {}
+        self.logger_names, self._logger_ids = [], {}
+        self.template_names, self._template_ids = [], {}
+        self._reset()
+
+    @property
+    def total_entries(self):
+        return len(self.offsets)
+
+    @property
+    def complete(self):
+        """Whether the whole file was indexed, rather than only what a read budget allowed."""
+        return self.generation is not None
+
+    def update(self):
+        """Bring the index up to date with the file on disk and return it.
+
+        When the request's read budget runs out, the entries scanned so far
+        are kept and the index stays incomplete; the next update resumes
+        from there.
+        """
+        with self.lock:
+            stat = os.stat(self.file_path)
+            generation = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            exclude = get_exclude_pattern_for_file(self.filename)
+            if generation == self.generation and exclude == self.exclude:
+                return self
+
+            if exclude != self.exclude:
+                self._reset()
+                self.generation = None
+                self.exclude = exclude
+            elif not self._is_appended(stat):
+                self._reset()
+            try:
+                with phase('index'):
+                    self._scan()
+            except BaseException:
+                # Never keep a half-built index around
+                self._reset()
+                self.generation = None
+                raise
+            if reads_exhausted():
+                self.generation = None
+                self._partial = (stat.st_ino, stat.st_size)
+            else:
+                self.generation = generation
+                self._partial = None
+        return self
+
+    def is_current(self, stat=None):
+        """Whether the index matches the file on disk without scanning it."""
+        if stat is None:
+            stat = os.stat(self.file_path)
+        return (self.generation == (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+                and self.exclude == get_exclude_pattern_for_file(self.filename))
+
+    def save(self, index_dir):
+        """Write the index to ``index_dir``, replacing any previous copy atomically."""
+        path = index_file_path(index_dir, self.file_path, self.filename)
+        header = {
+            'version': INDEX_FILE_VERSION,
+            'file_path': self.file_path,
+            'filename': self.filename,
+            'exclude': self.exclude,
+            'generation': self.generation,
+            'total_lines': self.total_lines,
+            'total_entries': self.total_entries,
+            'level_names': self.level_names,
+            'logger_names': self.logger_names,
+            'template_names': self.template_names,
+        }
+        os.makedirs(index_dir, exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.tmp'
+        with self.lock:
+            try:
+                with open(temp_path, 'wb') as f:
+                    f.write(json.dumps(header).encode('utf-8') + b'\n')
+                    for name, _ in _ARRAYS:
+                        getattr(self, name).tofile(f)
+                os.replace(temp_path, path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Read an index saved by :meth:`save`; returns None if it is unusable."""
+        try:
+            with open(path, 'rb') as f:
+                header = json.loads(f.readline())
+                if header.get('version') != INDEX_FILE_VERSION or header.get('generation') is None:
+                    return None
+                index = cls(header['file_path'], header['filename'])
+                for name, typecode in _ARRAYS:
+                    values = array(typecode)
+                    values.fromfile(f, header['total_entries'])
+                    setattr(index, name, values)
+        except (OSError, ValueError, KeyError, EOFError):
+            return None
+
+        index.generation = tuple(header['generation'])
+        index.exclude = header['exclude']
+        index.total_lines = header['total_lines']
+        for names, ids, key in ((index.level_names, index._level_ids, 'level_names'),
+                                (index.logger_names, index._logger_ids, 'logger_names'),
+                                (index.template_names, index._template_ids, 'template_names')):
+            names.extend(header[key])
+            ids.update((name, name_id) for name_id, name in enumerate(names))
+        for position in range(index.total_entries):
+            index._count_entry(position)
+        return index
+
+    def _is_appended(self, stat):
+        """Whether the file only grew since the last scan, so it can be extended."""
+        if self._partial is not None:
+            inode, size = self._partial
+            return stat.st_ino == inode and stat.st_size >= size
+        if self.generation is None or is_compressed(self.file_path):
+            return False
+        inode, size, _ = self.generation
+        return stat.st_ino == inode and stat.st_size >= size
+
+    def _reset(self):
+        self.offsets = array('Q')
+        self.line_numbers = array('Q')
+        self.levels = array('I')
+        self.timestamps = array('d')
+        self.loggers = array('I')
+        self.templates = array('I')
+        self.total_lines = 0
+        # (inode, size) of the file while a budgeted scan stopped part way
+        self._partial = None
+        # Entries counted per level, logger and template id, and the leading entries without a timestamp
+        self.level_counts = []
+        self.logger_counts = []
+        self.template_counts = []
+        self.untimed_entries = 0
+        # Level id -> count per minute, and (logger id -> count, template id -> count) per hour
+        self.level_buckets = {}
+        self.name_buckets = {}
+
+    @staticmethod
+    def _intern(names, ids, value):
+        """Get the id of ``value`` in a lookup table, adding it if new."""
+        value_id = ids.get(value)
+        if value_id is None:
+            value_id = ids[value] = len(names)
+            names.append(value)
+        return value_id
+
+    def _count_entry(self, position, delta=1):
+        """Add the entry at ``position`` to the aggregated counts, or remove it with ``delta=-1``."""
+        level, logger, template = self.levels[position], self.loggers[position], self.templates[position]
+        _add_count(self.level_counts, level, delta)
+        _add_count(self.logger_counts, logger, delta)
+        _add_count(self.template_counts, template, delta)
+
+        timestamp = self.timestamps[position]
+        if math.isnan(timestamp):
+            self.untimed_entries += delta
+            return
+        levels = self.level_buckets.setdefault(int(timestamp // LEVEL_BUCKET_SECONDS), {})
+        levels[level] = levels.get(level, 0) + delta
+        loggers, templates = self.name_buckets.setdefault(int(timestamp // NAME_BUCKET_SECONDS), ({}, {}))
+        loggers[logger] = loggers.get(logger, 0) + delta
+        templates[template] = templates.get(template, 0) + delta
+
+    def _pop_last_entry(self):
+        self._count_entry(len(self.offsets) - 1, -1)
+        self.levels.pop()
+        self.timestamps.pop()
+        self.loggers.pop()
+        self.templates.pop()
+        return self.offsets.pop(), self.line_numbers.pop()
+
+    def _scan(self):
+        """Index entries from the last known entry onwards.
+
+        The last entry is re-scanned because continuation lines may have been
+        appended to it since the previous scan.
+        """
+        start_offset, start_line = 0, 1
+        if self.offsets:
+            start_offset, start_line = self._pop_last_entry()
+        already_indexed = len(self.offsets)
+
+        format_config = get_log_format_for_file(self.filename)
+        # Entries without a timestamp inherit the previous entry's, NaN until the first one
+        last_timestamp = self.timestamps[-1] if self.timestamps else math.nan
+
+        next_line = start_line
+        for offset, entry_line, lines in iter_log_entries(self.file_path, self.filename, start_offset, start_line):
+            parsed = parse_log_line_with_format(lines[0], format_config) or {}
+            timestamp = normalize_timestamp(parsed.get('parsed_timestamp'))
+            if timestamp is not None:
+                last_timestamp = (timestamp - EPOCH).total_seconds()
+            logger = parsed.get('module') or parsed.get('service') or parsed.get('worker') or ''
+
+            self.offsets.append(offset)
+            self.line_numbers.append(entry_line)
+            template = get_message_template(parsed.get('message') or lines[0])
+            if template not in self._template_ids and len(self.template_names) >= MAX_TEMPLATES:
+                template = OTHER_TEMPLATE
+            self.levels.append(self._intern(self.level_names, self._level_ids, parsed.get('level') or 'INFO'))
+            self.timestamps.append(last_timestamp)
+            self.loggers.append(self._intern(self.logger_names, self._logger_ids, logger))
+            self.templates.append(self._intern(self.template_names, self._template_ids, template))
+            self._count_entry(len(self.offsets) - 1)
+            next_line = entry_line + len(lines)
+        self.total_lines = next_line - 1
+        add_count('entries_parsed', len(self.offsets) - already_indexed)
+
+    def read_entries(self, start_entry, count):
+        """Format ``count`` entries starting at ``start_entry`` by seeking to them."""
+        if count <= 0 or start_entry >= self.total_entries:
+            return []
+
+        # Seeking to a page is bounded on its own, so it isn't charged to the read budget
+        with unlimited_reads():
+            stream = iter_log_entries(self.file_path, self.filename,
+                                      self.offsets[start_entry], self.line_numbers[start_entry])
+            try:
+                with phase('read'):
+                    raw_entries = paginate_log_entries(stream, 0, count)
+            finally:
+                stream.close()
+
+        with phase('parse'):
+            return list(format_log_entries(raw_entries, self.filename))
+
+
+def _add_count(counts, name_id, delta):
+    """Add ``delta`` to the count of a name id in a list of counts, growing it as needed."""
+    if name_id >= len(counts):
+        counts.extend([0] * (name_id + 1 - len(counts)))
+    counts[name_id] += delta
+
+
+_indexes = {}
+# Keys of the indexes being built in the background
+_building = set()
+_indexes_lock = threading.Lock()
+
+
+def index_file_path(index_dir, file_path, filename=None):
+    """Path of the saved index of a log file in ``index_dir``."""
+    digest = hashlib.sha1(f'{file_path}\0{filename or ""}'.encode('utf-8')).hexdigest()
+    return os.path.join(index_dir, f'{digest}.idx')
+
+
+def build_lock_path(index_dir, file_path, filename=None):
+    """Path of the file locked while an index saved to ``index_dir`` is being built."""
+    return index_file_path(index_dir, file_path, filename)[:-len('.idx')] + '.lock'
+
+
+@contextmanager
+def build_lock(index_dir, file_path, filename=None, timeout=None):
+    """Hold the lock on building an index, shared by every process using ``index_dir``.
+
+    Yields whether the lock was taken, waiting up to ``timeout`` seconds for
+    it (forever when None, not at all when 0). Without ``fcntl`` the lock is
+    always taken.
+    """
+    if fcntl is None:
+        yield True
+        return
+    os.makedirs(index_dir, exist_ok=True)
+    fd = os.open(build_lock_path(index_dir, file_path, filename), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        acquired = _flock(fd, timeout)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def is_build_locked(index_dir, file_path, filename=None):
+    """Whether a process (on any node sharing ``index_dir``) holds the lock on building an index.
+
+    The lock dies with its holder, so an interrupted build never leaves the
+    index marked as building.
+    """
+    if fcntl is None:
+        return False
+    try:
+        fd = os.open(build_lock_path(index_dir, file_path, filename), os.O_RDONLY)
+    except OSError:
+        return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    else:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+        return False
+    finally:
+        os.close(fd)
+
+
+def _flock(fd, timeout):
+    if timeout is None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return True
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(LOCK_POLL_SECONDS)
+
+
+def iter_index_targets(log_files):
+    """Yield ``(file_path, filename, name)`` for every file listed by ``get_log_files()``.
+
+    Rotations are indexed under their group's base name, like the views
+    look them up.
+    """
+    for log_file in log_files:
+        if log_file['type'] == 'rotational_group':
+            for rot_file in log_file['rotational_files']:
+                yield rot_file['path'], log_file['name'], rot_file['name']
+        else:
+            yield log_file['path'], log_file['name'], log_file['name']
+
+
+def _load_saved_index(file_path, filename):
+    """Load the saved index of a log file if it can be brought up to date cheaply.
+
+    Saved indexes of files that were replaced (rotated or truncated) since
+    would have to be rebuilt from scratch, so they are ignored.
+    """
+    index_dir = get_index_dir()
+    if not index_dir:
+        return None
+    index = LogIndex.load(index_file_path(index_dir, file_path, filename))
+    if (index is None or index.file_path != file_path or index.filename != filename
+            or index.exclude != get_exclude_pattern_for_file(filename)):
+        return None
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    if not index.is_current(stat) and not index._is_appended(stat):
+        return None
+    return index
+
+
+def _get_or_load(key):
+    with _indexes_lock:
+        index = _indexes.get(key)
+    if index is None or not index.complete:
+        # Another process may have saved a complete index meanwhile
+        saved = _load_saved_index(*key)
+        if saved is not None:
+            with _indexes_lock:
+                if key not in _indexes or not _indexes[key].complete:
+                    _indexes[key] = saved
+                index = _indexes[key]
+    return index
+
+
+def _needs_scan(index):
+    """Whether updating an index scans its file from the start (or a saved point) rather than an append."""
+    try:
+        stat = os.stat(index.file_path)
+    except OSError:
+        # Left to update() to report
+        return False
+    if index.is_current(stat):
+        return False
+    return (index.exclude != get_exclude_pattern_for_file(index.filename)
+            or not (index.complete and index._is_appended(stat)))
+
+
+def _update_shared(key, index, timeout):
+    """Bring an index up to date, sharing full scans with the processes using ``LOG_VIEWER_INDEX_DIR``.
+
+    A scan that is more than an append takes the file's build lock, waiting
+    up to ``timeout`` seconds for a build in another process and then using
+    the index it saved; indexes completed here are saved for the others.
+    Returns the up-to-date index, or None if the lock wasn't taken in time.
+    """
+    index_dir = get_index_dir()
+    if not index_dir or not _needs_scan(index):
+        return index.update()
+
+    with build_lock(index_dir, *key, timeout=timeout) as acquired:
+        if not acquired:
+            return None
+        saved = _load_saved_index(*key)
+        if saved is not None:
+            index = saved
+        previous = index.generation
+        index.update()
+        if index.complete and index.generation != previous:
+            index.save(index_dir)
+    return index
+
+
+def get_log_index(file_path, filename=None):
+    """Get the up-to-date cached index of a log file, building it if needed.
+
+    ``filename`` selects the log format; rotations should pass their group's
+    base name so they are parsed like the current file.
+    """
+    key = (str(file_path), filename)
+    index = _get_or_load(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.setdefault(key, LogIndex(str(file_path), filename))
+
+    updated = _update_shared(key, index, get_index_lock_timeout())
+    if updated is None:
+        # Another process is still building it; scan within the read budget without saving
+        return index.update()
+    if updated is not index:
+        with _indexes_lock:
+            _indexes[key] = updated
+    return updated
+
+
+def get_cached_log_index(file_path, filename=None):
+    """Get the cached index of a log file if one was already built, else None.
+
+    An existing index, or one saved to ``LOG_VIEWER_INDEX_DIR``, is brought
+    up to date, which is cheap for files that only grew; no index is built
+    from scratch.
+    """
+    index = _get_or_load((str(file_path), filename))
+    return index.update() if index is not None else None
+
+
+def build_log_index_in_background(file_path, filename=None):
+    """Start building the index of a log file in a background thread.
+
+    The index is only added to the cache once it is complete, so requests
+    never wait for it; at most one build per file runs at a time, across all
+    processes sharing ``LOG_VIEWER_INDEX_DIR``. Returns the thread, or None
+    if the index already exists or is being built in this process.
+    """
+    key = (str(file_path), filename)
+    with _indexes_lock:
+        if (key in _indexes and _indexes[key].complete) or key in _building:
+            return None
+        _building.add(key)
+
+    def build():
+        try:
+            index = _update_shared(key, LogIndex(str(file_path), filename), timeout=0)
+        except Exception:
+            logger.exception('Building the entry index of %s failed', file_path)
+        else:
+            if index is None:
+                # Another process is building it and will save it for this one
+                return
+            with _indexes_lock:
+                # Replaces an index left incomplete by a request's read budget
+                if key not in _indexes or not _indexes[key].complete:
+                    _indexes[key] = index
+        finally:
+            with _indexes_lock:
+                _building.discard(key)
+
+    thread = threading.Thread(target=build, name=f'log-index-{os.path.basename(str(file_path))}', daemon=True)
+    thread.start()
+    return thread
+
+
+def get_index_status(file_path, filename=None):
+    """Whether a log file's index is ``'indexed'``, ``'stale'``, ``'building'`` or ``'none'``.
+
+    Looks at this process's indexes, at the ones saved by ``logviewer_index``
+    and at the build locks, without scanning the file or loading saved indexes.
+    A stale index is brought up to date when the file is next opened.
+    """
+    key = (str(file_path), filename)
+    index_dir = get_index_dir()
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if key in _building:
+            return 'building'
+    if index_dir and is_build_locked(index_dir, *key):
+        return 'building'
+
+    if index is not None:
+        if (not index.complete and index.total_entries) or index.exclude != get_exclude_pattern_for_file(filename):
+            return 'stale'
+        generation = index.generation
+    elif index_dir:
+        generation = _read_saved_generation(index_file_path(index_dir, *key), filename)
+    else:
+        generation = None
+    if generation is None:
+        return 'none'
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return 'none'
+    return 'indexed' if generation == (stat.st_ino, stat.st_size, stat.st_mtime_ns) else 'stale'
+
+
+def _read_saved_generation(path, filename):
+    try:
+        with open(path, 'rb') as f:
+            header = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    if header.get('version') != INDEX_FILE_VERSION or header.get('generation') is None:
+        return None
+    if header.get('exclude') != get_exclude_pattern_for_file(filename):
+        return None
+    return tuple(header['generation'])
+
+
+def clear_log_indexes():
+    """Drop every cached index (mainly useful for tests)."""
+    with _indexes_lock:
+        _indexes.clear()
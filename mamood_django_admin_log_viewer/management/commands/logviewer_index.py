@@ -0,0 +1,141 @@
+"""
+Build the entry indexes of all configured log files ahead of time.
+
+Indexes are saved to ``LOG_VIEWER_INDEX_DIR``, where the admin views pick
+them up, so the first request for a big log doesn't wait for its index.
+Files are indexed in parallel; with ``--watch`` the command keeps running
+and extends the indexes as the files grow.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+
+from ...conf import get_index_dir
+from ...index import LogIndex, build_lock, index_file_path, iter_index_targets
+from ...utils import get_log_files
+
+
+def load_or_create_index(index_dir, file_path, filename):
+    """The saved index of a log file, or a new empty one."""
+    index = LogIndex.load(index_file_path(index_dir, file_path, filename))
+    if index is None or index.file_path != file_path or index.filename != filename:
+        index = LogIndex(file_path, filename)
+    # An index saved with another exclusion pattern is rebuilt by update()
+    return index
+
+
+def update_and_save(index, index_dir):
+    """Bring an index up to date and save it if it changed; returns whether it did."""
+    if index.is_current():
+        return False
+    previous = (index.generation, index.exclude)
+    # Wait for a site process building the same index rather than scanning the file twice;
+    # holding the lock also shows the index as building in the file list
+    with build_lock(index_dir, index.file_path, index.filename):
+        index.update()
+        if (index.generation, index.exclude) == previous:
+            return False
+        index.save(index_dir)
+    return True
+
+
+def index_log_file(index_dir, file_path, filename):
+    """Index one log file (run in a worker process); returns ``(total_entries, seconds)``."""
+    started = time.monotonic()
+    index = load_or_create_index(index_dir, file_path, filename)
+    update_and_save(index, index_dir)
+    return index.total_entries, time.monotonic() - started
+
+
+class Command(BaseCommand):
+    help = 'Build the entry indexes of all log files and save them to LOG_VIEWER_INDEX_DIR.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                            help='Number of files indexed in parallel (default: one per CPU).')
+        parser.add_argument('--watch', action='store_true',
+                            help='Keep running and extend the indexes as the log files grow.')
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help='Seconds between checks for changed files in --watch mode (default: 5).')
+
+    def handle(self, *args, **options):
+        index_dir = get_index_dir()
+        if not index_dir:
+            raise CommandError('Set LOG_VIEWER_INDEX_DIR to the directory the indexes should be saved to.')
+        os.makedirs(index_dir, exist_ok=True)
+
+        targets = list(iter_index_targets(get_log_files()))
+        if not targets:
+            self.stdout.write('No log files found.')
+        else:
+            self.index_all(index_dir, targets, max(1, options['jobs']))
+
+        if options['watch']:
+            try:
+                self.watch(index_dir, options['interval'])
+            except KeyboardInterrupt:
+                self.stdout.write('Stopped watching.')
+
+    def index_all(self, index_dir, targets, jobs):
+        total = len(targets)
+        self.stdout.write(f'Indexing {total} log file{"s" if total != 1 else ""} with {min(jobs, total)} job(s)')
+        if jobs == 1:
+            results = ((target, self.run_inline(index_dir, target)) for target in targets)
+            for done, (target, result) in enumerate(results, 1):
+                self.report(done, total, target, result)
+            return
+
+        with ProcessPoolExecutor(max_workers=jobs, initializer=django.setup) as executor:
+            futures = {executor.submit(index_log_file, index_dir, file_path, filename): (file_path, filename, name)
+                       for file_path, filename, name in targets}
+            for done, future in enumerate(as_completed(futures), 1):
+                try:
+                    result = future.result()
+                except (OSError, ValueError) as e:
+                    result = e
+                self.report(done, total, futures[future], result)
+
+    def run_inline(self, index_dir, target):
+        file_path, filename, _ = target
+        try:
+            return index_log_file(index_dir, file_path, filename)
+        except (OSError, ValueError) as e:
+            return e
+
+    def report(self, done, total, target, result):
+        name = target[2]
+        if isinstance(result, Exception):
+            self.stderr.write(f'[{done}/{total}] {name}: failed: {result}')
+        else:
+            entries, seconds = result
+            self.stdout.write(f'[{done}/{total}] {name}: {entries} entries in {seconds:.2f}s')
+
+    def watch(self, index_dir, interval):
+        """Extend the indexes of files that changed, every ``interval`` seconds."""
+        self.stdout.write(f'Watching for changes every {interval:g}s (Ctrl+C to stop)')
+        indexes = {}
+        while True:
+            time.sleep(interval)
+            targets = list(iter_index_targets(get_log_files()))
+            # Forget files that were rotated away or removed
+            current_keys = {(file_path, filename) for file_path, filename, _ in targets}
+            for key in set(indexes) - current_keys:
+                del indexes[key]
+
+            for file_path, filename, name in targets:
+                key = (file_path, filename)
+                try:
+                    index = indexes.get(key)
+                    if index is None:
+                        index = indexes[key] = load_or_create_index(index_dir, file_path, filename)
+                    started = time.monotonic()
+                    if update_and_save(index, index_dir):
+                        self.stdout.write(f'{name}: {index.total_entries} entries '
+                                          f'in {time.monotonic() - started:.2f}s')
+                except (OSError, ValueError) as e:
+                    indexes.pop(key, None)
+                    self.stderr.write(f'{name}: failed: {e}')
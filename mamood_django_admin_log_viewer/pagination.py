@@ -0,0 +1,339 @@
+"""
+One-pass pagination of a single log file.
+
+The total entry count and a page of entries used to take two reads of the
+file (one to count, one to read the page). :func:`read_log_page` resolves
+the page, including "last page" and out-of-range pages, in a single pass:
+only the raw lines of the candidate pages are kept while streaming and just
+the chosen page is formatted. Files that already have a cached entry index
+are not scanned at all.
+
+Huge files without an index get estimated totals instead (see estimate.py):
+the page is read by seeking to its approximate byte offset, the result is
+marked ``approximate`` and the index is built in the background, so later
+requests get exact totals. Files whose scan runs out of the request's read
+budget (see budget.py) are handled the same way, with ``incomplete`` set,
+except compressed ones: they return the pages streamed before the budget
+ran out, as estimating them would decompress the file all over again.
+
+A page opened at an entry's byte offset (see :func:`read_log_page_at`) is
+the exact page holding it once the file is indexed. Until then it is read
+from the offset itself, as an index left partial by the read budget
+doesn't know the entries past where it stopped.
+
+For the first render of a live page, :func:`read_log_tail` only reads the
+last ``LOGVIEWER_INITIAL_NUMBER_OF_CHARS`` bytes, so the newest entries show
+up at once whatever the file size; the page then loads the full last page
+and its totals over AJAX.
+"""
+
+import os
+from bisect import bisect_left
+from collections import deque
+
+from .budget import budget_state, reads_exhausted, unlimited_reads
+from .compression import is_compressed
+from .conf import get_initial_number_of_chars
+from .estimate import estimate_log_totals, should_estimate_totals
+from .index import build_log_index_in_background, get_cached_log_index, get_log_index
+from .profiling import phase
+from .utils import (format_log_entries, format_log_line, get_log_start_pattern, iter_log_entries,
+                    open_log_file, paginate_log_entries)
+
+# Bytes read from the end of a file for its last page, grown until the page is full
+TAIL_CHUNK_BYTES = 64 * 1024
+
+
+def resolve_page(page, total_pages):
+    """Turn a 1-based page, or a negative one counted from the end, into a valid page number."""
+    if page < 0:
+        page = total_pages + page + 1
+    return max(1, min(page, total_pages))
+
+
+def read_log_page(file_path, page=-1, entries_per_page=25, filename=None):
+    """Read one page of a log file along with its totals.
+
+    ``page`` is 1-based; negative pages count from the end (-1 is the last
+    page) and out-of-range pages are clamped. Returns the same keys as
+    ``read_log_file_multiline_aware`` plus ``current_page``, ``total_pages``
+    and ``approximate``, which is True when the totals, page boundaries and
+    line numbers are estimates, plus ``incomplete`` and ``cursor`` (see
+    budget.py).
+    """
+    if page == 0:
+        page = 1
+    try:
+        index = get_cached_log_index(file_path, filename)
+    except (IOError, OSError):
+        index = None
+    if index is not None and index.complete:
+        return _read_indexed_page(index, page, entries_per_page)
+    try:
+        estimate = should_estimate_totals(file_path)
+    except (IOError, OSError):
+        estimate = False
+    if not estimate:
+        data = _read_streamed_page(file_path, page, entries_per_page, filename)
+        if not reads_exhausted():
+            return data
+        if is_compressed(file_path):
+            # Compressed files can't be sampled or seeked cheaply, so serve what was read
+            build_log_index_in_background(file_path, filename)
+            return data
+    build_log_index_in_background(file_path, filename)
+    state = budget_state()
+    # Reading a page by its estimated offset is bounded on its own
+    with unlimited_reads():
+        data = _read_estimated_page(file_path, page, entries_per_page, filename)
+    data.update(state)
+    return data
+
+
+def read_log_page_at(file_path, offset, entries_per_page=25, filename=None):
+    """Read the page of a log file holding the entry that starts at byte ``offset``.
+
+    Returns the keys of :func:`read_log_page`. The index is built within the
+    read budget; when it doesn't complete, the page starts at the offset and
+    its position is taken from the partial index if it reached the offset,
+    else estimated, with ``approximate`` set either way.
+    """
+    index = get_log_index(file_path, filename)
+    if index.complete:
+        return _read_indexed_page(index, bisect_left(index.offsets, offset) // entries_per_page + 1,
+                                  entries_per_page)
+    build_log_index_in_background(file_path, filename)
+    state = budget_state()
+    # Reading a page at a known offset is bounded on its own
+    with unlimited_reads():
+        data = _read_page_at(file_path, index, offset, entries_per_page, filename)
+    data.update(state)
+    return data
+
+
+def read_log_tail(file_path, entries_per_page=25, filename=None):
+    """Read the newest entries from the last ``LOGVIEWER_INITIAL_NUMBER_OF_CHARS`` bytes.
+
+    Returns the keys of :func:`read_log_page` plus ``tail`` (True), with
+    totals and line numbers extrapolated from the tail, or None when the
+    whole last page can be read as fast: the setting is off, the file is no
+    larger than the tail, compressed, already indexed, or the tail holds no
+    complete entry.
+    """
+    tail_bytes = get_initial_number_of_chars()
+    if not tail_bytes or is_compressed(file_path):
+        return None
+    try:
+        size = os.path.getsize(file_path)
+        if size <= tail_bytes:
+            return None
+        index = get_cached_log_index(file_path, filename)
+        if index is not None and index.complete:
+            return None
+        with phase('read'):
+            raw_entries = list(_aligned_entries(file_path, filename, size - tail_bytes, 1))
+    except (IOError, OSError):
+        return None
+    if not raw_entries:
+        return None
+    if should_estimate_totals(file_path, size):
+        # Start on the exact totals the follow-up request will ask for
+        build_log_index_in_background(file_path, filename)
+
+    # Extrapolate the totals from the entry and line density of the tail
+    tail_span = size - raw_entries[0][0]
+    tail_lines = sum(len(lines) for _, _, lines in raw_entries)
+    total_entries = max(len(raw_entries), round(size * len(raw_entries) / tail_span))
+    total_lines = max(tail_lines, round(size * tail_lines / tail_span))
+    total_pages = max(1, (total_entries + entries_per_page - 1) // entries_per_page)
+
+    raw_entries = raw_entries[-entries_per_page:]
+    shift = total_lines - tail_lines
+    raw_entries = [(offset, line + shift, lines) for offset, line, lines in raw_entries]
+    with phase('parse'):
+        entries = list(format_log_entries(raw_entries, filename))
+    data = _page_data(entries, total_entries, total_lines, total_entries - len(entries),
+                      total_pages, total_pages, approximate=True)
+    data['tail'] = True
+    return data
+
+
+def _read_indexed_page(index, page, entries_per_page):
+    total_pages = max(1, (index.total_entries + entries_per_page - 1) // entries_per_page)
+    current_page = resolve_page(page, total_pages)
+    start_entry = (current_page - 1) * entries_per_page
+    entries = index.read_entries(start_entry, entries_per_page)
+    return _page_data(entries, index.total_entries, index.total_lines, start_entry, current_page, total_pages)
+
+
+def _read_streamed_page(file_path, page, entries_per_page, filename):
+    # The last pages seen so far (only the current one for positive pages),
+    # plus the requested page once it has been reached
+    recent_pages = deque(maxlen=-page if page < 0 else 1)
+    wanted = None
+    total_entries = 0
+    total_lines = 0
+
+    try:
+        with phase('read'):
+            for entry in iter_log_entries(file_path, filename):
+                if total_entries % entries_per_page == 0:
+                    current = []
+                    recent_pages.append(current)
+                    if total_entries // entries_per_page + 1 == page:
+                        wanted = current
+                current.append(entry)
+                total_entries += 1
+                total_lines = entry[1] + len(entry[2]) - 1
+    except (IOError, OSError) as e:
+        entries = [format_log_line(f'Error reading file: {str(e)}', 1, filename)]
+        return _page_data(entries, 1, 1, 0, 1, 1)
+
+    total_pages = max(1, (total_entries + entries_per_page - 1) // entries_per_page)
+    current_page = resolve_page(page, total_pages)
+    if wanted is not None:
+        raw_entries = wanted
+    elif recent_pages:
+        # recent_pages[-1] is the last page
+        raw_entries = recent_pages[current_page - total_pages - 1]
+    else:
+        raw_entries = []
+
+    with phase('parse'):
+        entries = list(format_log_entries(raw_entries, filename))
+    return _page_data(entries, total_entries, total_lines, (current_page - 1) * entries_per_page,
+                      current_page, total_pages)
+
+
+def _read_estimated_page(file_path, page, entries_per_page, filename):
+    size = os.path.getsize(file_path)
+    total_entries, total_lines, entries_per_byte, lines_per_byte = estimate_log_totals(file_path, filename, size)
+    total_pages = max(1, (total_entries + entries_per_page - 1) // entries_per_page)
+    current_page = resolve_page(page, total_pages)
+
+    with phase('read'):
+        if current_page == 1:
+            raw_entries = _read_entries_at(file_path, filename, 0, entries_per_page, 1)
+        elif current_page == total_pages:
+            raw_entries = _read_tail_entries(file_path, filename, entries_per_page, size, total_lines)
+        else:
+            start = int((current_page - 1) * entries_per_page / entries_per_byte)
+            raw_entries = _read_entries_at(file_path, filename, min(start, size), entries_per_page,
+                                           round(start * lines_per_byte) + 1)
+
+    with phase('parse'):
+        entries = list(format_log_entries(raw_entries, filename))
+    return _page_data(entries, total_entries, total_lines, (current_page - 1) * entries_per_page,
+                      current_page, total_pages, approximate=True)
+
+
+def _read_page_at(file_path, index, offset, entries_per_page, filename):
+    start, start_entry, start_line = offset, None, None
+    position = bisect_left(index.offsets, offset)
+    if position < index.total_entries and index.offsets[position] == offset:
+        # The partial index reached the offset, so the page and its first line are known
+        start_entry = position - position % entries_per_page
+        start, start_line = index.offsets[start_entry], index.line_numbers[start_entry]
+
+    compressed = is_compressed(file_path)
+    entries_per_byte = lines_per_byte = None
+    if index.total_entries and index.offsets[-1]:
+        # The part of the file indexed so far is the best sample of its density
+        entries_per_byte = index.total_entries / index.offsets[-1]
+        lines_per_byte = index.total_lines / index.offsets[-1]
+    elif not compressed:
+        _, _, entries_per_byte, lines_per_byte = estimate_log_totals(file_path, filename)
+    if start_entry is None:
+        start_entry = round(offset * (entries_per_byte or 0))
+        start_line = round(offset * (lines_per_byte or 0)) + 1
+
+    with phase('read'):
+        raw_entries = _read_entries_at(file_path, filename, start, entries_per_page, start_line)
+    with phase('parse'):
+        entries = list(format_log_entries(raw_entries, filename))
+
+    end_entry = start_entry + len(entries)
+    end_line = entries[-1].end_number if entries else start_line
+    if compressed or not entries_per_byte:
+        # The uncompressed size is unknown, so the totals only count up to this page
+        total_entries, total_lines = end_entry, end_line
+    else:
+        size = os.path.getsize(file_path)
+        total_entries = max(end_entry, round(size * entries_per_byte))
+        total_lines = max(end_line, round(size * lines_per_byte))
+    total_pages = max(1, (total_entries + entries_per_page - 1) // entries_per_page)
+    return _page_data(entries, total_entries, total_lines, start_entry, start_entry // entries_per_page + 1,
+                      total_pages, approximate=True)
+
+
+def _aligned_entries(file_path, filename, start, start_line):
+    """Stream the entries from the first line at or after byte ``start``.
+
+    When ``start`` falls inside an entry, its remaining lines are skipped.
+    """
+    offset = start
+    if start:
+        with open_log_file(file_path) as f:
+            f.seek(start - 1)
+            # Skip the rest of the line byte ``start`` falls in
+            f.readline()
+            offset = f.tell()
+    entries = iter_log_entries(file_path, filename, offset, start_line)
+    if offset:
+        first = next(entries, None)
+        if first is not None and get_log_start_pattern(filename).match(first[2][0].lstrip()):
+            return _prepend(first, entries)
+    return entries
+
+
+def _prepend(first, entries):
+    yield first
+    yield from entries
+
+
+def _read_entries_at(file_path, filename, start, count, start_line):
+    entries = _aligned_entries(file_path, filename, start, start_line)
+    try:
+        return paginate_log_entries(entries, 0, count)
+    finally:
+        entries.close()
+
+
+def _read_tail_entries(file_path, filename, count, size, total_lines):
+    """The last ``count`` entries, numbered so the last line is ``total_lines``."""
+    chunk = TAIL_CHUNK_BYTES
+    while True:
+        start = max(0, size - chunk)
+        entries = list(_aligned_entries(file_path, filename, start, 1))
+        if len(entries) >= count or start == 0:
+            break
+        chunk *= 4
+
+    entries = entries[-count:]
+    if start == 0:
+        return entries
+    # Renumber the lines, which were counted from the start of the chunk
+    if entries:
+        _, last_line, last_lines = entries[-1]
+        shift = max(0, total_lines - (last_line + len(last_lines) - 1))
+        entries = [(offset, line + shift, lines) for offset, line, lines in entries]
+    return entries
+
+
+def _page_data(entries, total_entries, total_lines, start_entry, current_page, total_pages, approximate=False):
+    # Page entries carry an offset instead of their full content
+    for entry in entries:
+        entry.pop('full_content', None)
+    return {
+        'entries': entries,
+        'total_entries': total_entries,
+        'total_lines': total_lines,
+        'start_entry': start_entry,
+        'end_entry': start_entry + len(entries),
+        'actual_start_line': entries[0].number if entries else 1,
+        'actual_end_line': entries[-1].end_number if entries else 1,
+        'current_page': current_page,
+        'total_pages': total_pages,
+        'approximate': approximate,
+        **budget_state(),
+    }
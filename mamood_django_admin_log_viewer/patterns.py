@@ -0,0 +1,154 @@
+"""
+Guards and match-time sampling for log format patterns.
+
+A custom ``LOG_VIEWER_FORMATS`` pattern with nested quantifiers can take
+seconds to match (or fail to match) a single long line. Python's ``re``
+cannot be interrupted, so the guard bounds the work instead: with
+``LOG_VIEWER_MAX_MATCH_LENGTH`` set, only the start of longer lines is
+matched. With ``LOG_VIEWER_PATTERN_SAMPLE_INTERVAL`` set, every n-th match
+is timed per format, and sampled matches slower than
+``LOG_VIEWER_SLOW_MATCH_MS`` are kept for the "Slow Patterns" admin report.
+"""
+
+import threading
+import time
+from collections import deque
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .conf import get_max_match_length, get_pattern_sample_interval, get_slow_match_ms
+
+# Slow lines kept per format for the report
+SLOW_LINES_KEPT = 20
+
+# Characters of a slow line shown in the report
+SLOW_LINE_PREVIEW = 200
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+# cap_line() runs once per parsed entry, so the cap setting is cached
+_NOT_LOADED = object()
+_max_match_length = _NOT_LOADED
+
+
+@receiver(setting_changed)
+def _reset_max_match_length(setting, **kwargs):
+    global _max_match_length
+    if setting == 'LOG_VIEWER_MAX_MATCH_LENGTH':
+        _max_match_length = _NOT_LOADED
+
+
+class PatternStats:
+    """Sampled match timings of one log format."""
+
+    def __init__(self, format_name, pattern):
+        self.format_name = format_name
+        self.pattern = pattern
+        self.samples = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.slow_matches = 0
+        self.slow_lines = deque(maxlen=SLOW_LINES_KEPT)
+
+    @property
+    def mean_us(self):
+        return self.total_seconds / self.samples * 1e6 if self.samples else 0.0
+
+    @property
+    def max_ms(self):
+        return self.max_seconds * 1000
+
+
+class GuardedPattern:
+    """Stands in for a compiled entry-start pattern, capping and sampling its matches."""
+
+    __slots__ = ('pattern', 'format_name', 'filename', 'max_length', 'sample_interval',
+                 'slow_seconds', '_countdown')
+
+    def __init__(self, pattern, format_name, filename, max_length, sample_interval, slow_ms):
+        self.pattern = pattern
+        self.format_name = format_name
+        self.filename = filename
+        self.max_length = max_length
+        self.sample_interval = sample_interval
+        self.slow_seconds = slow_ms / 1000
+        self._countdown = 1  # the first line is always sampled
+
+    def match(self, line):
+        if self.max_length and len(line) > self.max_length:
+            line = line[:self.max_length]
+
+        if self.sample_interval:
+            self._countdown -= 1
+            if self._countdown <= 0:
+                self._countdown = self.sample_interval
+                started = time.perf_counter()
+                match = self.pattern.match(line)
+                self._record(time.perf_counter() - started, line)
+                return match
+
+        return self.pattern.match(line)
+
+    def _record(self, seconds, line):
+        with _stats_lock:
+            stats = _stats.get(self.format_name)
+            if stats is None or stats.pattern != self.pattern.pattern:
+                stats = _stats[self.format_name] = PatternStats(self.format_name, self.pattern.pattern)
+            stats.samples += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            if seconds > self.slow_seconds:
+                stats.slow_matches += 1
+                stats.slow_lines.append({
+                    'ms': seconds * 1000,
+                    'file': self.filename,
+                    'length': len(line),
+                    'line': line[:SLOW_LINE_PREVIEW],
+                })
+
+
+def guard_pattern(pattern, format_name, filename=None):
+    """Wrap a compiled entry-start pattern according to the guard settings.
+
+    Returns the pattern itself when neither capping nor sampling is enabled,
+    so the default configuration adds no per-line overhead.
+    """
+    max_length = get_max_match_length()
+    sample_interval = get_pattern_sample_interval()
+    if not max_length and not sample_interval:
+        return pattern
+    return GuardedPattern(pattern, format_name, filename, max_length, sample_interval, get_slow_match_ms())
+
+
+def cap_line(line):
+    """Cut a line to ``LOG_VIEWER_MAX_MATCH_LENGTH`` before matching, if set."""
+    global _max_match_length
+    max_length = _max_match_length
+    if max_length is _NOT_LOADED:
+        max_length = _max_match_length = get_max_match_length()
+    if max_length and len(line) > max_length:
+        return line[:max_length]
+    return line
+
+
+def get_pattern_report():
+    """Sampled timings per format, slowest first."""
+    with _stats_lock:
+        report = [{
+            'format_name': stats.format_name,
+            'pattern': stats.pattern,
+            'samples': stats.samples,
+            'mean_us': stats.mean_us,
+            'max_ms': stats.max_ms,
+            'slow_matches': stats.slow_matches,
+            'slow_lines': list(reversed(stats.slow_lines)),
+        } for stats in _stats.values()]
+    return sorted(report, key=lambda item: item['max_ms'], reverse=True)
+
+
+def clear_pattern_stats():
+    """Forget all sampled timings."""
+    with _stats_lock:
+        _stats.clear()
@@ -0,0 +1,164 @@
+"""
+Read a whole rotation group as one continuous log.
+
+``django.log.30.gz … django.log.1, django.log`` are presented as a single
+chronologically ordered log. Global entry numbers come from the per-file
+entry counts of each file's index, so a page only reads the files it
+actually overlaps, and only those files are indexed for it. The counts of
+the other files come from their cached or saved indexes, else are estimated:
+small plain files are indexed, large ones sampled (see estimate.py), and
+compressed ones extrapolated from the entries and lines per compressed byte
+of the group's indexed rotations. Estimated results are ``approximate``;
+the oldest file still estimated is indexed in the background, one per
+request, so the totals become exact. When the read budget runs out while
+indexing, the totals only cover what was indexed so far and the result is
+``incomplete``; later requests resume indexing where it stopped.
+"""
+
+import os
+
+from .budget import budget_state
+from .compression import is_compressed
+from .estimate import estimate_log_totals, should_estimate_totals
+from .index import build_log_index_in_background, get_cached_log_index, get_log_index
+from .utils import get_chronological_files
+
+
+def _file_size(rot_file):
+    size = rot_file.get('size')
+    return os.path.getsize(rot_file['path']) if size is None else size
+
+
+def _get_file_totals(files, filename, indexes):
+    """Get the ``(entries, lines, exact)`` of each file of a group.
+
+    ``indexes`` holds each file's cached index or None, and is filled in for
+    the files indexed here. Compressed rotations are estimated from the
+    density of the group's indexed ones; when there is none, the smallest
+    compressed rotation is indexed to measure it.
+    """
+    totals = [None] * len(files)
+    for position, (rot_file, index) in enumerate(zip(files, indexes)):
+        if index is None or not index.complete:
+            if is_compressed(rot_file['path']):
+                continue
+            size = _file_size(rot_file)
+            if should_estimate_totals(rot_file['path'], size):
+                entries, lines, _, _ = estimate_log_totals(rot_file['path'], filename, size)
+                totals[position] = (entries, lines, False)
+                continue
+            index = indexes[position] = get_log_index(rot_file['path'], filename)
+        totals[position] = (index.total_entries, index.total_lines, True)
+
+    pending = [position for position, file_totals in enumerate(totals) if file_totals is None]
+    if not pending:
+        return totals
+
+    indexed = [position for position, rot_file in enumerate(files)
+               if is_compressed(rot_file['path']) and totals[position] is not None]
+    if not indexed:
+        smallest = min(pending, key=lambda position: _file_size(files[position]))
+        index = indexes[smallest] = get_log_index(files[smallest]['path'], filename)
+        totals[smallest] = (index.total_entries, index.total_lines, True)
+        pending.remove(smallest)
+        if index.complete:
+            indexed.append(smallest)
+
+    indexed_bytes = sum(_file_size(files[position]) for position in indexed)
+    indexed_entries = sum(totals[position][0] for position in indexed)
+    indexed_lines = sum(totals[position][1] for position in indexed)
+    for position in pending:
+        # Without a complete index to measure (out of read budget), the file counts as empty
+        size = _file_size(files[position])
+        totals[position] = (round(size * indexed_entries / indexed_bytes) if indexed_bytes else 0,
+                            round(size * indexed_lines / indexed_bytes) if indexed_bytes else 0,
+                            False)
+    return totals
+
+
+def _spanned_files(totals, start_entry, end_entry):
+    """Get the positions of the files holding the global entries ``start_entry`` to ``end_entry``."""
+    positions = []
+    first_entry = 0
+    for position, (entries, _, _) in enumerate(totals):
+        if start_entry < first_entry + entries and end_entry > first_entry:
+            positions.append(position)
+        first_entry += entries
+    return positions
+
+
+def read_group_log(log_file, entries_per_page=25, page=None):
+    """Read one page of a rotation group as if it were a single log file.
+
+    ``page`` is 1-based and clamped to the valid range; None means the last
+    page. Returns the same keys as ``read_log_file_multiline_aware`` plus
+    ``current_page``, ``total_pages`` and ``approximate``.
+    """
+    files = get_chronological_files(log_file)
+    # Rotations are parsed with the format configured for the group's base name
+    indexes = [get_cached_log_index(f['path'], log_file['name']) for f in files]
+    totals = _get_file_totals(files, log_file['name'], indexes)
+
+    while True:
+        total_entries = sum(entries for entries, _, _ in totals)
+        total_lines = sum(lines for _, lines, _ in totals)
+        total_pages = max(1, (total_entries + entries_per_page - 1) // entries_per_page)
+        current_page = total_pages if page is None else max(1, min(page, total_pages))
+
+        start_entry = (current_page - 1) * entries_per_page
+        end_entry = min(start_entry + entries_per_page, total_entries)
+
+        # Index the estimated files the page spans, then locate it again on their exact counts
+        unindexed = [position for position in _spanned_files(totals, start_entry, end_entry)
+                     if not totals[position][2]]
+        if not unindexed:
+            break
+        for position in unindexed:
+            index = indexes[position] = get_log_index(files[position]['path'], log_file['name'])
+            totals[position] = (index.total_entries, index.total_lines, True)
+
+    entries = []
+    actual_start_line = actual_end_line = 1
+    first_entry = 0  # global number of each file's first entry
+    first_line = 0   # global line number just before each file's first line
+
+    for rot_file, index, (file_entries, file_lines, _) in zip(files, indexes, totals):
+        file_end_entry = first_entry + file_entries
+
+        if start_entry < file_end_entry and end_entry > first_entry:
+            local_start = max(start_entry, first_entry) - first_entry
+            local_end = min(end_entry, file_end_entry) - first_entry
+
+            for entry in index.read_entries(local_start, local_end - local_start):
+                entry.pop('full_content', None)
+                entry['source_file'] = rot_file['name']
+                entry['global_line'] = first_line + entry.number
+                if not entries:
+                    actual_start_line = entry['global_line']
+                actual_end_line = first_line + entry.end_number
+                entries.append(entry)
+
+        if file_end_entry >= end_entry:
+            break
+        first_entry = file_end_entry
+        first_line += file_lines
+
+    estimated = [rot_file for rot_file, (_, _, exact) in zip(files, totals) if not exact]
+    if estimated:
+        # One file at a time, oldest first, so indexing doesn't compete with the requests
+        build_log_index_in_background(estimated[0]['path'], log_file['name'])
+
+    state = budget_state()
+    return {
+        'entries': entries,
+        'total_entries': total_entries,
+        'total_lines': total_lines,
+        'start_entry': start_entry,
+        'end_entry': end_entry,
+        'actual_start_line': actual_start_line,
+        'actual_end_line': actual_end_line,
+        'current_page': current_page,
+        'total_pages': total_pages,
+        'approximate': bool(estimated) or state['incomplete'],
+        **state,
+    }
@@ -0,0 +1,242 @@
+"""
+Server-side search across the files of a rotation group.
+
+Matching entries in thirty ``.gz`` rotations is dominated by decompression,
+which is CPU-bound, so each file is scanned in a worker process of its own,
+``LOG_VIEWER_SEARCH_WORKERS`` at a time. Results are collected in file
+order (oldest rotation first, like the pages of the group view), so the
+matches of the first files are used while later files are still being
+scanned. Once the requested page of matches is filled, queued scans are
+cancelled and running ones are told to stop.
+
+A search may use ``LOG_VIEWER_SEARCH_CPU_SECONDS`` of CPU time across its
+workers; with n workers it gets a n-th of that as wall time. Files that
+were not scanned to the end by then make the result ``incomplete``.
+
+Results are paged with a cursor rather than a page number: each result
+carries the position after its last match (or after the last entry scanned,
+when cut short), and "more results" resumes the scan there instead of
+scanning the files again from the start.
+
+With ``LOG_VIEWER_SEARCH_WORKERS = 1``, or for a single file, files are
+scanned in the request's own process. Workers are started by a fork server
+(or spawned where there is none) rather than forked from the multi-threaded
+request process.
+"""
+
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+
+from .budget import ReadBudget, read_budget
+from .conf import get_search_cpu_seconds, get_search_workers
+from .profiling import add_count, phase
+from .utils import format_log_entry_lines, get_chronological_files, iter_log_entries
+
+logger = logging.getLogger(__name__)
+
+# Entries scanned between two checks whether the search still needs the worker
+STOP_CHECK_INTERVAL = 1024
+
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+
+def compile_search(query, regex=False):
+    """Compile a search query, case-insensitive like the filters of the log pages.
+
+    Raises ``re.error`` for an invalid regular expression.
+    """
+    return re.compile(query if regex else re.escape(query), re.IGNORECASE)
+
+
+def parse_search_cursor(value):
+    """Parse a cursor returned with a page of results into ``(file_position, after)``.
+
+    Raises ``ValueError`` for a malformed cursor.
+    """
+    parts = [int(part) for part in value.split(':')]
+    if len(parts) not in (1, 3) or min(parts) < 0:
+        raise ValueError(f'Invalid search cursor: {value!r}')
+    return parts[0], tuple(parts[1:]) or None
+
+
+def _format_cursor(file_position, after):
+    """The cursor resuming a search in the file at ``file_position``, after the entry at ``after``."""
+    if after is None:
+        return str(file_position)
+    return f'{file_position}:{after[0]}:{after[1]}'
+
+
+def scan_file(file_path, filename, pattern, flags, limit, deadline=None, running_path=None, after=None):
+    """Find the first ``limit`` entries of a file whose text matches ``pattern``.
+
+    Runs in a search worker process (or inline). With ``after`` (the
+    ``(offset, start_line)`` of an entry), the scan starts after that entry.
+    It stops at ``deadline`` (a ``time.time()`` value), and as soon as
+    ``running_path`` no longer exists, which is how the search tells its
+    workers it has enough matches. Returns ``(matches, complete, last)``:
+    the matching entries as ``(offset, start_line, lines)`` tuples, whether
+    the scan reached the end of the file or ``limit``, and the position of
+    the last entry checked, to resume after.
+    """
+    regex = re.compile(pattern, flags)
+    max_seconds = None if deadline is None else max(0, deadline - time.time())
+    matches = []
+    # Positions of the last entry checked and of the one before it
+    last = previous = after
+    start_offset, start_line = after or (0, 1)
+    with read_budget(ReadBudget(max_seconds=max_seconds)) as budget:
+        entries = iter_log_entries(file_path, filename, start_offset, start_line)
+        if after is not None:
+            next(entries, None)
+        for scanned, entry in enumerate(entries, 1):
+            if running_path and not scanned % STOP_CHECK_INTERVAL and not os.path.exists(running_path):
+                return matches, False, last
+            previous, last = last, entry[:2]
+            if regex.search(''.join(entry[2])):
+                matches.append(entry)
+                if len(matches) >= limit:
+                    return matches, True, last
+    if budget.exhausted:
+        # The time limit may have cut the last entry short, so it is checked again on resume
+        if matches and matches[-1][:2] == last:
+            matches.pop()
+        return matches, False, previous
+    return matches, True, last
+
+
+def _get_pool(workers):
+    """Get the search process pool, (re)creating it for ``workers`` processes."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # Forking the request process would copy the locks other request threads hold
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method),
+                                        initializer=django.setup)
+            _pool_workers = workers
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = None
+
+
+def _scan_in_order(files, filename, regex, limit, workers, deadline, after=None):
+    """Yield ``(file, matches, complete, last)`` per file in order, scanning in parallel when possible.
+
+    The first file is scanned after the entry at ``after``.
+    """
+    if workers <= 1 or len(files) == 1:
+        for position, log_file in enumerate(files):
+            yield (log_file, *scan_file(log_file['path'], filename, regex.pattern, regex.flags, limit, deadline,
+                                        after=None if position else after))
+        return
+
+    fd, running_path = tempfile.mkstemp(prefix='logviewer-search-')
+    os.close(fd)
+    futures = []
+    done = 0
+    try:
+        pool = _get_pool(workers)
+        futures = [pool.submit(scan_file, log_file['path'], filename, regex.pattern, regex.flags,
+                               limit, deadline, running_path, None if position else after)
+                   for position, log_file in enumerate(files)]
+        for log_file, future in zip(files, futures):
+            result = future.result()
+            done += 1
+            yield (log_file, *result)
+    except BrokenProcessPool:
+        logger.warning("Search worker pool broke; searching in process")
+        _reset_pool()
+        yield from _scan_in_order(files[done:], filename, regex, limit, 1, deadline, None if done else after)
+    finally:
+        # Drop queued scans and stop running ones
+        for future in futures:
+            future.cancel()
+        os.remove(running_path)
+
+
+def search_log_files(files, filename, regex, cursor=None, entries_per_page=25):
+    """Read one page of the entries matching ``regex`` across ``files``, in file order.
+
+    ``files`` are file dicts (``name``, ``path``) of one log, oldest first,
+    parsed with the format of ``filename``. ``cursor`` is the value returned
+    with the previous page (see :func:`parse_search_cursor`), None for the
+    first page. Returns the formatted ``entries`` (with their
+    ``source_file``), the ``cursor`` of the next page (None after the last),
+    ``has_more``, ``files_searched`` and ``incomplete``.
+    """
+    file_position, after = cursor or (0, None)
+    remaining = files[file_position:]
+    # One more than needed tells whether there is a next page
+    limit = entries_per_page + 1
+
+    workers = get_search_workers() or min(4, os.cpu_count() or 1)
+    cpu_seconds = get_search_cpu_seconds()
+    # The workers scan in parallel, so their CPU time adds up
+    deadline = None if cpu_seconds is None else time.time() + cpu_seconds / max(1, min(workers, len(remaining)))
+
+    matches = []
+    files_searched = file_position
+    stopped = None
+    with phase('read'):
+        scans = _scan_in_order(remaining, filename, regex, limit, workers, deadline, after)
+        try:
+            for position, (log_file, file_matches, complete, last) in enumerate(scans, file_position):
+                files_searched = position + 1
+                matches.extend((position, log_file, match) for match in file_matches)
+                if not complete:
+                    stopped = (position, last)
+                    break
+                if len(matches) >= limit:
+                    break
+        finally:
+            scans.close()
+
+    if len(matches) > entries_per_page:
+        position, _, (offset, start_line, _) = matches[entries_per_page - 1]
+        next_cursor = _format_cursor(position, (offset, start_line))
+    elif stopped is not None:
+        next_cursor = _format_cursor(*stopped)
+    else:
+        next_cursor = None
+
+    entries = []
+    for _, log_file, (offset, start_line, lines) in matches[:entries_per_page]:
+        add_count('entries_parsed', 1)
+        entry = format_log_entry_lines(lines, start_line, filename, offset)
+        entry.pop('full_content', None)
+        entry['source_file'] = log_file['name']
+        entries.append(entry)
+
+    return {
+        'entries': entries,
+        'cursor': next_cursor,
+        'has_more': next_cursor is not None,
+        'files_searched': files_searched,
+        'incomplete': stopped is not None,
+    }
+
+
+def search_log(log_file, regex, cursor=None, entries_per_page=25):
+    """Search a listed log file, all of its rotations when it is a rotation group."""
+    # Rotations are parsed with the format configured for their group's base name
+    filename = log_file.get('parent_group', log_file['name'])
+    return search_log_files(get_chronological_files(log_file), filename, regex, cursor, entries_per_page)
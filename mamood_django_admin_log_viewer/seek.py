@@ -0,0 +1,126 @@
+"""
+Jump to the first log entry at or after a given time.
+
+Log files are written in time order, so the entry for a moment can be found
+by binary searching the file's byte range: seek to the middle, resync to the
+next entry start and compare its timestamp. This takes O(log filesize) reads
+and needs no prebuilt index.
+"""
+
+import os
+
+from .compression import is_compressed
+from .utils import (get_chronological_files, get_log_format_for_file, get_log_start_pattern,
+                    decode_log_line, iter_log_entries, normalize_timestamp, open_log_file,
+                    parse_log_line_with_format)
+
+# Below this many bytes a linear scan is cheaper than more seeking
+LINEAR_SCAN_BYTES = 64 * 1024
+
+
+def _parse_entry_timestamp(line, format_config):
+    """Get the normalized timestamp of an entry's first line, if any."""
+    parsed = parse_log_line_with_format(line, format_config)
+    if parsed:
+        return normalize_timestamp(parsed['parsed_timestamp'])
+    return None
+
+
+def _resync(f, offset):
+    """Seek to the first line starting at or after ``offset`` and return its offset."""
+    if offset <= 0:
+        f.seek(0)
+        return 0
+    # Reading from the byte before keeps a line that starts exactly at offset
+    f.seek(offset - 1)
+    return offset - 1 + len(f.readline())
+
+
+def _next_timestamped_entry(f, offset, limit, log_start_pattern, format_config):
+    """Find the first entry starting in ``[offset, limit)`` that has a timestamp.
+
+    Returns ``(entry_offset, timestamp)`` or None.
+    """
+    position = _resync(f, offset)
+    while position < limit:
+        raw_line = f.readline()
+        if not raw_line:
+            break
+        line = decode_log_line(raw_line).strip()
+        if log_start_pattern.match(line):
+            timestamp = _parse_entry_timestamp(line, format_config)
+            if timestamp is not None:
+                return position, timestamp
+        position += len(raw_line)
+    return None
+
+
+def find_offset_for_timestamp(file_path, target, filename=None):
+    """Find the byte offset of the first entry at or after ``target``.
+
+    Returns None if every entry is older. Compressed files cannot seek
+    cheaply, so they are scanned linearly instead.
+    """
+    target = normalize_timestamp(target)
+    format_config = get_log_format_for_file(filename)
+    log_start_pattern = get_log_start_pattern(filename)
+
+    # Invariant: every entry starting before lo is older than the target
+    lo = 0
+    if not is_compressed(file_path):
+        hi = os.path.getsize(file_path)
+        with open_log_file(file_path) as f:
+            while hi - lo > LINEAR_SCAN_BYTES:
+                mid = (lo + hi) // 2
+                found = _next_timestamped_entry(f, mid, hi, log_start_pattern, format_config)
+                if found is None:
+                    hi = mid
+                elif found[1] < target:
+                    lo = found[0] + 1
+                else:
+                    hi = found[0]
+
+            start_offset = _resync(f, lo)
+    else:
+        start_offset = 0
+
+    for offset, _, lines in iter_log_entries(file_path, filename, start_offset):
+        timestamp = _parse_entry_timestamp(lines[0].strip(), format_config)
+        if timestamp is not None and timestamp >= target:
+            return offset
+    return None
+
+
+def pick_file_for_timestamp(log_file, target):
+    """Pick the physical file of a log that covers ``target``.
+
+    A file's modification time is (about) the time of its last entry, so the
+    oldest file modified at or after the target is the one containing it.
+    """
+    target = normalize_timestamp(target)
+    files = get_chronological_files(log_file)
+    for rot_file in files:
+        if rot_file['modified'] >= target:
+            return rot_file
+    return files[-1]
+
+
+def seek_log_file(log_file, target):
+    """Find the physical file and byte offset of the first entry at or after ``target``.
+
+    Returns a dict with the ``file`` (its info dict) and the entry ``offset``,
+    which is None if the file has no entry that recent.
+    """
+    files = get_chronological_files(log_file)
+    rot_file = pick_file_for_timestamp(log_file, target)
+    # Rotations are parsed with the format configured for the group's base name
+    format_name = log_file.get('parent_group', log_file['name'])
+    offset = find_offset_for_timestamp(rot_file['path'], target, format_name)
+
+    # Modification times are only approximate; fall through to the next file
+    position = files.index(rot_file)
+    if offset is None and position + 1 < len(files):
+        rot_file = files[position + 1]
+        offset = find_offset_for_timestamp(rot_file['path'], target, format_name)
+
+    return {'file': rot_file, 'offset': offset}
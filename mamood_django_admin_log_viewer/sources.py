@@ -0,0 +1,153 @@
+"""
+Discovery of the log files to list.
+
+Log files come from two places: the names in ``LOG_VIEWER_FILES``, looked up
+in ``LOG_VIEWER_FILES_DIR``, and the sources in ``LOG_VIEWER_SOURCES``. A
+source is a directory, a glob ``pattern`` (``*.log`` by default) and
+optionally the ``format`` of the files it matches::
+
+    LOG_VIEWER_SOURCES = [
+        {'directory': '/var/log/nginx', 'pattern': 'access*.log', 'format': 'nginx_access'},
+        {'directory': '/var/log/app', 'pattern': 'celery-worker-*.log', 'format': 'celery_worker'},
+    ]
+
+Every file a source matches is listed under its own name, with its
+rotations grouped under it; files that are rotations of another file in the
+directory are not listed on their own.
+
+Directory listings are cached per process and only read again once the
+directory's modification time changes, i.e. when a file was created,
+removed or renamed in it. Listing the files is then one ``stat`` per
+directory, and log files started by new worker processes show up on the
+next request.
+
+The format of each listed file is looked up for every entry read, so the
+formats found by the last discovery are kept and only discovered again once
+the configuration or a source directory's modification time changes.
+"""
+
+import os
+import re
+import time
+from fnmatch import fnmatchcase
+
+from .conf import get_log_files, get_log_files_dir, get_log_sources
+
+DEFAULT_SOURCE_PATTERN = '*.log'
+
+# Listings taken this soon after the directory changed are not cached: a file
+# created within the same timestamp tick would not change its modification time
+RACY_LISTING_SECONDS = 1
+
+# Directory -> (modification time in ns, {name: path})
+_listings = {}
+
+# (configuration and source directory modification times, {name: format}) of the last discovery
+_formats = None
+
+# A dot followed by a digit, where a rotation's suffix starts
+_ROTATION_SUFFIX_START_RE = re.compile(r'\.(?=[0-9])')
+
+
+def list_log_dir(directory):
+    """Map the names of the files in a directory to their paths.
+
+    The directory is read with one ``os.scandir`` call, and the listing is
+    reused until the directory's modification time changes.
+    """
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except OSError:
+        return {}
+
+    cached = _listings.get(directory)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    try:
+        with os.scandir(directory) as entries:
+            files = {entry.name: entry.path for entry in entries if entry.is_file()}
+    except OSError:
+        return {}
+
+    if time.time_ns() - mtime_ns > RACY_LISTING_SECONDS * 1_000_000_000:
+        _listings[directory] = (mtime_ns, files)
+    return files
+
+
+def clear_log_listings():
+    """Forget all cached directory listings and the formats found in them."""
+    global _formats
+    _listings.clear()
+    _formats = None
+
+
+def is_rotated_file(name, listing):
+    """Whether ``name`` is a rotation of another file in the same directory listing."""
+    return any(name[:match.start()] in listing for match in _ROTATION_SUFFIX_START_RE.finditer(name))
+
+
+def discover_log_sources():
+    """Map the name of every listed log file to its current file's path and log format.
+
+    Names from ``LOG_VIEWER_FILES`` come first, in their configured order,
+    then the files matched by each of ``LOG_VIEWER_SOURCES`` sorted by name.
+    When two sources find files with the same name, the first one is kept.
+    The format is that of the source that found the file, None for names
+    from ``LOG_VIEWER_FILES`` and sources without a ``format``.
+    """
+    log_dir = get_log_files_dir()
+    log_files = {}
+    for log_file in get_log_files():
+        log_files.setdefault(log_file, (os.path.join(log_dir, log_file), None))
+
+    for source in get_log_sources():
+        directory = source.get('directory')
+        if not directory:
+            continue
+        pattern = source.get('pattern') or DEFAULT_SOURCE_PATTERN
+        listing = list_log_dir(directory)
+        for name in sorted(listing):
+            if fnmatchcase(name, pattern) and not is_rotated_file(name, listing):
+                log_files.setdefault(name, (listing[name], source.get('format')))
+    return log_files
+
+
+def discover_log_files():
+    """Map the name of every listed log file to the path of its current file (see :func:`discover_log_sources`)."""
+    return {name: path for name, (path, _) in discover_log_sources().items()}
+
+
+def _discovery_state():
+    """What discovery depends on: the configuration and each source directory's modification time.
+
+    Returns None while a directory changed too recently for its listing to be cached.
+    """
+    sources = get_log_sources()
+    mtimes = []
+    for source in sources:
+        directory = source.get('directory')
+        if not directory:
+            continue
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns is not None and time.time_ns() - mtime_ns <= RACY_LISTING_SECONDS * 1_000_000_000:
+            return None
+        mtimes.append(mtime_ns)
+    return get_log_files_dir(), tuple(get_log_files()), repr(sources), tuple(mtimes)
+
+
+def get_source_format(filename):
+    """Get the log format of the source that found the listed file ``filename``, if any."""
+    global _formats
+    state = _discovery_state()
+    cached = _formats
+    if state is not None and cached is not None and cached[0] == state:
+        return cached[1].get(filename)
+
+    formats = {name: source_format for name, (_, source_format) in discover_log_sources().items()}
+    if state is not None:
+        _formats = (state, formats)
+    return formats.get(filename)
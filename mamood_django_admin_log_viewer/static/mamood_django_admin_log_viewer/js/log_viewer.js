@@ -12,6 +12,12 @@ class LogViewer {
         this.autoRefreshDefault = options.autoRefreshDefault !== false; // Default true
         this.autoScrollToBottom = options.autoScrollToBottom !== false; // Default true
         this.ajaxUrl = options.ajaxUrl;
+        this.entryUrl = options.entryUrl; // Entry URL for offset 0, e.g. .../entry/0/
+        this.seekUrl = options.seekUrl;
+        this.statsUrl = options.statsUrl;
+        this.searchUrl = options.searchUrl;
+        this.approximate = options.approximate === true; // Totals estimated from the file size
+        this.tail = options.tail === true; // Only the end of the file was rendered
         this.autoRefresh = this.autoRefreshDefault; // Use default setting
         this.refreshTimer = null;
         this.lastRefreshTime = 0;
@@ -49,6 +55,49 @@ class LogViewer {
         if (this.autoScrollToBottom && this.liveMode) {
             this.scrollToBottom();
         }
+        
+        // The first render only showed the end of the file; load the last page and its totals
+        if (this.tail) {
+            this.refreshLog();
+        }
+        
+        // Swap in exact totals once the server has counted them
+        if (this.approximate) {
+            this.pollExactTotals();
+        }
+    }
+    
+    pollExactTotals(delay = 5000) {
+        setTimeout(() => {
+            if (!this.approximate) return; // A live refresh got them first
+            
+            const url = new URL(this.ajaxUrl, window.location.origin);
+            if (this.liveMode) {
+                url.searchParams.set('live', 'true');
+            } else {
+                url.searchParams.set('page', this.currentPage);
+            }
+            url.searchParams.set('t', Date.now());
+            
+            fetch(url)
+                .then(response => response.json())
+                .then(data => {
+                    if (data.error || data.approximate) {
+                        this.pollExactTotals(Math.min(delay * 1.5, 60000));
+                        return;
+                    }
+                    this.approximate = false;
+                    if (this.liveMode) {
+                        this.updateLogContent(data);
+                        this.lastLogContent = JSON.stringify(data.log_lines);
+                    } else {
+                        // Keep the entries on screen; only the totals become exact
+                        this.updateLogInfo(data);
+                        this.updatePaginationInfo(data);
+                    }
+                })
+                .catch(() => this.pollExactTotals(Math.min(delay * 1.5, 60000)));
+        }, delay);
     }
     
     initializeLiveModeUI() {
@@ -159,6 +208,18 @@ class LogViewer {
             toggleFiltersBtn.addEventListener('click', () => this.toggleFiltersPanel());
         }
 
+        // Toggle statistics panel
+        const toggleStatsBtn = document.getElementById('toggle-stats');
+        if (toggleStatsBtn) {
+            toggleStatsBtn.addEventListener('click', () => this.toggleStatsPanel());
+        }
+        ['stats-hours', 'stats-bucket'].forEach(id => {
+            const select = document.getElementById(id);
+            if (select) {
+                select.addEventListener('change', () => this.loadStats());
+            }
+        });
+
         // Filter controls
         this.setupFilterControls();
     }
@@ -194,6 +255,10 @@ class LogViewer {
             multilineOnly.addEventListener('change', () => this.applyFilters());
         }
         
+        // Server-side jump to the first entry at or after "From Time"
+        const seekTimeBtn = document.getElementById('seek-time');
+        if (seekTimeBtn) seekTimeBtn.addEventListener('click', () => this.seekToTime());
+        
         // Quick time filter buttons
         document.querySelectorAll('.quick-time-btn').forEach(btn => {
             btn.addEventListener('click', (e) => this.setQuickTimeFilter(e.target.dataset.hours));
@@ -204,6 +269,10 @@ class LogViewer {
         const clearFiltersBtn = document.getElementById('clear-filters');
         if (applyFiltersBtn) applyFiltersBtn.addEventListener('click', () => this.applyFilters());
         if (clearFiltersBtn) clearFiltersBtn.addEventListener('click', () => this.clearFilters());
+        
+        // Server-side search across the whole file (and its rotations)
+        const searchFilesBtn = document.getElementById('search-files');
+        if (searchFilesBtn) searchFilesBtn.addEventListener('click', () => this.searchFiles(null));
     }
     
     setupVisibilityDetection() {
@@ -236,6 +305,191 @@ class LogViewer {
         }
     }
     
+    // Server-side Search Methods
+    // cursor: returned with the previous results to continue after them, null for a new search
+    searchFiles(cursor) {
+        if (!this.searchUrl) return;
+        
+        const regex = document.getElementById('regex-search')?.value || '';
+        const text = document.getElementById('search-input')?.value || '';
+        if (!regex && !text) return;
+        
+        const params = new URLSearchParams({ q: regex || text });
+        if (regex) params.set('regex', '1');
+        if (cursor) params.set('cursor', cursor);
+        
+        // Search results replace the page, so don't let a refresh overwrite them
+        this.stopAutoRefresh();
+        
+        const searchBtn = document.getElementById('search-files');
+        if (searchBtn) {
+            searchBtn.textContent = 'Searching...';
+            searchBtn.disabled = true;
+        }
+        
+        fetch(`${this.searchUrl}?${params}`)
+            .then(response => response.json())
+            .then(data => {
+                if (data.busy) {
+                    setTimeout(() => this.searchFiles(cursor), data.retry_after * 1000);
+                    return;
+                }
+                if (data.error) {
+                    console.error('Error searching log:', data.error);
+                    return;
+                }
+                this.renderSearchResults(data, cursor);
+            })
+            .catch(error => console.error('Error searching log:', error))
+            .finally(() => {
+                if (searchBtn) {
+                    searchBtn.textContent = 'Search All Files';
+                    searchBtn.disabled = false;
+                }
+            });
+    }
+    
+    renderSearchResults(data, cursor) {
+        const tbody = document.getElementById('log-lines');
+        if (!tbody) return;
+        
+        if (!cursor) {
+            tbody.innerHTML = '';
+        }
+        tbody.querySelector('.load-more-results')?.remove();
+        
+        data.log_lines.forEach(line => tbody.appendChild(this.createLogRow(line)));
+        
+        const info = document.getElementById('search-results-info');
+        if (info) {
+            const shown = tbody.querySelectorAll('tr.log-line').length;
+            let text = `Search: ${shown} matching entries in ${data.files_searched} file(s)`;
+            if (data.incomplete) {
+                text += ' (search time limit reached, results are incomplete)';
+            }
+            info.textContent = text;
+            info.style.display = 'block';
+        }
+        
+        if (data.has_more) {
+            const row = document.createElement('tr');
+            row.className = 'load-more-results';
+            row.innerHTML = '<td colspan="6"><button class="button secondary">More results</button></td>';
+            row.querySelector('button').addEventListener('click', () => this.searchFiles(data.cursor));
+            tbody.appendChild(row);
+        }
+    }
+    
+    // Statistics Methods
+    toggleStatsPanel() {
+        const panel = document.getElementById('stats-panel');
+        const btn = document.getElementById('toggle-stats');
+        
+        if (panel.style.display === 'none') {
+            panel.style.display = 'block';
+            btn.textContent = 'Hide Statistics';
+            this.loadStats();
+        } else {
+            panel.style.display = 'none';
+            btn.textContent = 'Show Statistics';
+        }
+    }
+    
+    loadStats() {
+        if (!this.statsUrl) return;
+        
+        const params = new URLSearchParams({
+            hours: document.getElementById('stats-hours')?.value || '',
+            bucket: document.getElementById('stats-bucket')?.value || '60'
+        });
+        
+        fetch(`${this.statsUrl}?${params}`)
+            .then(response => response.json())
+            .then(data => {
+                if (data.busy) {
+                    setTimeout(() => this.loadStats(), data.retry_after * 1000);
+                    return;
+                }
+                if (data.error) {
+                    console.error('Error loading statistics:', data.error);
+                    return;
+                }
+                this.renderStats(data);
+            })
+            .catch(error => console.error('Error loading statistics:', error));
+    }
+    
+    renderStats(data) {
+        const levels = document.getElementById('stats-levels');
+        if (levels) {
+            levels.innerHTML = Object.entries(data.level_counts)
+                .map(([level, count]) => `<li><span class="level-badge level-${this.escapeHtml(level.toLowerCase())}">${this.escapeHtml(level)}</span> ${count}</li>`)
+                .join('');
+        }
+        
+        const renderTop = (id, items) => {
+            const list = document.getElementById(id);
+            if (list) {
+                list.innerHTML = items
+                    .map(item => `<li><code>${this.escapeHtml(item.name || '(none)')}</code> <span class="stats-count">${item.count}</span></li>`)
+                    .join('');
+            }
+        };
+        renderTop('stats-loggers', data.top_loggers);
+        renderTop('stats-templates', data.top_templates);
+        
+        const range = document.getElementById('stats-range');
+        if (range) {
+            range.textContent = data.buckets.length
+                ? `${data.total_entries} entries from ${data.buckets[0]} to ${data.window_end}, ${data.bucket_seconds}s per bar`
+                : 'No entries in this window';
+            if (data.incomplete) {
+                range.textContent += ' (partial, still indexing…)';
+            }
+        }
+        
+        this.drawStatsChart(data);
+        
+        // Each request indexes a bit more of the file until the statistics are complete
+        clearTimeout(this.statsTimer);
+        if (data.incomplete) {
+            this.statsTimer = setTimeout(() => this.loadStats(), 1000);
+        }
+    }
+    
+    drawStatsChart(data) {
+        const canvas = document.getElementById('stats-chart');
+        if (!canvas || !canvas.getContext) return;
+        
+        canvas.width = canvas.clientWidth || 600;
+        const ctx = canvas.getContext('2d');
+        ctx.clearRect(0, 0, canvas.width, canvas.height);
+        
+        const bucketCount = data.buckets.length;
+        if (!bucketCount) return;
+        
+        const levels = Object.keys(data.histogram);
+        const totals = data.buckets.map((_, i) => levels.reduce((sum, level) => sum + data.histogram[level][i], 0));
+        const maxTotal = Math.max(...totals, 1);
+        const barWidth = canvas.width / bucketCount;
+        
+        const colorsElement = document.getElementById('log-level-colors');
+        const colors = colorsElement ? JSON.parse(colorsElement.textContent) : {};
+        
+        // Stacked bars, one segment per level
+        for (let i = 0; i < bucketCount; i++) {
+            let y = canvas.height;
+            levels.forEach(level => {
+                const height = data.histogram[level][i] / maxTotal * canvas.height;
+                if (height > 0) {
+                    ctx.fillStyle = colors[level] || '#79aec8';
+                    ctx.fillRect(i * barWidth, y - height, Math.max(barWidth - 1, 1), height);
+                    y -= height;
+                }
+            });
+        }
+    }
+    
     setQuickTimeFilter(hours) {
         const now = new Date();
         const fromTime = new Date(now.getTime() - (hours * 60 * 60 * 1000));
@@ -255,6 +509,23 @@ class LogViewer {
         this.applyFilters();
     }
     
+    seekToTime() {
+        const timeFrom = document.getElementById('time-from');
+        if (!timeFrom || !timeFrom.value || !this.seekUrl) return;
+        
+        fetch(`${this.seekUrl}?time=${encodeURIComponent(timeFrom.value)}`)
+            .then(response => response.json())
+            .then(data => {
+                if (data.error) {
+                    console.error('Error seeking log:', data.error);
+                    return;
+                }
+                // Navigate to the page (or byte offset) holding that moment
+                window.location.href = data.url;
+            })
+            .catch(error => console.error('Error seeking log:', error));
+    }
+    
     formatDateTimeLocal(date) {
         // Format date for datetime-local input
         const year = date.getFullYear();
@@ -600,6 +871,11 @@ class LogViewer {
         fetch(url)
             .then(response => response.json())
             .then(data => {
+                if (data.busy && isManual) {
+                    // The server is busy with other scans; auto-refresh retries on its own
+                    setTimeout(() => this.refreshLog(true), data.retry_after * 1000);
+                    return;
+                }
                 if (data.error) {
                     console.error('Error refreshing log:', data.error);
                     return;
@@ -610,6 +886,10 @@ class LogViewer {
                     this.currentPage = data.current_page;
                 }
                 
+                // Exact totals may replace estimated ones without new content
+                const totalsChanged = Boolean(data.approximate) !== this.approximate;
+                this.approximate = Boolean(data.approximate);
+                
                 // Check if content actually changed
                 const newContent = JSON.stringify(data.log_lines);
                 if (newContent !== this.lastLogContent) {
@@ -620,6 +900,9 @@ class LogViewer {
                     if (!isManual) {
                         this.showUpdateIndicator();
                     }
+                } else if (totalsChanged) {
+                    this.updateLogInfo(data);
+                    this.updatePaginationInfo(data);
                 }
             })
             .catch(error => {
@@ -699,7 +982,7 @@ class LogViewer {
         if (this.liveMode) {
             const liveModeIndicator = document.getElementById('live-mode-indicator');
             if (liveModeIndicator) {
-                liveModeIndicator.textContent = `🔴 LIVE - Page ${data.current_page} of ${data.total_pages}`;
+                liveModeIndicator.textContent = `🔴 LIVE - Page ${data.current_page} of ${data.approximate ? '~' : ''}${data.total_pages}`;
             }
         }
         
@@ -724,14 +1007,23 @@ class LogViewer {
         // Create the view full button if needed
         let actionCell = '<td class="action"></td>';
         if (line.is_long || line.is_multiline) {
-            const escapedContent = this.escapeHtml(line.full_content).replace(/'/g, "&#39;");
+            const entryUrl = line.entry_url || `${this.getEntryUrl(line.offset)}?line=${line.number}`;
             actionCell = `<td class="action">
-                <button class="view-full-btn" onclick="showLogModal('${escapedContent}', '${line.level}', '${line.timestamp}', '${line.line_range}')">View Full</button>
+                <button class="view-full-btn"
+                        data-entry-url="${this.escapeHtml(entryUrl)}"
+                        data-level="${this.escapeHtml(line.level)}"
+                        data-timestamp="${this.escapeHtml(line.timestamp)}"
+                        data-line-range="${this.escapeHtml(line.line_range)}"
+                        onclick="showLogModalFromData(this)">View Full</button>
             </td>`;
         }
         
         // Add multiline indicator
         let lineNumberCell = line.line_range || line.number;
+        if (line.source_file) {
+            // Rotation group views span several physical files
+            lineNumberCell = `<span class="source-file">${this.escapeHtml(line.source_file)}:</span>${lineNumberCell}`;
+        }
         if (line.is_multiline) {
             lineNumberCell += ' <span class="multiline-indicator" title="Multi-line entry (' + line.line_count + ' lines)">📄</span>';
         }
@@ -755,17 +1047,32 @@ class LogViewer {
         return row;
     }
     
+    getEntryUrl(offset) {
+        // Swap the placeholder offset for the entry's real byte offset
+        return this.entryUrl.replace(/\/0\/$/, `/${offset}/`);
+    }
+    
     updateLogInfo(data) {
+        // Estimated totals are marked with "~" until the exact ones arrive
+        const approx = data.approximate ? '~' : '';
+        
         // Update total lines if element exists
-        const totalLinesEl = document.querySelector('.log-file-info p:nth-child(4)');
+        const totalLinesEl = document.getElementById('total-lines');
         if (totalLinesEl) {
-            totalLinesEl.innerHTML = `<strong>Total Lines:</strong> ${data.total_lines}`;
+            totalLinesEl.innerHTML = `<strong>Total Lines:</strong> ${approx}${data.total_lines}`;
+        }
+        
+        // Update total entries if element exists
+        const totalEntriesEl = document.getElementById('total-entries');
+        if (totalEntriesEl && data.total_entries !== undefined) {
+            totalEntriesEl.innerHTML = `<strong>Total Entries:</strong> ${approx}${data.total_entries}` +
+                (data.approximate ? ' <span class="file-badge approximate" title="Estimated from the file size; exact counts are being computed">estimated</span>' : '');
         }
         
         // Update showing range if element exists
-        const showingEl = document.querySelector('.log-file-info p:nth-child(5)');
+        const showingEl = document.getElementById('showing-range');
         if (showingEl) {
-            showingEl.innerHTML = `<strong>Showing:</strong> Lines ${data.start_line} - ${data.end_line}`;
+            showingEl.innerHTML = `<strong>Showing:</strong> Lines ${approx}${data.start_line} - ${data.end_line}`;
         }
         
         // Update last refresh time
@@ -777,7 +1084,7 @@ class LogViewer {
         // Update pagination info display (both live and manual modes)
         const paginationInfo = document.querySelector('.pagination-info span');
         if (paginationInfo && data.current_page && data.total_pages) {
-            paginationInfo.textContent = `Page ${data.current_page} of ${data.total_pages}`;
+            paginationInfo.textContent = `Page ${data.current_page} of ${data.approximate ? '~' : ''}${data.total_pages}`;
         }
         
         // Update page input max value and placeholder
@@ -0,0 +1,169 @@
+"""
+Aggregated statistics for a log file.
+
+Level counts, per-bucket level histograms, top loggers and top message
+templates are computed from the counts the entry index keeps per minute and
+per hour (see index.py), never by re-reading the file or walking all of its
+entries. Results are cached per file generation, so repeated dashboard loads
+of an unchanged file are a lookup.
+
+When the read budget runs out while indexing, the statistics of the entries
+indexed so far are returned with ``incomplete`` set and are not cached; the
+next request resumes indexing where this one stopped.
+"""
+
+import heapq
+import math
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import timedelta
+
+from .budget import budget_state
+from .index import EPOCH, LEVEL_BUCKET_SECONDS, NAME_BUCKET_SECONDS, get_log_index
+
+# Histograms are coarsened so they never have more buckets than this
+MAX_BUCKETS = 500
+
+# Number of (file generation, parameters) results kept in the cache
+STATS_CACHE_SIZE = 64
+
+_stats_cache = OrderedDict()
+_stats_cache_lock = threading.Lock()
+
+
+def _format_seconds(seconds):
+    return (EPOCH + timedelta(seconds=seconds)).isoformat()
+
+
+def _top(names, counts, top):
+    """Get the ``top`` most frequent names as ``{'name', 'count'}`` dicts."""
+    best = heapq.nlargest(top, (
+        (count, name_id) for name_id, count in enumerate(counts) if count
+    ))
+    return [{'name': names[name_id], 'count': count} for count, name_id in best]
+
+
+def _bucket_size(bucket_seconds, span):
+    """Round a bucket size up to whole aggregated minutes, coarsened to at most ``MAX_BUCKETS``."""
+    bucket_seconds = max(bucket_seconds, math.ceil(span / MAX_BUCKETS) or 1)
+    return math.ceil(bucket_seconds / LEVEL_BUCKET_SECONDS) * LEVEL_BUCKET_SECONDS
+
+
+def compute_log_stats(index, bucket_seconds=60, hours=None, top=10):
+    """Aggregate the entries of a log index.
+
+    With ``hours``, only entries from the last ``hours`` before the newest
+    entry are counted, so historical rotations get a meaningful window too.
+    The counts come from the index's per-minute and per-hour aggregates;
+    only the entries between the start of the window and the next full hour
+    are walked. Entries without a timestamp are left out of the histogram
+    and the window. Bucket sizes are rounded up to whole minutes.
+    """
+    total = index.total_entries
+    timestamps = index.timestamps
+    timed = index.untimed_entries < total
+    first = timestamps[index.untimed_entries] if timed else None
+    last = timestamps[-1] if timed else None
+
+    window_start = None
+    if hours and timed:
+        window_start = last - hours * 3600
+
+    level_counts = [0] * len(index.level_names)
+    logger_counts = [0] * len(index.logger_names)
+    template_counts = [0] * len(index.template_names)
+    start_entry = 0
+    # Aggregates are used from this timestamp on, the entries before it are walked
+    aggregated_from = -math.inf
+    edge_entries = range(0)
+    if window_start is None:
+        for counts, totals in ((level_counts, index.level_counts), (logger_counts, index.logger_counts),
+                               (template_counts, index.template_counts)):
+            counts[:len(totals)] = totals
+    else:
+        # Entries are in time order, so the window is a suffix of the index
+        start_entry = bisect_left(timestamps, window_start, index.untimed_entries)
+        aggregated_from = math.ceil(window_start / NAME_BUCKET_SECONDS) * NAME_BUCKET_SECONDS
+        edge_entries = range(start_entry, bisect_left(timestamps, aggregated_from, start_entry))
+        first_hour = aggregated_from // NAME_BUCKET_SECONDS
+        for hour, (loggers, templates) in index.name_buckets.items():
+            if hour >= first_hour:
+                for counts, bucket in ((logger_counts, loggers), (template_counts, templates)):
+                    for name_id, count in bucket.items():
+                        counts[name_id] += count
+        for i in edge_entries:
+            level_counts[index.levels[i]] += 1
+            logger_counts[index.loggers[i]] += 1
+            template_counts[index.templates[i]] += 1
+
+    histogram = {}
+    bucket_starts = []
+    if timed and start_entry < total:
+        if window_start is not None:
+            first = window_start
+        bucket_seconds = _bucket_size(bucket_seconds, last - first)
+        base = first - first % bucket_seconds
+        bucket_count = int((last - base) // bucket_seconds) + 1
+        bucket_starts = [_format_seconds(base + i * bucket_seconds) for i in range(bucket_count)]
+        level_histograms = [[0] * bucket_count for _ in index.level_names]
+
+        def add(timestamp, level, count):
+            bucket = min(max(int((timestamp - base) // bucket_seconds), 0), bucket_count - 1)
+            level_histograms[level][bucket] += count
+
+        first_minute = aggregated_from / LEVEL_BUCKET_SECONDS
+        for minute, levels in index.level_buckets.items():
+            if minute >= first_minute:
+                for level, count in levels.items():
+                    add(minute * LEVEL_BUCKET_SECONDS, level, count)
+                    if window_start is not None:
+                        level_counts[level] += count
+        for i in edge_entries:
+            add(timestamps[i], index.levels[i], 1)
+
+        histogram = {
+            name: counts for name, counts in zip(index.level_names, level_histograms) if any(counts)
+        }
+    else:
+        bucket_seconds = _bucket_size(bucket_seconds, 0)
+
+    return {
+        'total_entries': total - start_entry,
+        'level_counts': {
+            name: count for name, count in zip(index.level_names, level_counts) if count
+        },
+        'bucket_seconds': bucket_seconds,
+        'buckets': bucket_starts,
+        'histogram': histogram,
+        'top_loggers': _top(index.logger_names, logger_counts, top),
+        'top_templates': _top(index.template_names, template_counts, top),
+        'window_start': _format_seconds(window_start) if window_start is not None else None,
+        'window_end': _format_seconds(last) if timed else None,
+    }
+
+
+def get_log_stats(file_path, filename=None, bucket_seconds=60, hours=None, top=10):
+    """Get the (cached) statistics of a log file for the given parameters."""
+    index = get_log_index(file_path, filename)
+    if not index.complete:
+        with index.lock:
+            stats = compute_log_stats(index, bucket_seconds, hours, top)
+        return {**stats, **budget_state(), 'incomplete': True}
+
+    # Hold the index lock so the generation matches the data aggregated
+    with index.lock:
+        key = (str(file_path), filename, index.generation, index.exclude, bucket_seconds, hours, top)
+        with _stats_cache_lock:
+            if key in _stats_cache:
+                _stats_cache.move_to_end(key)
+                return _stats_cache[key]
+
+        stats = compute_log_stats(index, bucket_seconds, hours, top)
+        stats.update(incomplete=False, cursor=None)
+
+    with _stats_cache_lock:
+        _stats_cache[key] = stats
+        while len(_stats_cache) > STATS_CACHE_SIZE:
+            _stats_cache.popitem(last=False)
+    return stats
@@ -0,0 +1,195 @@
+"""
+Merged timeline of several log files.
+
+Entries from every selected log (and its rotations) are streamed file by file
+and k-way merged by timestamp, so only one entry per source is held in
+memory at a time.
+
+The merge runs on cheap ``(timestamp, offset)`` keys: files with an entry
+index take both from the index, other files only parse the timestamp of
+each entry's first line. Only the entries of the page returned are
+formatted. With ``since``, rotations last modified before it are skipped
+and each remaining file starts at its first entry that recent, found in
+its index or by binary search (see seek.py), so a timeline opened at a
+point in time doesn't read the history before it.
+"""
+
+import heapq
+import math
+from bisect import bisect_left
+from itertools import dropwhile, islice
+
+from .budget import budget_state, get_current_budget
+from .index import EPOCH, get_cached_log_index
+from .profiling import phase
+from .seek import _parse_entry_timestamp, find_offset_for_timestamp
+from .utils import (format_log_entry_lines, get_chronological_files, get_log_format_for_file,
+                    iter_log_entries, normalize_timestamp, open_log_file)
+
+# Bytes read at a time when counting the lines before a seeked offset
+COUNT_CHUNK_BYTES = 1024 * 1024
+
+
+def get_timeline_sources(log_files, names=None):
+    """Get the timeline sources for the selected log files.
+
+    Each source is a dict with its ``label`` and the ``files`` to read (file
+    dicts), ordered oldest rotation first so the source streams in
+    chronological order.
+    """
+    sources = []
+    for log_file in log_files:
+        if names and log_file['name'] not in names:
+            continue
+
+        sources.append({'label': log_file['name'], 'files': get_chronological_files(log_file)})
+    return sources
+
+
+def _seconds(timestamp):
+    """Turn a timestamp into the seconds since ``EPOCH`` that entry indexes store."""
+    return (normalize_timestamp(timestamp) - EPOCH).total_seconds()
+
+
+def _count_lines(file_path, offset):
+    """Count the lines before a byte offset without decoding or parsing them.
+
+    The lines are charged to the read budget; returns None once it runs out.
+    """
+    budget = get_current_budget()
+    count = position = 0
+    with open_log_file(file_path) as f:
+        while position < offset:
+            chunk = f.read(min(offset - position, COUNT_CHUNK_BYTES))
+            if not chunk:
+                break
+            newlines = chunk.count(b'\n')
+            if budget is not None and not budget.charge(len(chunk), newlines):
+                budget.stop(position)
+                return None
+            count += newlines
+            position += len(chunk)
+    return count
+
+
+def _iter_indexed_keys(index, since):
+    """Yield ``(timestamp, offset, start_line, lines)`` of a file's entries from its index.
+
+    The lines are left to be read for the entries actually shown.
+    """
+    start = 0 if since is None else bisect_left(index.timestamps, _seconds(since), index.untimed_entries)
+    for position in range(start, index.total_entries):
+        yield index.timestamps[position], index.offsets[position], index.line_numbers[position], None
+
+
+def _iter_parsed_keys(file_path, label, since):
+    """Yield ``(timestamp, offset, start_line, lines)`` of a file's entries, parsing only timestamps."""
+    start_offset = 0
+    if since is not None:
+        start_offset = find_offset_for_timestamp(file_path, since, label)
+        if start_offset is None:
+            return
+    start_line = 1
+    if start_offset:
+        lines_before = _count_lines(file_path, start_offset)
+        if lines_before is None:
+            # Out of read budget, which makes the timeline incomplete
+            return
+        start_line = lines_before + 1
+
+    format_config = get_log_format_for_file(label)
+    for offset, entry_line, lines in iter_log_entries(file_path, label, start_offset, start_line):
+        timestamp = _parse_entry_timestamp(lines[0].strip(), format_config)
+        yield None if timestamp is None else _seconds(timestamp), offset, entry_line, lines
+
+
+def iter_source_keys(source, since=None):
+    """Yield the merge keys of one source across its rotations, oldest first.
+
+    Items are ``(timestamp, file_name, file_path, offset, start_line, lines)``
+    with the timestamp in seconds since ``EPOCH``. Entries without a
+    timestamp (orphan lines, custom formats) inherit the previous entry's so
+    they stay in place. With ``since``, files and entries before it are
+    skipped, as far as that can be done without reading them.
+    """
+    label = source['label']
+    last_timestamp = -math.inf
+    files = source['files']
+
+    for position, log_file in enumerate(files):
+        # A file's last entry is from about its modification time; the newest file is always read
+        modified = log_file.get('modified')
+        if since is not None and modified is not None and position + 1 < len(files) and modified < since:
+            continue
+
+        try:
+            # Rotations share the base file's format configuration
+            index = get_cached_log_index(log_file['path'], label)
+            if index is not None and index.complete:
+                keys = _iter_indexed_keys(index, since)
+            else:
+                keys = _iter_parsed_keys(log_file['path'], label, since)
+            for timestamp, offset, start_line, lines in keys:
+                # Entries before the first timestamp of a file have a NaN timestamp in its index
+                if timestamp is not None and not math.isnan(timestamp):
+                    last_timestamp = timestamp
+                yield last_timestamp, log_file['name'], log_file['path'], offset, start_line, lines
+        except (IOError, OSError, EOFError):
+            # Skip unreadable or truncated files instead of failing the timeline
+            continue
+
+
+def _format_item(label, item):
+    """Format one merged entry, reading its lines if the merge key came from an index."""
+    _, file_name, file_path, offset, start_line, lines = item
+    if lines is None:
+        entries = iter_log_entries(file_path, label, offset, start_line)
+        try:
+            lines = next(entries)[2]
+        finally:
+            entries.close()
+    entry = format_log_entry_lines(lines, start_line, label, offset)
+    entry.pop('full_content', None)
+    entry['source'] = label
+    entry['source_file'] = file_name
+    return entry
+
+
+def read_timeline(log_files, names=None, page=1, page_length=25, since=None):
+    """Read one page of the merged timeline of the selected log files.
+
+    ``since`` skips entries before that moment. Only as many entries as needed
+    to fill the page are read, so there is no total count, only ``has_more``.
+    When the read budget runs out first, the page is ``incomplete``.
+    """
+    sources = get_timeline_sources(log_files, names)
+    since = normalize_timestamp(since) if since is not None else None
+    # Tag each item with its source so it can be formatted with the source's format
+    streams = [iter_source_keys(source, since) for source in sources]
+    labelled = [((item, source['label']) for item in stream) for stream, source in zip(streams, sources)]
+
+    try:
+        with phase('read'):
+            merged = heapq.merge(*labelled, key=lambda pair: pair[0][0])
+            if since is not None:
+                since_seconds = _seconds(since)
+                merged = dropwhile(lambda pair: pair[0][0] < since_seconds, merged)
+
+            start = (page - 1) * page_length
+            # Read one extra entry to know whether there is a next page
+            window = list(islice(merged, start, start + page_length + 1))
+    finally:
+        for stream in streams:
+            stream.close()
+
+    with phase('parse'):
+        entries = [_format_item(label, item) for item, label in window[:page_length]]
+
+    state = budget_state()
+    return {
+        'entries': entries,
+        'sources': [source['label'] for source in sources],
+        'page': page,
+        'has_more': len(window) > page_length or state['incomplete'],
+        **state,
+    }
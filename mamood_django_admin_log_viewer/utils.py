@@ -1,42 +1,63 @@
+import io
 import os
 import re
-import glob
+from functools import lru_cache
 from datetime import datetime
+from itertools import islice, repeat
 from django.conf import settings
 from .conf import get_log_files, get_log_files_dir, get_log_formats, get_default_format, get_file_formats
+from .budget import budget_state, get_current_budget
+from .compression import compression_suffixes, is_compressed, open_compressed
+from .entries import LogEntry
+from .exclusion import get_exclusion
+from .patterns import cap_line, guard_pattern
+from .profiling import add_count, phase
+from .sources import discover_log_files, get_source_format, list_log_dir
 
 
-def get_log_files():
-    """Get list of log files from settings, including rotational files."""
-    from .conf import get_log_files as get_configured_files, get_log_files_dir
-    
-    log_files = get_configured_files()
-    log_dir = get_log_files_dir()
+@phase('stat')
+def get_log_files(names=None, stat_rotations=True):
+    """Get list of log files from settings, including rotational files.
+
+    ``names`` limits the result to these configured files (e.g. one page of
+    the file list). With ``stat_rotations=False`` the rotations of a group
+    are listed without their size and modification time (see
+    ``stat_log_files``), and the group's own size and time are those of its
+    newest file, so a group of thousands of rotations costs one ``stat``.
+    
+    The files are those of ``LOG_VIEWER_FILES`` and ``LOG_VIEWER_SOURCES``
+    (see ``sources.discover_log_files``).
+    """
+    log_files = discover_log_files()
+    if names is not None:
+        wanted = set(names)
+        log_files = {name: path for name, path in log_files.items() if name in wanted}
+    
+    groups = _discover_rotations(log_files)
     
     available_files = []
-    processed_base_names = set()
     
-    for log_file in log_files:
+    for log_file, base_path in log_files.items():
         base_name = log_file
-        base_path = os.path.join(log_dir, log_file)
         
-        # Skip if we've already processed this base name
-        if base_name in processed_base_names:
-            continue
-        processed_base_names.add(base_name)
-        
-        # Find all rotational files for this log
-        rotational_files = find_rotational_files(log_dir, log_file)
+        # All rotational files for this log
+        rotational_files = _rotational_file_dicts(log_file, base_path, groups[log_file], stat_rotations)
         
         if rotational_files:
+            if stat_rotations:
+                size = sum(f['size'] for f in rotational_files)
+                modified = max(f['modified'] for f in rotational_files)
+            else:
+                newest = stat_log_files(rotational_files[:1])
+                size, modified = (newest[0]['size'], newest[0]['modified']) if newest else (0, None)
             # Group rotational files under the base name
             available_files.append({
                 'name': base_name,
                 'path': base_path,
                 'type': 'rotational_group',
                 'rotational_files': rotational_files,
-                'size': sum(f['size'] for f in rotational_files),
-                'modified': max(f['modified'] for f in rotational_files),
+                'size': size,
+                'modified': modified,
                 'file_count': len(rotational_files)
             })
         elif os.path.exists(base_path):
@@ -53,58 +74,159 @@ def get_log_files():
     return available_files
 
 
-def find_rotational_files(log_dir, base_filename):
-    """Find all rotational files for a given base filename."""
-    rotational_files = []
-    base_path = os.path.join(log_dir, base_filename)
-    
-    # Check if the main file exists
-    if os.path.exists(base_path):
-        file_info = os.stat(base_path)
-        rotational_files.append({
-            'name': base_filename,
-            'path': base_path,
-            'rotation_index': 0,
-            'size': file_info.st_size,
-            'modified': datetime.fromtimestamp(file_info.st_mtime),
-            'is_current': True
-        })
-    
-    # Look for numbered rotational files (e.g., django.log.1, django.log.2)
-    pattern1 = os.path.join(log_dir, f"{base_filename}.[0-9]*")
-    numbered_files = glob.glob(pattern1)
-    
-    # Look for dated rotational files (e.g., django.log.2025-01-15)
-    pattern2 = os.path.join(log_dir, f"{base_filename}.[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*")
-    dated_files = glob.glob(pattern2)
-    
-    # Look for gzipped rotational files
-    pattern3 = os.path.join(log_dir, f"{base_filename}.[0-9]*.gz")
-    gzipped_files = glob.glob(pattern3)
-    
-    all_rotational = set(numbered_files + dated_files + gzipped_files)
-    
-    for file_path in all_rotational:
-        if os.path.exists(file_path):
-            filename = os.path.basename(file_path)
-            file_info = os.stat(file_path)
-            
-            # Extract rotation index for sorting
-            rotation_index = extract_rotation_index(filename, base_filename)
-            
-            rotational_files.append({
-                'name': filename,
-                'path': file_path,
-                'rotation_index': rotation_index,
-                'size': file_info.st_size,
-                'modified': datetime.fromtimestamp(file_info.st_mtime),
-                'is_current': False
-            })
-    
-    # Sort by rotation index (0 = current, 1 = most recent backup, etc.)
-    rotational_files.sort(key=lambda x: x['rotation_index'])
+def get_log_file_names():
+    """Get the names of the log files that exist, without stat'ing any file.
+
+    A configured file counts as existing when it or one of its rotations is
+    in its directory's listing.
+    """
+    log_files = discover_log_files()
+    groups = _discover_rotations(log_files)
+    return [log_file for log_file in log_files if groups[log_file]]
+
+
+@lru_cache(maxsize=4)
+def _rotation_suffix_pattern(compressed_suffixes):
+    """Compile the regex for the part of a rotation's name after ``<base>.``.
+
+    That is a number or a date, optionally followed by one of the
+    ``compressed_suffixes`` (see compression.py).
+    """
+    return re.compile(
+        r'(?:(?P<number>\d+)|(?P<date>\d{4}-\d{2}-\d{2}).*?)(?:%s)?'
+        % '|'.join(re.escape(suffix) for suffix in compressed_suffixes),
+        re.DOTALL,
+    )
+
+
+@lru_cache(maxsize=32)
+def _rotation_pattern(bases):
+    """Compile one regex matching every base name in ``bases`` and its rotations.
+
+    A rotation is a base name followed by a dot and a digit: numbered
+    (``django.log.1``), dated (``django.log.2025-01-15``) and compressed
+    (``django.log.1.gz``) rotations. Longer base names are tried first, so a
+    file is grouped under the most specific base name it extends.
+    """
+    alternatives = '|'.join(re.escape(base) for base in sorted(bases, key=len, reverse=True))
+    return re.compile(r'(?P<base>%s)(?:\.(?P<suffix>[0-9].*))?' % alternatives, re.DOTALL)
+
+
+def classify_log_dir(dir_entries, bases):
+    """Sort the files of one directory listing into the rotation groups of ``bases``.
+
+    Every file is matched once against a single regex covering all base
+    names. Returns ``{base: [(name, path, rotation_index), ...]}``, where
+    the base file itself has rotation index 0.
+    """
+    groups = {base: [] for base in bases}
+    if not groups:
+        return groups
+    pattern = _rotation_pattern(tuple(sorted(groups)))
+    for name, path in dir_entries.items():
+        match = pattern.fullmatch(name)
+        if match:
+            suffix = match.group('suffix')
+            rotation_index = 0 if suffix is None else _suffix_rotation_index(suffix)
+            groups[match.group('base')].append((name, path, rotation_index))
+    return groups
+
+
+def _discover_rotations(log_files):
+    """Map log files (name -> path) to their classified files, listing each directory once."""
+    by_directory = {}
+    for log_file, base_path in log_files.items():
+        directory, base = os.path.split(base_path)
+        by_directory.setdefault(directory, {})[base] = log_file
+
+    groups = {}
+    for directory, bases in by_directory.items():
+        classified = classify_log_dir(list_log_dir(directory), bases)
+        for base, log_file in bases.items():
+            groups[log_file] = classified[base]
+    return groups
+
+
+def find_rotational_files(log_dir, base_filename, dir_entries=None, with_stat=True):
+    """Find all rotational files for a given base filename.
+
+    ``dir_entries`` is the listing of the file's directory from
+    ``list_log_dir``, when the caller already has it. With
+    ``with_stat=False`` the files' ``size`` and ``modified`` are left out.
+    """
+    return _find_rotational_files(base_filename, os.path.join(log_dir, base_filename), dir_entries, with_stat)
+
+
+def get_rotational_files(name, with_stat=True):
+    """Find the rotational files of a listed log file by name (None when it isn't listed)."""
+    base_path = discover_log_files().get(name)
+    if base_path is None:
+        return None
+    return _find_rotational_files(name, base_path, None, with_stat)
+
+
+def _find_rotational_files(base_filename, base_path, dir_entries, with_stat):
+    directory, base = os.path.split(base_path)
+    if dir_entries is None:
+        dir_entries = list_log_dir(directory)
+    members = classify_log_dir(dir_entries, [base])[base]
+    return _rotational_file_dicts(base_filename, base_path, members, with_stat)
+
+
+def _rotational_file_dicts(base_filename, base_path, members, with_stat):
+    """Build the sorted file dicts of a rotation group from ``classify_log_dir`` members."""
+    # Sort by rotation index (0 = current, 1 = most recent backup, etc.),
+    # then by name so pages of a group's rotations are stable
+    members = sorted(members, key=lambda member: (member[2], member[0]))
     
-    return rotational_files if rotational_files else []
+    rotational_files = []
+    for filename, path, rotation_index in members:
+        is_current = rotation_index == 0
+        rot_file = {
+            'name': base_filename if is_current else filename,
+            'path': base_path if is_current else path,
+            'rotation_index': rotation_index,
+            'is_current': is_current,
+        }
+        if with_stat:
+            try:
+                _add_stat(rot_file, os.stat(path))
+            except OSError:
+                # Removed since the directory was listed
+                continue
+        rotational_files.append(rot_file)
+    
+    return rotational_files
+
+
+def stat_log_files(files):
+    """Add ``size`` and ``modified`` to file dicts listed without them.
+
+    Files that disappeared since they were listed are left out.
+    """
+    stated = []
+    for file_info in files:
+        if 'size' not in file_info:
+            file_info = dict(file_info)
+            try:
+                _add_stat(file_info, os.stat(file_info['path']))
+            except OSError:
+                continue
+        stated.append(file_info)
+    return stated
+
+
+def _add_stat(file_info, file_stat):
+    """Fill in a file dict's size and modification time from a stat result."""
+    file_info['size'] = file_stat.st_size
+    file_info['modified'] = datetime.fromtimestamp(file_stat.st_mtime)
+
+
+def get_chronological_files(log_file):
+    """Get the physical files of a log file entry, oldest rotation first."""
+    if log_file.get('type') == 'rotational_group':
+        return sorted(log_file['rotational_files'], key=lambda f: f['rotation_index'], reverse=True)
+    return [log_file]
 
 
 def extract_rotation_index(filename, base_filename):
@@ -114,98 +236,181 @@ def extract_rotation_index(filename, base_filename):
     
     if not suffix:
         return 0  # Main file
+    if not suffix.startswith('.'):
+        return 9999
+    return _suffix_rotation_index(suffix[1:])
+
+
+def _suffix_rotation_index(suffix):
+    """Rotation index of a rotation suffix (the part of its name after ``<base>.``)."""
+    match = _rotation_suffix_pattern(compression_suffixes()).fullmatch(suffix)
+    if match is None:
+        # Default for unknown formats
+        return 9999
     
-    # Handle numbered rotations (.1, .2, .3, etc.)
-    if re.match(r'^\.\d+$', suffix):
-        return int(suffix[1:])
-    
-    # Handle numbered rotations with .gz (.1.gz, .2.gz, etc.)
-    match = re.match(r'^\.(\d+)\.gz$', suffix)
-    if match:
-        return int(match.group(1))
+    # Handle numbered rotations (.1, .2.gz, .3.bz2, etc.)
+    if match.group('number') is not None:
+        return int(match.group('number'))
     
     # Handle dated rotations (assign higher numbers for older dates)
-    if re.match(r'^\.\d{4}-\d{2}-\d{2}', suffix):
-        # Use timestamp as index (older files get higher numbers)
-        try:
-            date_part = suffix.split('.gz')[0][1:]  # Remove leading dot and .gz if present
-            date_obj = datetime.strptime(date_part[:10], '%Y-%m-%d')
-            # Convert to negative timestamp so older files sort later
-            return int((datetime.now() - date_obj).days) + 1000
-        except (ValueError, IndexError):
-            return 9999
-    
-    # Default for unknown formats
-    return 9999
+    try:
+        date_obj = datetime.strptime(match.group('date'), '%Y-%m-%d')
+    except ValueError:
+        return 9999
+    # Use the age in days as index (older files get higher numbers)
+    return int((datetime.now() - date_obj).days) + 1000
 
 
 def group_multiline_entries(lines, filename=None):
     """Group multi-line log entries together using configurable format detection."""
-    grouped_entries = []
-    current_entry_lines = []
-    
-    # Get format configuration for this file
-    if filename:
-        format_config = get_log_format_for_file(filename)
-    else:
-        # Use default format if filename not provided
-        format_config = {
-            'pattern': r'(?P<level>\w+)\s+(?P<timestamp>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2},\d+)\s+(?P<module>[\w\.]+):\s*(?P<message>.*)',
-            'timestamp_format': '%Y-%m-%d %H:%M:%S,%f',
-            'description': 'Default Django format'
+    return [
+        {
+            'original_line_numbers': list(range(start_line, start_line + len(entry_lines))),
+            'content': ''.join(entry_lines),
+            'is_multiline': len(entry_lines) > 1,
+            'line_count': len(entry_lines)
         }
-    
-    # Compile the pattern to detect the start of a new log entry
+        for _, start_line, entry_lines in group_log_lines(zip(repeat(None), lines), filename)
+    ]
+
+
+def open_log_file(file_path):
+    """Open a log file for binary reading, transparently decompressing compressed files."""
+    if is_compressed(file_path):
+        return open_compressed(file_path)
+    return open(file_path, 'rb')
+
+
+def decode_log_line(raw_line):
+    """Decode a raw log line, normalizing Windows line endings like text mode does."""
+    line = raw_line.decode('utf-8', errors='replace')
+    if line.endswith('\r\n'):
+        line = line[:-2] + '\n'
+    return line
+
+
+def iter_log_lines(file_path, start_offset=0):
+    """Pipeline stage 1: lazily read a log file as ``(offset, line)`` pairs.
+
+    ``offset`` is the byte offset the decoded ``line`` starts at. Under a
+    read budget (see budget.py), reading stops once it is used up.
+    """
+    budget = get_current_budget()
+    offset = start_offset
     try:
-        log_start_pattern = re.compile(format_config['pattern'])
-    except re.error:
-        # Fallback to basic pattern if regex compilation fails
-        log_start_pattern = re.compile(r'^(DEBUG|INFO|WARNING|ERROR|CRITICAL|WARN)\s+\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}')
-    
-    for line_num, line in enumerate(lines, 1):
-        # Check if this line starts a new log entry
-        if log_start_pattern.match(line.strip()):
-            # Save the previous entry if it exists
-            if current_entry_lines:
-                grouped_entries.append({
-                    'original_line_numbers': current_entry_lines,
-                    'content': ''.join([lines[i-1] for i in current_entry_lines]),
-                    'is_multiline': len(current_entry_lines) > 1,
-                    'line_count': len(current_entry_lines)
-                })
-            # Start a new entry
-            current_entry_lines = [line_num]
-        else:
-            # This line is part of the current entry (continuation line)
-            if current_entry_lines:
-                current_entry_lines.append(line_num)
-            else:
-                # Orphan line at the beginning - create a single line entry
-                current_entry_lines = [line_num]
+        with open_log_file(file_path) as f:
+            if start_offset:
+                f.seek(start_offset)
+            for raw_line in f:
+                if budget is not None and not budget.charge(len(raw_line)):
+                    budget.stop(offset)
+                    break
+                yield offset, decode_log_line(raw_line)
+                offset += len(raw_line)
+    finally:
+        add_count('bytes_read', offset - start_offset)
+
+
+def group_log_lines(lines, filename=None, start_line_number=1):
+    """Pipeline stage 2: group ``(offset, line)`` pairs into log entries.
+
+    Yields ``(offset, start_line_number, lines)`` tuples, one per entry, where
+    ``offset`` is the offset of the entry's first line. Entries matching the
+    file's exclusion pattern (see exclusion.py) are dropped; line numbers
+    still count their lines.
+    """
+    log_start_pattern = get_log_start_pattern(filename)
+    exclusion = get_exclusion(filename)
+    entry_lines = []
+    entry_offset = None
+    entry_start_line = line_number = start_line_number
+    
+    for offset, line in lines:
+        # A line matching the format starts a new entry; anything else is a
+        # continuation line (or an orphan line at the beginning). lstrip()
+        # doesn't copy lines without leading whitespace, and a pattern's "$"
+        # already matches before the trailing newline.
+        if entry_lines and log_start_pattern.match(line.lstrip()):
+            if exclusion is None or not exclusion.matches(entry_lines):
+                yield entry_offset, entry_start_line, entry_lines
+            entry_lines = []
+        if not entry_lines:
+            entry_offset = offset
+            entry_start_line = line_number
+        entry_lines.append(line)
+        line_number += 1
     
     # Don't forget the last entry
-    if current_entry_lines:
-        grouped_entries.append({
-            'original_line_numbers': current_entry_lines,
-            'content': ''.join([lines[i-1] for i in current_entry_lines]),
-            'is_multiline': len(current_entry_lines) > 1,
-            'line_count': len(current_entry_lines)
-        })
-    
-    return grouped_entries
+    if entry_lines and (exclusion is None or not exclusion.matches(entry_lines)):
+        yield entry_offset, entry_start_line, entry_lines
+
+
+def filter_log_entries(entries, pattern):
+    """Pipeline stage 3: keep the entries whose text matches a compiled regex."""
+    for entry in entries:
+        if pattern.search(''.join(entry[2])):
+            yield entry
+
+
+def format_log_entries(entries, filename=None):
+    """Pipeline stage 4: format grouped entries for display."""
+    for offset, start_line, lines in entries:
+        add_count('entries_parsed', 1)
+        yield format_log_entry_lines(lines, start_line, filename, offset)
+
+
+def paginate_log_entries(entries, start_entry, count):
+    """Pipeline stage 5: take one page of entries, without consuming the rest.
+
+    Returns the page as a list; the caller can keep iterating ``entries``
+    (e.g. to count them) or simply drop it to stop reading.
+    """
+    return list(islice(entries, start_entry, start_entry + count))
+
+
+def iter_log_entries(file_path, filename=None, start_offset=0, start_line_number=1):
+    """Lazily group a log file into entries without reading it all into memory.
 
+    Yields ``(offset, start_line_number, lines)`` tuples, one per entry, where
+    ``offset`` is the byte offset of the entry's first line.
+    """
+    return group_log_lines(iter_log_lines(file_path, start_offset), filename, start_line_number)
 
-def read_log_file_multiline_aware(file_path, entries_per_page=25, start_entry=0, filename=None):
-    """Read log file with multi-line aware pagination support."""
+
+def read_log_lines_with_offsets(file_path):
+    """Read all lines of a log file along with the byte offset each line starts at."""
+    lines = []
+    offsets = []
+    for offset, line in iter_log_lines(file_path):
+        lines.append(line)
+        offsets.append(offset)
+    return lines, offsets
+
+
+def read_log_file_multiline_aware(file_path, entries_per_page=25, start_entry=0, filename=None,
+                                  include_full_content=False):
+    """Read log file with multi-line aware pagination support.
+
+    The file is streamed through the entry pipeline: every entry is counted
+    but only the requested page is kept and formatted.
+
+    Entries only carry a truncated preview plus their byte ``offset``; the full
+    content is fetched on demand with :func:`read_log_entry` unless
+    ``include_full_content`` is set. When the read budget runs out, the
+    totals only cover the part read so far and ``incomplete`` is set.
+    """
+    end_entry = start_entry + entries_per_page
+    page = []
+    total_entries = 0
+    total_lines = 0
+    
     try:
-        # Handle gzipped files
-        if file_path.endswith('.gz'):
-            import gzip
-            with gzip.open(file_path, 'rt', encoding='utf-8', errors='replace') as f:
-                all_lines = f.readlines()
-        else:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                all_lines = f.readlines()
+        with phase('read'):
+            for offset, start_line, lines in iter_log_entries(file_path, filename):
+                if start_entry <= total_entries < end_entry:
+                    page.append((offset, start_line, lines))
+                total_entries += 1
+                total_lines = start_line + len(lines) - 1
     except (IOError, OSError) as e:
         return {
             'entries': [format_log_line(f'Error reading file: {str(e)}', 1, filename)],
@@ -214,28 +419,21 @@ def read_log_file_multiline_aware(file_path, entries_per_page=25, start_entry=0,
             'start_entry': 0,
             'end_entry': 1,
             'actual_start_line': 1,
-            'actual_end_line': 1
+            'actual_end_line': 1,
+            **budget_state(),
         }
     
-    total_lines = len(all_lines)
-    
-    # First, group all lines into multi-line entries
-    all_entries = process_log_lines_with_multiline(all_lines, 1, filename)
-    total_entries = len(all_entries)
+    with phase('parse'):
+        selected_entries = list(format_log_entries(page, filename))
     
-    # Calculate pagination for entries (not lines)
-    end_entry = min(start_entry + entries_per_page, total_entries)
-    selected_entries = all_entries[start_entry:end_entry]
+    if not include_full_content:
+        for entry in selected_entries:
+            entry.pop('full_content', None)
     
     # Calculate actual line ranges covered by selected entries
     if selected_entries:
-        # Find the actual line numbers covered
-        first_entry_line = int(selected_entries[0]['line_range'].split('-')[0]) if '-' in selected_entries[0]['line_range'] else int(selected_entries[0]['line_range'])
-        last_entry = selected_entries[-1]
-        last_entry_line = int(last_entry['line_range'].split('-')[-1]) if '-' in last_entry['line_range'] else int(last_entry['line_range'])
-        
-        actual_start_line = first_entry_line
-        actual_end_line = last_entry_line
+        actual_start_line = selected_entries[0].number
+        actual_end_line = selected_entries[-1].end_number
     else:
         actual_start_line = 1
         actual_end_line = 1
@@ -245,23 +443,50 @@ def read_log_file_multiline_aware(file_path, entries_per_page=25, start_entry=0,
         'total_entries': total_entries,
         'total_lines': total_lines,
         'start_entry': start_entry,
-        'end_entry': end_entry,
+        'end_entry': min(end_entry, total_entries),
         'actual_start_line': actual_start_line,
-        'actual_end_line': actual_end_line
+        'actual_end_line': actual_end_line,
+        **budget_state(),
     }
 
 
+def read_log_entry(file_path, offset, filename=None, start_line_number=1):
+    """Read the single (possibly multi-line) log entry starting at a byte offset.
+
+    Returns the formatted entry including ``full_content``, or None if no
+    entry starts at the offset (it is past the end of the file, inside an
+    entry, or the entry there is excluded) or the file cannot be read.
+    """
+    try:
+        # Start on the byte before the offset to check that the offset starts a line
+        lines = iter_log_lines(file_path, offset - 1) if offset else iter_log_lines(file_path)
+        try:
+            if offset and next(lines, (None, None))[1] != '\n':
+                return None
+            entry = next(group_log_lines(lines, filename, start_line_number), None)
+        finally:
+            lines.close()
+    except (IOError, OSError, EOFError):
+        return None
+    
+    # Excluded entries are skipped, which would return the next one instead
+    if entry is None or entry[0] != offset:
+        return None
+    
+    _, start_line, entry_lines = entry
+    # Only the first entry of a file may start with a line the format doesn't match
+    if offset and not get_log_start_pattern(filename).match(entry_lines[0].lstrip()):
+        return None
+    add_count('entries_parsed', 1)
+    return format_log_entry_lines(entry_lines, start_line, filename, offset)
+
+
 def read_log_file(file_path, lines_per_page=25, start_line=0):
     """Read log file with pagination support (legacy function for backward compatibility)."""
     try:
-        # Handle gzipped files
-        if file_path.endswith('.gz'):
-            import gzip
-            with gzip.open(file_path, 'rt', encoding='utf-8', errors='replace') as f:
-                all_lines = f.readlines()
-        else:
-            with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                all_lines = f.readlines()
+        # Handle compressed files
+        with io.TextIOWrapper(open_log_file(file_path), encoding='utf-8', errors='replace') as f:
+            all_lines = f.readlines()
     except (IOError, OSError) as e:
         return {
             'lines': [f'Error reading file: {str(e)}'],
@@ -284,16 +509,16 @@ def read_log_file(file_path, lines_per_page=25, start_line=0):
     }
 
 
+def get_log_format_name(filename):
+    """Get the name of the log format used for a specific file."""
+    # Get file-specific format if configured, else the format of the file's
+    # source, else fall back to default format
+    return get_file_formats().get(filename) or get_source_format(filename) or get_default_format()
+
+
 def get_log_format_for_file(filename):
     """Get the log format configuration for a specific file."""
-    
-    # Get file-specific format if configured
-    file_formats = get_file_formats()
-    format_name = file_formats.get(filename)
-    
-    # Fall back to default format
-    if not format_name:
-        format_name = get_default_format()
+    format_name = get_log_format_name(filename)
     
     # Get format configuration
     formats = get_log_formats()
@@ -306,6 +531,48 @@ def get_log_format_for_file(filename):
     return format_config
 
 
+def get_log_start_pattern(filename=None):
+    """Get the compiled regex that detects the first line of a log entry."""
+    if filename:
+        format_config = get_log_format_for_file(filename)
+    else:
+        # Use default format if filename not provided
+        format_config = {
+            'pattern': r'(?P<level>\w+)\s+(?P<timestamp>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2},\d+)\s+(?P<module>[\w\.]+):\s*(?P<message>.*)',
+            'timestamp_format': '%Y-%m-%d %H:%M:%S,%f',
+            'description': 'Default Django format'
+        }
+    
+    try:
+        pattern = re.compile(format_config['pattern'])
+    except re.error:
+        # Fallback to basic pattern if regex compilation fails
+        pattern = re.compile(r'^(DEBUG|INFO|WARNING|ERROR|CRITICAL|WARN)\s+\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}')
+    
+    # Cap and sample matches if configured (see patterns.py)
+    return guard_pattern(pattern, get_log_format_name(filename) if filename else 'default', filename)
+
+
+def find_log_file(log_files, filename):
+    """Find a configured log file (or one of its rotations) by name."""
+    for log_file in log_files:
+        if log_file['name'] == filename:
+            return log_file
+        # If it's a rotational group, check individual files
+        if log_file.get('type') == 'rotational_group':
+            for rot_file in log_file['rotational_files']:
+                if rot_file['name'] == filename:
+                    return {
+                        'name': filename,
+                        'path': rot_file['path'],
+                        'size': rot_file['size'],
+                        'modified': rot_file['modified'],
+                        'is_rotational': True,
+                        'parent_group': log_file['name']
+                    }
+    return None
+
+
 def parse_log_line_with_format(line, format_config):
     """Parse a log line using the provided format configuration."""
     import datetime as dt
@@ -317,9 +584,15 @@ def parse_log_line_with_format(line, format_config):
         return None
         
     try:
-        match = re.match(pattern, line.strip())
+        line = line.strip()
+        capped_line = cap_line(line)
+        match = re.match(pattern, capped_line)
         if match:
             groups = match.groupdict()
+            # A message cut off by the match length cap gets the rest of the line back
+            if len(capped_line) < len(line) and groups.get('message') is not None \
+                    and match.end('message') == len(capped_line):
+                groups['message'] += line[len(capped_line):]
             
             # Parse timestamp if format is provided
             parsed_timestamp = None
@@ -329,6 +602,7 @@ def parse_log_line_with_format(line, format_config):
                     # Handle milliseconds in Django format
                     if ',%f' in timestamp_format and ',' in timestamp_str:
                         timestamp_str = timestamp_str.replace(',', '.')
+                        timestamp_format = timestamp_format.replace(',%f', '.%f')
                     elif '.%f' in timestamp_format and ',' in timestamp_str:
                         timestamp_str = timestamp_str.replace(',', '.')
                     
@@ -360,6 +634,29 @@ def parse_log_line_with_format(line, format_config):
     return None
 
 
+def normalize_timestamp(timestamp):
+    """Make timestamps from different formats comparable (naive local time)."""
+    if timestamp is not None and timestamp.tzinfo is not None:
+        return timestamp.astimezone().replace(tzinfo=None)
+    return timestamp
+
+
+_TEMPLATE_PATTERN = re.compile(
+    r"'[^']*'|\"[^\"]*\"|\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b"
+    r"|\b0x[0-9a-fA-F]+\b|\d+(?:\.\d+)*",
+    re.IGNORECASE
+)
+
+
+def get_message_template(message, max_length=120):
+    """Reduce a log message to a template by masking numbers, ids and quoted values.
+
+    Messages that only differ in such values share a template, which makes
+    them countable as "the same message".
+    """
+    return _TEMPLATE_PATTERN.sub('*', message.strip())[:max_length]
+
+
 def format_log_line(line, line_number, filename=None):
     line = line.strip()
     
@@ -401,164 +698,55 @@ def format_log_line(line, line_number, filename=None):
             # Celery format
             logger_name = f"celery/{parsed['worker']}"
         
-        # Truncate long messages for preview
-        max_length = 200
-        is_long = len(message) > max_length
-        content = message[:max_length] + ('...' if is_long else '')
-        
-        return {
-            'number': line_number,
-            'level': level,
-            'timestamp': timestamp,
-            'parsed_timestamp': parsed.get('parsed_timestamp'),
-            'logger': logger_name,
-            'module': raw_module,  # Use original parsed module for display
-            'content': content,
-            'full_content': message,
-            'is_long': is_long,
-            'is_multiline': False,
-            'line_count': 1,
-            'line_range': str(line_number),
-            'raw_data': parsed.get('all_groups', {})
-        }
+        return LogEntry(line_number, level, timestamp, parsed.get('parsed_timestamp'), logger_name,
+                        raw_module,  # Use original parsed module for display
+                        message, raw_line=line, format_config=format_config)
     else:
         # If it doesn't match the expected pattern, treat as raw text
-        max_length = 200
-        is_long = len(line) > max_length
-        content = line[:max_length] + ('...' if is_long else '')
-        
-        return {
-            'number': line_number,
-            'level': 'INFO',  # Default level
-            'timestamp': '',
-            'parsed_timestamp': None,
-            'logger': '',
-            'module': '',  # Add module field for template compatibility
-            'content': content,
-            'full_content': line,
-            'is_long': is_long,
-            'is_multiline': False,
-            'line_count': 1,
-            'line_range': str(line_number),
-            'raw_data': {}
-        }
+        return LogEntry(line_number, 'INFO', '', None, '', '', line)
 
 
-def process_log_lines_with_multiline(lines, start_line_number, filename=None):
-    """Process log lines to detect and group multi-line entries."""
+def process_log_lines_with_multiline(lines, start_line_number, filename=None, line_offsets=None):
+    """Process log lines to detect and group multi-line entries.
+
+    If ``line_offsets`` is given (the byte offset of each line), every entry
+    records the offset of its first line so it can be re-read later.
+    """
     if not lines:
         return []
     
-    # Get format configuration for this file
-    if filename:
-        format_config = get_log_format_for_file(filename)
-    else:
-        # Use default format if filename not provided
-        format_config = {
-            'pattern': r'(?P<level>\w+)\s+(?P<timestamp>\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2},\d+)\s+(?P<module>[\w\.]+):\s*(?P<message>.*)',
-            'timestamp_format': '%Y-%m-%d %H:%M:%S,%f',
-            'description': 'Default Django format'
-        }
-    
-    # Compile the pattern to detect the start of a new log entry
-    try:
-        log_start_pattern = re.compile(format_config['pattern'])
-    except re.error:
-        # Fallback to basic pattern if regex compilation fails
-        log_start_pattern = re.compile(r'^(DEBUG|INFO|WARNING|ERROR|CRITICAL|WARN)\s+\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}')
-    
-    grouped_entries = []
-    current_entry_lines = []
-    current_start_line = start_line_number
+    # Group the lines into entries first, then format them
+    with phase('group'):
+        groups = list(group_log_lines(zip(line_offsets or repeat(None), lines), filename, start_line_number))
     
-    for i, line in enumerate(lines):
-        line_number = start_line_number + i
-        
-        # Check if this line starts a new log entry
-        if log_start_pattern.match(line.strip()):
-            # Save the previous entry if it exists
-            if current_entry_lines:
-                # Format the grouped entry
-                full_content = ''.join(current_entry_lines)
-                formatted_entry = format_multiline_log_entry(
-                    full_content, 
-                    current_start_line, 
-                    len(current_entry_lines),
-                    filename
-                )
-                grouped_entries.append(formatted_entry)
-            
-            # Start a new entry
-            current_entry_lines = [line]
-            current_start_line = line_number
-        else:
-            # This line is part of the current entry (continuation line)
-            if current_entry_lines:
-                current_entry_lines.append(line)
-            else:
-                # Orphan line at the beginning - treat as single line entry
-                current_entry_lines = [line]
-                current_start_line = line_number
-    
-    # Don't forget the last entry
-    if current_entry_lines:
-        full_content = ''.join(current_entry_lines)
-        formatted_entry = format_multiline_log_entry(
-            full_content, 
-            current_start_line, 
-            len(current_entry_lines),
-            filename
-        )
-        grouped_entries.append(formatted_entry)
-    
-    return grouped_entries
+    with phase('parse'):
+        return list(format_log_entries(groups, filename))
+
 
+def format_log_entry_lines(lines, start_line_number, filename=None, offset=None):
+    """Format the grouped lines of one log entry starting at byte ``offset`` in its file.
 
-def format_multiline_log_entry(content, start_line_number, line_count, filename=None):
-    """Format a multi-line log entry."""
-    # Parse the first line to get the main log info
-    first_line = content.split('\n')[0] if '\n' in content else content
-    parsed = format_log_line(first_line, start_line_number, filename)
+    Only the first line is parsed; the continuation lines are appended to its
+    message as they are.
+    """
+    entry = format_log_line(lines[0], start_line_number, filename)
     
     # For multiline entries, we want to show the parsed message from the first line
     # plus the continuation lines, but NOT the timestamp/level/module from first line
-    if line_count > 1 and '\n' in content:
-        lines = content.split('\n')
-        # Keep the parsed message from first line + all continuation lines
-        continuation_lines = lines[1:]  # Skip first line since we already parsed it
-        
-        # Combine parsed message from first line with continuation lines
-        if parsed.get('content'):
-            # Use the already parsed message from first line + continuation
-            full_message_content = parsed['content'] + '\n' + '\n'.join(continuation_lines)
-        else:
-            # Fallback to full content if parsing failed
-            full_message_content = content.strip()
-    else:
-        # Single line - use the parsed content as-is
-        full_message_content = parsed.get('content', content.strip())
-    
-    # Clean the content to avoid JavaScript issues
-    # Remove any problematic characters and normalize whitespace
-    full_message_content = full_message_content.strip()
-    
-    # Update the content and multi-line info
-    parsed['full_content'] = full_message_content
-    parsed['content'] = full_message_content
-    parsed['is_multiline'] = line_count > 1
-    parsed['line_count'] = line_count
-    
-    # Create line range display
-    if line_count > 1:
-        parsed['line_range'] = f"{start_line_number}-{start_line_number + line_count - 1}"
-    else:
-        parsed['line_range'] = str(start_line_number)
+    if len(lines) > 1:
+        # Lines normally keep their newlines; join them with one if they don't
+        separator = '' if lines[0].endswith('\n') else '\n'
+        entry.text = (entry.text + '\n' + separator.join(lines[1:])).strip()
     
-    # Truncate content for display if it's too long
-    max_length = 200
-    is_long = len(parsed['content']) > max_length
-    if is_long:
-        parsed['content'] = parsed['content'][:max_length] + '...'
-    parsed['is_long'] = is_long
+    entry.line_count = len(lines)
+    entry.offset = offset
     
-    return parsed
+    return entry
+
+
+def format_multiline_log_entry(content, start_line_number, line_count, filename=None, offset=None):
+    """Format a multi-line log entry given as one string, see :func:`format_log_entry_lines`."""
+    entry = format_log_entry_lines(content.split('\n') if line_count > 1 else [content],
+                                   start_line_number, filename, offset)
+    entry.line_count = line_count
+    return entry
@@ -1,24 +1,31 @@
 from django.shortcuts import render
 from django.http import JsonResponse, Http404
 from django.contrib.admin.views.decorators import staff_member_required
-from .utils import get_log_files, read_log_file_multiline_aware
-from .conf import get_file_list_title, get_page_length, get_refresh_interval
+from django.core.paginator import Paginator
+from .utils import get_log_files, get_log_file_names, read_log_file_multiline_aware
+from .budget import limit_reads
+from .entries import LogEntryJSONEncoder
+from .conf import get_file_list_title, get_file_list_max_items_per_page, get_page_length, get_refresh_interval
 
 
 @staff_member_required
 def log_list_view(request):
-    """View to list all available log files."""
-    log_files = get_log_files()
+    """View to list the available log files, one page at a time."""
+    paginator = Paginator(get_log_file_names(), get_file_list_max_items_per_page())
+    page_obj = paginator.get_page(request.GET.get('page'))
+    log_files = get_log_files(page_obj.object_list, stat_rotations=False)
     
     context = {
         'title': get_file_list_title(),
         'log_files': log_files,
+        'page_obj': page_obj,
     }
     
     return render(request, 'mamood_django_admin_log_viewer/log_list.html', context)
 
 
 @staff_member_required
+@limit_reads
 def log_detail_view(request, filename):
     """View to display log file content."""
     log_files = get_log_files()
@@ -65,6 +72,7 @@ def log_detail_view(request, filename):
 
 
 @staff_member_required
+@limit_reads
 def log_ajax_view(request, filename):
     """AJAX endpoint for refreshing log content."""
     log_files = get_log_files()
@@ -95,4 +103,5 @@ def log_ajax_view(request, filename):
         'total_lines': log_data['total_lines'],
         'start_line': log_data['actual_start_line'],
         'end_line': log_data['actual_end_line'],
-    })
+        'incomplete': log_data['incomplete'],
+    }, encoder=LogEntryJSONEncoder)
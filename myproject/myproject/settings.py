@@ -134,7 +134,7 @@ LOG_DIR.mkdir(exist_ok=True)
 LOG_VIEWER_FILES = ['django.log', 'application.log','celery_beat.log']
 LOG_VIEWER_FILES_DIR = LOG_DIR
 LOG_VIEWER_PAGE_LENGTH = 25       # total log lines per-page
-LOG_VIEWER_MAX_READ_LINES = 1000  # total log lines will be read
+LOG_VIEWER_MAX_READ_LINES = 1000000  # total log lines will be read
 LOG_VIEWER_FILE_LIST_MAX_ITEMS_PER_PAGE = 25 # Max log files loaded per page
 LOG_VIEWER_EXCLUDE_TEXT_PATTERN = None  # String regex expression to exclude log lines
 LOG_VIEWER_FILE_LIST_TITLE = "Django Log Viewer"
@@ -0,0 +1,132 @@
+"""
+Django tests for the per-request read budget.
+"""
+
+import gzip
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from mamood_django_admin_log_viewer import index as index_module
+from mamood_django_admin_log_viewer.budget import ReadBudget, read_budget, reads_exhausted
+from mamood_django_admin_log_viewer.index import LogIndex, clear_log_indexes, get_log_index
+from mamood_django_admin_log_viewer.pagination import read_log_page
+from mamood_django_admin_log_viewer.utils import iter_log_lines
+
+
+class ReadBudgetTestCase(TestCase):
+    """Test cases for limiting the lines, bytes and time a request spends reading."""
+
+    def setUp(self):
+        clear_log_indexes()
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.temp_dir, 'app.log')
+        with open(self.log_path, 'w') as f:
+            for i in range(300):
+                f.write(f"INFO 2025-01-01 12:{i // 60:02d}:{i % 60:02d},000 myapp: entry {i}\n")
+                f.write("    continuation line\n")
+
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        # Let a background build finish before its file is removed
+        while index_module._building:
+            time.sleep(0.05)
+        clear_log_indexes()
+        shutil.rmtree(self.temp_dir)
+
+    def test_line_and_byte_limits(self):
+        with read_budget(ReadBudget(max_lines=5)) as budget:
+            lines = list(iter_log_lines(self.log_path))
+        self.assertEqual(len(lines), 5)
+        self.assertTrue(budget.exhausted)
+        self.assertEqual(budget.cursor, lines[-1][0] + len(lines[-1][1]))
+
+        with read_budget(ReadBudget(max_bytes=100)) as budget:
+            lines = list(iter_log_lines(self.log_path))
+        self.assertLessEqual(sum(len(line) for _, line in lines), 100)
+        self.assertTrue(budget.exhausted)
+
+        # Without a budget, reads are unlimited
+        self.assertEqual(len(list(iter_log_lines(self.log_path))), 600)
+        self.assertFalse(reads_exhausted())
+
+    def test_time_limit(self):
+        with mock.patch('mamood_django_admin_log_viewer.budget.CLOCK_CHECK_INTERVAL', 1):
+            with read_budget(ReadBudget(max_seconds=0)) as budget:
+                lines = list(iter_log_lines(self.log_path))
+        self.assertEqual(lines, [])
+        self.assertTrue(budget.exhausted)
+
+    def test_page_falls_back_to_estimate(self):
+        with read_budget(ReadBudget(max_lines=100)):
+            data = read_log_page(self.log_path, -1, 25, 'app.log')
+        self.assertTrue(data['incomplete'])
+        self.assertTrue(data['approximate'])
+        # The last page is still read from the end of the file
+        self.assertEqual(data['entries'][-1]['content'].split('\n')[0], 'entry 299')
+
+        data = read_log_page(self.log_path, -1, 25, 'app.log')
+        self.assertFalse(data['incomplete'])
+
+    def test_compressed_page_is_not_estimated(self):
+        gz_path = os.path.join(self.temp_dir, 'app.log.1.gz')
+        with open(self.log_path, 'rb') as src, gzip.open(gz_path, 'wb') as dst:
+            dst.write(src.read())
+
+        with read_budget(ReadBudget(max_lines=100)) as budget, \
+                mock.patch('mamood_django_admin_log_viewer.pagination._read_estimated_page',
+                           side_effect=AssertionError('estimated')), \
+                mock.patch('mamood_django_admin_log_viewer.pagination.build_log_index_in_background') as build:
+            data = read_log_page(gz_path, -1, 25, 'app.log')
+        # The pages streamed before the budget ran out, and a build for the exact ones
+        self.assertTrue(data['incomplete'])
+        self.assertEqual(data['cursor'], budget.cursor)
+        self.assertFalse(data['approximate'])
+        self.assertLessEqual(data['total_lines'], 100)
+        build.assert_called_once_with(gz_path, 'app.log')
+
+    def test_index_resumes_across_budgets(self):
+        expected = LogIndex(self.log_path, 'app.log').update()
+
+        for _ in range(20):
+            with read_budget(ReadBudget(max_lines=101)):
+                index = get_log_index(self.log_path, 'app.log')
+            if index.complete:
+                break
+            self.assertLess(index.total_entries, 300)
+        self.assertTrue(index.complete)
+        self.assertEqual(list(index.offsets), list(expected.offsets))
+        self.assertEqual(list(index.line_numbers), list(expected.line_numbers))
+        self.assertEqual(index.total_lines, 600)
+
+    def test_stats_view_continues_indexing(self):
+        url = reverse('admin:log_viewer_stats', args=['app.log'])
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir,
+                           LOG_VIEWER_MAX_READ_LINES=250):
+            first = self.client.get(url).json()
+            self.assertTrue(first['incomplete'])
+            self.assertIsNotNone(first['cursor'])
+            self.assertLess(first['total_entries'], 300)
+
+            for _ in range(5):
+                stats = self.client.get(url).json()
+                if not stats['incomplete']:
+                    break
+            self.assertFalse(stats['incomplete'])
+            self.assertEqual(stats['total_entries'], 300)
+
+    def test_detail_view_is_limited(self):
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir,
+                           LOG_VIEWER_MAX_READ_LINES=100):
+            response = self.client.get(reverse('admin:log_viewer_ajax', args=['app.log']))
+        data = response.json()
+        self.assertTrue(data['incomplete'])
+        self.assertTrue(data['approximate'])
+        self.assertEqual(len(data['log_lines']), 25)
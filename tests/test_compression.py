@@ -0,0 +1,116 @@
+"""
+Django tests for reading rotations compressed as .gz, .bz2, .xz and .zst.
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from mamood_django_admin_log_viewer import compression
+from mamood_django_admin_log_viewer.compression import is_compressed, register_decoder
+from mamood_django_admin_log_viewer.index import clear_log_indexes, get_log_index
+from mamood_django_admin_log_viewer.pagination import read_log_page
+from mamood_django_admin_log_viewer.rotation import read_group_log
+from mamood_django_admin_log_viewer.utils import get_log_files
+
+
+class CompressedRotationTestCase(TestCase):
+    """Test cases for compressed rotations in listings, pages, indexes and downloads."""
+
+    def setUp(self):
+        clear_log_indexes()
+        self.temp_dir = tempfile.mkdtemp()
+        # Oldest rotation first, each file holds three entries
+        for index, opener in ((3, lzma.open), (2, bz2.open), (1, gzip.open)):
+            suffix = {lzma.open: 'xz', bz2.open: 'bz2', gzip.open: 'gz'}[opener]
+            with opener(os.path.join(self.temp_dir, f'app.log.{index}.{suffix}'), 'wt') as f:
+                f.writelines(self.entries((3 - index) * 3))
+        with open(os.path.join(self.temp_dir, 'app.log'), 'w') as f:
+            f.writelines(self.entries(9))
+
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.user)
+        settings = self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def tearDown(self):
+        clear_log_indexes()
+        shutil.rmtree(self.temp_dir)
+
+    def entries(self, first):
+        lines = []
+        for number in range(first, first + 3):
+            lines.append(f"INFO 2025-08-11 10:00:{number:02d},000 app: entry {number}\n")
+            lines.append("    continuation line\n")
+        return lines
+
+    def messages(self, entries):
+        return [entry['content'].split('\n')[0] for entry in entries]
+
+    def test_rotations_are_listed_in_order(self):
+        group = get_log_files()[0]
+        self.assertEqual([f['name'] for f in group['rotational_files']],
+                         ['app.log', 'app.log.1.gz', 'app.log.2.bz2', 'app.log.3.xz'])
+        self.assertEqual(self.messages(read_group_log(group, 12, 1)['entries']),
+                         [f'entry {number}' for number in range(12)])
+
+    def test_pages_and_indexes(self):
+        for name in ('app.log.2.bz2', 'app.log.3.xz'):
+            path = os.path.join(self.temp_dir, name)
+            self.assertTrue(is_compressed(path))
+            data = read_log_page(path, 2, 2, 'app.log')
+            self.assertEqual(data['total_entries'], 3)
+
+            # Entries are read back from the index by seeking in the decompressed stream
+            index = get_log_index(path, 'app.log')
+            self.assertEqual(index.total_entries, 3)
+            self.assertEqual(self.messages(index.read_entries(2, 1)), self.messages(data['entries']))
+
+    def test_download_is_decompressed(self):
+        response = self.client.get(reverse('admin:log_viewer_download', args=['app.log.3.xz']))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('filename="app.log.3"', response['Content-Disposition'])
+        self.assertEqual(b''.join(response.streaming_content).decode(), ''.join(self.entries(0)))
+
+        response = self.client.get(reverse('admin:log_viewer_download', args=['app.log']))
+        self.assertEqual(b''.join(response.streaming_content).decode(), ''.join(self.entries(9)))
+        self.assertEqual(int(response['Content-Length']), os.path.getsize(os.path.join(self.temp_dir, 'app.log')))
+
+    def test_registered_decoder(self):
+        path = os.path.join(self.temp_dir, 'app.log.4.lz')
+        with gzip.open(path, 'wt') as f:
+            f.writelines(self.entries(12))
+
+        with mock.patch.dict(compression._DECODERS):
+            register_decoder('.lz', lambda file_path: gzip.open(file_path, 'rb'))
+            group = get_log_files()[0]
+            self.assertEqual(group['rotational_files'][-1]['name'], 'app.log.4.lz')
+            self.assertEqual(group['rotational_files'][-1]['rotation_index'], 4)
+            self.assertEqual(read_log_page(path, 1, 5, 'app.log')['total_entries'], 3)
+
+    @unittest.skipIf(compression.zstandard is None, 'zstandard is not installed')
+    def test_zstd(self):
+        path = os.path.join(self.temp_dir, 'app.log.4.zst')
+        with open(path, 'wb') as f:
+            f.write(compression.zstandard.ZstdCompressor().compress(''.join(self.entries(12)).encode()))
+        self.assertEqual(self.messages(read_log_page(path, 1, 5, 'app.log')['entries']),
+                         ['entry 12', 'entry 13', 'entry 14'])
+        index = get_log_index(path, 'app.log')
+        self.assertEqual(self.messages(index.read_entries(2, 1)), ['entry 14'])
+
+    def test_zstd_without_zstandard(self):
+        path = os.path.join(self.temp_dir, 'app.log.4.zst')
+        open(path, 'wb').close()
+        with mock.patch.object(compression, 'zstandard', None):
+            with self.assertRaises(OSError):
+                compression.open_compressed(path)
@@ -0,0 +1,139 @@
+"""
+Django tests for coalescing identical scans and limiting concurrent ones.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from mamood_django_admin_log_viewer import concurrency
+from mamood_django_admin_log_viewer.concurrency import ScansBusy, run_scan
+
+
+class RunScanTestCase(TestCase):
+    """Test cases for sharing scans in flight and the concurrency limits."""
+
+    def setUp(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = []
+        # Followers count themselves right before they wait for the scan in flight
+        self.followed = threading.Event()
+        patcher = mock.patch.object(concurrency, 'add_count', side_effect=lambda *args: self.followed.set())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def scan(self, value):
+        self.calls.append(value)
+        self.started.set()
+        self.release.wait(5)
+        if isinstance(value, Exception):
+            raise value
+        return {'value': value}
+
+    def start_leader(self, key, value):
+        results = []
+
+        def lead():
+            try:
+                results.append(run_scan(key, self.scan, value))
+            except Exception as error:
+                results.append(error)
+
+        thread = threading.Thread(target=lead)
+        thread.start()
+        self.assertTrue(self.started.wait(5))
+        return thread, results
+
+    def test_identical_scans_are_shared(self):
+        thread, results = self.start_leader('page-1', 1)
+
+        follower_results = []
+        follower = threading.Thread(target=lambda: follower_results.append(run_scan('page-1', self.scan, 1)))
+        follower.start()
+        self.assertTrue(self.followed.wait(5))
+        self.release.set()
+        thread.join(5)
+        follower.join(5)
+
+        self.assertEqual(self.calls, [1])
+        self.assertIs(follower_results[0], results[0])
+
+        # Once done, the same key runs again
+        self.assertEqual(run_scan('page-1', self.scan, 2), {'value': 2})
+        self.assertEqual(self.calls, [1, 2])
+
+    def test_errors_are_shared(self):
+        error = ValueError('broken')
+        thread, results = self.start_leader('page-1', error)
+
+        follower_results = []
+
+        def follow():
+            try:
+                run_scan('page-1', self.scan, error)
+            except ValueError as raised:
+                follower_results.append(raised)
+
+        follower = threading.Thread(target=follow)
+        follower.start()
+        self.assertTrue(self.followed.wait(5))
+        self.release.set()
+        thread.join(5)
+        follower.join(5)
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(results, [error])
+        self.assertEqual(follower_results, [error])
+
+    def test_limit(self):
+        with self.settings(LOG_VIEWER_MAX_CONCURRENT_SCANS=1):
+            thread, results = self.start_leader('page-1', 1)
+            try:
+                with self.assertRaises(ScansBusy):
+                    run_scan('page-2', self.scan, 2)
+            finally:
+                self.release.set()
+                thread.join(5)
+
+            # The slot is free again
+            self.assertEqual(run_scan('page-2', self.scan, 2), {'value': 2})
+
+
+class BusyResponseTestCase(TestCase):
+    """Test cases for the "busy, retry" responses of the admin views."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.temp_dir, 'app.log'), 'w') as f:
+            f.write("INFO 2025-08-11 10:00:00,000 app: started\n")
+
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.user)
+        settings = self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir,
+                                 LOG_VIEWER_MAX_CONCURRENT_SCANS_PER_USER=0, LOG_VIEWER_SCAN_RETRY_AFTER=3)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_busy_responses(self):
+        response = self.client.get(reverse('admin:log_viewer_ajax', args=['app.log']))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '3')
+        self.assertTrue(response.json()['busy'])
+
+        response = self.client.get(reverse('admin:log_viewer_detail', args=['app.log']), {'page': 1},
+                                   HTTP_ACCEPT='text/html,application/xhtml+xml')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Content-Type'], 'text/plain')
+
+        with self.settings(LOG_VIEWER_MAX_CONCURRENT_SCANS_PER_USER=None):
+            response = self.client.get(reverse('admin:log_viewer_ajax', args=['app.log']))
+        self.assertEqual(response.status_code, 200)
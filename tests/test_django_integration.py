@@ -7,6 +7,7 @@ import os
 import tempfile
 from django.test import TestCase, RequestFactory, override_settings
 from django.contrib.auth.models import User
+from django.urls import reverse
 from pathlib import Path
 
 from mamood_django_admin_log_viewer.utils import (
@@ -15,7 +16,9 @@ from mamood_django_admin_log_viewer.utils import (
     format_log_line, 
     process_log_lines_with_multiline,
     parse_log_line_with_format,
-    get_log_format_for_file
+    get_log_format_for_file,
+    read_log_file_multiline_aware,
+    read_log_entry
 )
 
 
@@ -216,3 +219,74 @@ class LogRotationTestCase(TestCase):
             self.assertEqual(log_group['type'], 'rotational_group')
             self.assertEqual(log_group['name'], 'app.log')
             self.assertGreaterEqual(len(log_group['rotational_files']), 3)  # main + 2 rotated
+
+
+class LogEntryEndpointTestCase(TestCase):
+    """Test cases for lazily loading the full content of a log entry."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.test_log_file = os.path.join(self.temp_dir, 'django.log')
+        self.first_line = "INFO 2025-08-11 11:32:26,080 django.server: First entry\n"
+        self.error_lines = (
+            "ERROR 2025-08-11 11:32:27,081 django.request: Internal Server Error\n"
+            "Traceback (most recent call last):\n"
+            '  File "/path/to/file.py", line 123, in function_name\n'
+            "Exception: Something went wrong\n"
+        )
+        with open(self.test_log_file, 'w') as f:
+            f.write(self.first_line)
+            f.write(self.error_lines)
+            f.write("INFO 2025-08-11 11:32:28,082 django.server: Last entry\n")
+        self.error_offset = len(self.first_line)
+        
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.user)
+    
+    def tearDown(self):
+        os.unlink(self.test_log_file)
+        os.rmdir(self.temp_dir)
+    
+    def test_page_entries_carry_offset_not_full_content(self):
+        """Paginated entries ship a preview and byte offset instead of the full content."""
+        log_data = read_log_file_multiline_aware(self.test_log_file, 25, 0, 'django.log')
+        entries = log_data['entries']
+        
+        self.assertEqual(len(entries), 3)
+        self.assertEqual([entry['offset'] for entry in entries], [0, self.error_offset, self.error_offset + len(self.error_lines)])
+        for entry in entries:
+            self.assertNotIn('full_content', entry)
+    
+    def test_read_log_entry_at_offset(self):
+        """Reading at an entry offset returns that whole entry and nothing more."""
+        entry = read_log_entry(self.test_log_file, self.error_offset, 'django.log', 2)
+        
+        self.assertEqual(entry['line_range'], '2-5')
+        self.assertTrue(entry['full_content'].startswith('Internal Server Error\nTraceback'))
+        self.assertTrue(entry['full_content'].endswith('Exception: Something went wrong'))
+        self.assertNotIn('Last entry', entry['full_content'])
+        self.assertIsNone(read_log_entry(self.test_log_file, 10 ** 6, 'django.log'))
+    
+    def test_read_log_entry_requires_entry_start(self):
+        """Offsets inside an entry or of an excluded entry are not found, rather than the next entry."""
+        traceback_offset = self.error_offset + self.error_lines.index('Traceback')
+        self.assertIsNone(read_log_entry(self.test_log_file, traceback_offset, 'django.log'))
+        self.assertIsNone(read_log_entry(self.test_log_file, self.error_offset + 3, 'django.log'))
+        
+        with self.settings(LOG_VIEWER_EXCLUDE_TEXT_PATTERN='Internal Server Error'):
+            self.assertIsNone(read_log_entry(self.test_log_file, self.error_offset, 'django.log'))
+            with self.settings(LOG_VIEWER_FILES=['django.log'], LOG_VIEWER_FILES_DIR=self.temp_dir):
+                url = reverse('admin:log_viewer_entry', args=['django.log', self.error_offset])
+                self.assertEqual(self.client.get(url).status_code, 404)
+    
+    def test_entry_view(self):
+        """The entry endpoint returns the full content as JSON."""
+        with self.settings(LOG_VIEWER_FILES=['django.log'], LOG_VIEWER_FILES_DIR=self.temp_dir):
+            url = reverse('admin:log_viewer_entry', args=['django.log', self.error_offset])
+            response = self.client.get(url, {'line': 2})
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('Traceback', response.json()['full_content'])
+            self.assertEqual(response.json()['line_range'], '2-5')
+            
+            url = reverse('admin:log_viewer_entry', args=['missing.log', 0])
+            self.assertEqual(self.client.get(url).status_code, 404)
@@ -0,0 +1,61 @@
+"""
+Django tests for the compact log entry representation.
+"""
+
+import json
+from django.test import SimpleTestCase
+
+from mamood_django_admin_log_viewer.entries import LogEntry, LogEntryJSONEncoder
+from mamood_django_admin_log_viewer.utils import format_log_entry_lines, format_log_line, format_multiline_log_entry
+
+
+class LogEntryTestCase(SimpleTestCase):
+    """Test cases for LogEntry's dict compatibility and derived fields."""
+
+    def setUp(self):
+        self.entry = format_multiline_log_entry(
+            "ERROR 2025-08-11 11:32:27,081 django.request: " + "x" * 250 + "\nTraceback (most recent call last):\n",
+            7, 2, 'django.log', 120
+        )
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(self.entry, '__dict__'))
+
+    def test_derived_fields(self):
+        self.assertEqual(self.entry['line_range'], '7-8')
+        self.assertTrue(self.entry['is_multiline'])
+        self.assertTrue(self.entry['is_long'])
+        self.assertEqual(self.entry['content'], "x" * 200 + '...')
+        self.assertEqual(self.entry['full_content'], "x" * 250 + "\nTraceback (most recent call last):")
+        self.assertEqual(self.entry['raw_data']['module'], 'django.request')
+        self.assertEqual(format_log_line("not a log line", 3)['raw_data'], {})
+
+    def test_dict_compatibility(self):
+        """Callers can add keys, hide the full content and read everything with get()."""
+        self.entry['source_file'] = 'django.log.1'
+        self.assertEqual(self.entry.pop('full_content'), self.entry.text)
+        self.assertNotIn('full_content', self.entry)
+        self.assertIsNone(self.entry.get('full_content'))
+        self.assertEqual(self.entry['source_file'], 'django.log.1')
+        self.assertEqual(self.entry.get('missing', 'default'), 'default')
+        with self.assertRaises(KeyError):
+            self.entry['content'] = 'changed'
+
+    def test_json_shape(self):
+        """Entries serialize to the same keys the old dicts had."""
+        self.entry.pop('full_content')
+        data = json.loads(json.dumps({'log_lines': [self.entry]}, cls=LogEntryJSONEncoder))
+        self.assertEqual(set(data['log_lines'][0]), set(LogEntry.KEYS) - {'full_content'})
+        self.assertEqual(data['log_lines'][0]['offset'], 120)
+        self.assertEqual(data['log_lines'][0]['parsed_timestamp'], '2025-08-11T11:32:27.081')
+
+    def test_lines_formatted_without_rejoining(self):
+        """Grouped lines format the same as the joined entry string."""
+        lines = ["ERROR 2025-08-11 11:32:27,081 django.request: Boom\n",
+                 "Traceback (most recent call last):\n",
+                 "ValueError: bad\n"]
+        entry = format_log_entry_lines(lines, 4, 'django.log', 0)
+
+        self.assertEqual(entry['full_content'], "Boom\nTraceback (most recent call last):\nValueError: bad")
+        self.assertEqual((entry.number, entry.end_number), (4, 6))
+        self.assertEqual(entry.as_dict(), format_multiline_log_entry(''.join(lines), 4, 3, 'django.log', 0).as_dict())
@@ -0,0 +1,97 @@
+"""
+Django tests for approximate totals of huge log files.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from mamood_django_admin_log_viewer import index as index_module
+from mamood_django_admin_log_viewer.estimate import estimate_log_totals, should_estimate_totals
+from mamood_django_admin_log_viewer.index import clear_log_indexes, get_cached_log_index
+from mamood_django_admin_log_viewer.pagination import read_log_page
+
+
+class EstimatedTotalsTestCase(TestCase):
+    """Test cases for estimated totals with the exact index built in the background."""
+
+    def setUp(self):
+        clear_log_indexes()
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.temp_dir, 'app.log')
+        with open(self.log_path, 'w') as f:
+            for i in range(5000):
+                f.write(f"INFO 2025-01-01 12:00:00,000 myapp: entry {i}\n")
+                if i % 10 == 0:
+                    f.write("Traceback (most recent call last):\n")
+                    f.write(f"ValueError: bad value {i}\n")
+        self.size = os.path.getsize(self.log_path)
+
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        # Let a background build finish before its file is removed
+        while index_module._building:
+            time.sleep(0.05)
+        clear_log_indexes()
+        shutil.rmtree(self.temp_dir)
+
+    def wait_for_index(self, filename=None):
+        for _ in range(100):
+            index = get_cached_log_index(self.log_path, filename)
+            if index is not None:
+                return index
+            time.sleep(0.05)
+        self.fail('The index was not built in the background')
+
+    def test_threshold(self):
+        self.assertFalse(should_estimate_totals(self.log_path))
+        with self.settings(LOG_VIEWER_ESTIMATE_TOTALS_ABOVE=self.size):
+            self.assertFalse(should_estimate_totals(self.log_path))
+        with self.settings(LOG_VIEWER_ESTIMATE_TOTALS_ABOVE=1000):
+            self.assertTrue(should_estimate_totals(self.log_path))
+            self.assertFalse(should_estimate_totals(self.log_path + '.1.gz', size=self.size))
+
+    def test_estimate_is_close(self):
+        total_entries, total_lines, _, _ = estimate_log_totals(self.log_path, size=self.size)
+        self.assertAlmostEqual(total_entries, 5000, delta=500)
+        self.assertAlmostEqual(total_lines, 6000, delta=600)
+
+    def test_estimated_pages_then_exact(self):
+        """Estimated pages are served at once; the exact ones once the index is ready."""
+        with self.settings(LOG_VIEWER_ESTIMATE_TOTALS_ABOVE=1000):
+            last = read_log_page(self.log_path, -1, 25)
+            self.assertTrue(last['approximate'])
+            self.assertEqual(last['entries'][-1]['content'].split('\n')[0], 'entry 4999')
+            self.assertEqual(last['actual_end_line'], last['total_lines'])
+
+            first = read_log_page(self.log_path, 1, 25)
+            self.assertEqual(first['entries'][0]['content'].split('\n')[0], 'entry 0')
+            self.assertEqual(first['actual_start_line'], 1)
+
+            # A page in the middle starts at a whole entry near its estimated offset
+            middle = read_log_page(self.log_path, 100, 25)
+            self.assertEqual(len(middle['entries']), 25)
+            self.assertTrue(middle['entries'][0]['content'].startswith('entry '))
+
+            self.wait_for_index()
+            exact = read_log_page(self.log_path, -1, 25)
+        self.assertFalse(exact['approximate'])
+        self.assertEqual((exact['total_entries'], exact['total_lines'], exact['total_pages']), (5000, 6000, 200))
+
+    def test_detail_view_marks_estimates(self):
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir,
+                           LOG_VIEWER_ESTIMATE_TOTALS_ABOVE=1000):
+            response = self.client.get(reverse('admin:log_viewer_detail', args=['app.log']))
+            self.assertContains(response, 'file-badge approximate')
+            self.assertContains(response, 'approximate: true')
+
+            self.wait_for_index('app.log')
+            data = self.client.get(reverse('admin:log_viewer_ajax', args=['app.log']), {'live': 'true'}).json()
+        self.assertFalse(data['approximate'])
+        self.assertEqual(data['total_entries'], 5000)
@@ -0,0 +1,92 @@
+"""
+Django tests for excluding noise entries while log files are read.
+"""
+
+import os
+import shutil
+import tempfile
+from django.test import TestCase
+
+from mamood_django_admin_log_viewer.exclusion import Exclusion, get_exclusion, required_literals
+from mamood_django_admin_log_viewer.index import clear_log_indexes, get_log_index
+from mamood_django_admin_log_viewer.pagination import read_log_page
+from mamood_django_admin_log_viewer.stats import get_log_stats
+
+
+class RequiredLiteralsTestCase(TestCase):
+    """Test cases for the literal pre-check of exclusion patterns."""
+
+    def test_required_literals(self):
+        self.assertEqual(required_literals(r'GET /health'), ['GET /health'])
+        self.assertEqual(required_literals(r'.*health.*check.*'), ['health'])
+        self.assertEqual(required_literals(r'healthcheck|ping'), ['healthcheck', 'ping'])
+        self.assertEqual(required_literals(r'^(?:healthcheck|ping)\b'), ['healthcheck', 'ping'])
+        self.assertEqual(required_literals(r'status=\d+ path=/ready'), [' path=/ready'])
+        self.assertIsNone(required_literals(r'(?i)healthcheck'))
+        self.assertIsNone(required_literals(r'healthcheck|\d+'))
+        self.assertIsNone(required_literals(r'[a-z]+'))
+
+    def test_matches(self):
+        exclusion = Exclusion(r'GET /health\S* 200')
+        self.assertTrue(exclusion.matches(['INFO ... "GET /healthz 200"\n']))
+        self.assertFalse(exclusion.matches(['INFO ... "GET /health 500"\n']))
+        self.assertFalse(exclusion.matches(['INFO ... "GET /api 200"\n']))
+        # Continuation lines are part of the entry's text
+        self.assertTrue(exclusion.matches(['INFO probe\n', '    GET /health 200\n']))
+
+        # Patterns without a required literal are still matched
+        self.assertTrue(Exclusion(r'(?i)PING').matches(['INFO ping\n']))
+
+
+class ExclusionTestCase(TestCase):
+    """Test cases for excluded entries in pages, totals and indexes."""
+
+    def setUp(self):
+        clear_log_indexes()
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.temp_dir, 'app.log')
+        with open(self.log_path, 'w') as f:
+            for i in range(30):
+                if i % 3:
+                    f.write(f"INFO 2025-01-01 12:00:{i:02d},000 probe: healthcheck ok {i}\n")
+                else:
+                    f.write(f"ERROR 2025-01-01 12:00:{i:02d},000 myapp: failure {i}\n")
+                    f.write("Traceback (most recent call last):\n")
+
+    def tearDown(self):
+        clear_log_indexes()
+        shutil.rmtree(self.temp_dir)
+
+    def messages(self, log_data):
+        return [entry['content'].split('\n')[0] for entry in log_data['entries']]
+
+    def test_pages_and_totals_skip_excluded_entries(self):
+        with self.settings(LOG_VIEWER_EXCLUDE_TEXT_PATTERN=r'healthcheck'):
+            streamed = read_log_page(self.log_path, 1, 4, 'app.log')
+            get_log_index(self.log_path, 'app.log')
+            indexed = read_log_page(self.log_path, 1, 4, 'app.log')
+
+        for log_data in (streamed, indexed):
+            self.assertEqual(log_data['total_entries'], 10)
+            self.assertEqual(log_data['total_pages'], 3)
+            self.assertEqual(self.messages(log_data), [f'failure {i}' for i in (0, 3, 6, 9)])
+            # Line numbers are still those of the file
+            self.assertEqual([entry['number'] for entry in log_data['entries']], [1, 5, 9, 13])
+
+    def test_per_file_override(self):
+        with self.settings(LOG_VIEWER_EXCLUDE_TEXT_PATTERN=r'healthcheck',
+                           LOG_VIEWER_FILE_EXCLUDE_PATTERNS={'app.log': None}):
+            self.assertIsNone(get_exclusion('app.log'))
+            self.assertEqual(read_log_page(self.log_path, 1, 4, 'app.log')['total_entries'], 30)
+
+        with self.settings(LOG_VIEWER_FILE_EXCLUDE_PATTERNS={'app.log': r'failure'}):
+            self.assertIsNone(get_exclusion('other.log'))
+            self.assertEqual(read_log_page(self.log_path, 1, 4, 'app.log')['total_entries'], 20)
+
+    def test_index_is_rebuilt_when_the_pattern_changes(self):
+        self.assertEqual(get_log_index(self.log_path, 'app.log').total_entries, 30)
+        self.assertEqual(get_log_stats(self.log_path, 'app.log')['level_counts'], {'INFO': 20, 'ERROR': 10})
+
+        with self.settings(LOG_VIEWER_EXCLUDE_TEXT_PATTERN=r'healthcheck'):
+            self.assertEqual(get_log_index(self.log_path, 'app.log').total_entries, 10)
+            self.assertEqual(get_log_stats(self.log_path, 'app.log')['level_counts'], {'ERROR': 10})
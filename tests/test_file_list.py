@@ -0,0 +1,230 @@
+"""
+Django tests for the paginated file list and its lazily loaded rotations.
+"""
+
+import os
+import shutil
+import tempfile
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from mamood_django_admin_log_viewer import defaults, sources
+from mamood_django_admin_log_viewer.sources import clear_log_listings, discover_log_files
+from mamood_django_admin_log_viewer.utils import (classify_log_dir, extract_rotation_index, find_rotational_files,
+                                                  get_log_file_names, get_log_files, get_log_format_name,
+                                                  list_log_dir)
+
+
+class FileListTestCase(TestCase):
+    """Test cases for listing log files and rotations one page at a time."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for name in ['app.log', 'app.log.1', 'app.log.2.gz', 'app.log.2025-01-15', 'app.log.bak',
+                     'other.log.3', 'empty.log']:
+            with open(os.path.join(self.temp_dir, name), 'w') as f:
+                f.write(f"INFO 2025-01-01 12:00:00,000 myapp: {name}\n")
+        for i in range(3, 8):
+            with open(os.path.join(self.temp_dir, f'app.log.{i}'), 'w') as f:
+                f.write('x' * i)
+        os.mkdir(os.path.join(self.temp_dir, 'app.log.99'))
+
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.user)
+        settings = self.settings(LOG_VIEWER_FILES=['app.log', 'other.log', 'missing.log', 'empty.log'],
+                                 LOG_VIEWER_FILES_DIR=self.temp_dir, LOG_VIEWER_FILE_LIST_MAX_ITEMS_PER_PAGE=2)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def tearDown(self):
+        clear_log_listings()
+        shutil.rmtree(self.temp_dir)
+
+    def test_find_rotational_files(self):
+        rotational_files = find_rotational_files(self.temp_dir, 'app.log')
+        self.assertEqual([f['name'] for f in rotational_files],
+                         ['app.log', 'app.log.1', 'app.log.2.gz', 'app.log.3', 'app.log.4', 'app.log.5',
+                          'app.log.6', 'app.log.7', 'app.log.2025-01-15'])
+        self.assertTrue(rotational_files[0]['is_current'])
+        self.assertEqual(rotational_files[5]['size'], 5)
+
+        unstated = find_rotational_files(self.temp_dir, 'app.log', with_stat=False)
+        self.assertEqual([f['name'] for f in unstated], [f['name'] for f in rotational_files])
+        self.assertNotIn('size', unstated[0])
+
+    def test_classify_log_dir(self):
+        groups = classify_log_dir(list_log_dir(self.temp_dir), ['app.log', 'app.log.1', 'other.log'])
+        self.assertEqual(sorted(name for name, _, _ in groups['app.log']),
+                         ['app.log', 'app.log.2.gz', 'app.log.2025-01-15', 'app.log.3', 'app.log.4',
+                          'app.log.5', 'app.log.6', 'app.log.7'])
+        # A file is grouped under the most specific base name it extends
+        self.assertEqual([(name, index) for name, _, index in groups['app.log.1']], [('app.log.1', 0)])
+        self.assertEqual([(name, index) for name, _, index in groups['other.log']], [('other.log.3', 3)])
+
+    def test_extract_rotation_index(self):
+        self.assertEqual(extract_rotation_index('app.log', 'app.log'), 0)
+        self.assertEqual(extract_rotation_index('app.log.12', 'app.log'), 12)
+        self.assertEqual(extract_rotation_index('app.log.3.gz', 'app.log'), 3)
+        self.assertEqual(extract_rotation_index('app.log.4.bz2', 'app.log'), 4)
+        self.assertEqual(extract_rotation_index('app.log.5.zst', 'app.log'), 5)
+        self.assertGreaterEqual(extract_rotation_index('app.log.2025-01-15.xz', 'app.log'), 1000)
+        self.assertEqual(extract_rotation_index('app.log.2025-13-45', 'app.log'), 9999)
+        self.assertEqual(extract_rotation_index('app.log.1.tar', 'app.log'), 9999)
+
+    def test_each_directory_is_listed_once(self):
+        with mock.patch('os.scandir', wraps=os.scandir) as scandir:
+            log_files = get_log_files()
+        self.assertEqual(scandir.call_count, 1)
+        self.assertEqual([f['name'] for f in log_files], ['app.log', 'other.log', 'empty.log'])
+        self.assertEqual([f['name'] for f in log_files[1]['rotational_files']], ['other.log.3'])
+
+    def test_names_are_listed_without_stat(self):
+        with mock.patch('os.stat', wraps=os.stat) as stat:
+            self.assertEqual(get_log_file_names(), ['app.log', 'other.log', 'empty.log'])
+        # Only the directory is stat'ed, to validate its cached listing
+        self.assertEqual([call.args[0] for call in stat.call_args_list], [self.temp_dir])
+
+        # Only the requested files are built, with one stat per group
+        log_files = get_log_files(['app.log'], stat_rotations=False)
+        self.assertEqual(len(log_files), 1)
+        self.assertEqual(log_files[0]['file_count'], 9)
+        self.assertNotIn('size', log_files[0]['rotational_files'][1])
+
+    def test_list_is_paginated(self):
+        url = reverse('admin:log_viewer_list')
+        response = self.client.get(url)
+        self.assertEqual([f['name'] for f in response.context['log_files']], ['app.log', 'other.log'])
+        self.assertContains(response, 'Page 1 of 2')
+        self.assertContains(response, reverse('admin:log_viewer_rotations', args=['app.log']))
+        # Rotations are not rendered until their group is expanded
+        self.assertNotContains(response, 'app.log.2.gz')
+
+        response = self.client.get(url, {'page': 2})
+        self.assertEqual([f['name'] for f in response.context['log_files']], ['empty.log'])
+        self.assertEqual(self.client.get(url, {'page': 'x'}).context['page_obj'].number, 1)
+
+    def test_rotations_view(self):
+        url = reverse('admin:log_viewer_rotations', args=['app.log'])
+        first = self.client.get(url).json()
+        self.assertEqual([f['name'] for f in first['files']], ['app.log', 'app.log.1'])
+        self.assertEqual(first['total_files'], 9)
+        self.assertEqual(first['total_pages'], 5)
+        self.assertTrue(first['has_next'])
+        self.assertTrue(first['files'][0]['is_current'])
+        self.assertEqual(first['files'][1]['url'], reverse('admin:log_viewer_detail', args=['app.log.1']))
+
+        last = self.client.get(url, {'page': 5}).json()
+        self.assertEqual([f['name'] for f in last['files']], ['app.log.2025-01-15'])
+        self.assertFalse(last['has_next'])
+
+        missing = self.client.get(reverse('admin:log_viewer_rotations', args=['missing.log']))
+        self.assertEqual(missing.status_code, 404)
+
+
+class LogSourcesTestCase(TestCase):
+    """Test cases for log files discovered from directories and glob patterns."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.app_dir = os.path.join(self.temp_dir, 'app')
+        self.nginx_dir = os.path.join(self.temp_dir, 'nginx')
+        os.mkdir(self.app_dir)
+        os.mkdir(self.nginx_dir)
+        for path in [os.path.join(self.app_dir, name) for name in
+                     ['celery-worker-1.log', 'celery-worker-1.log.1', 'celery-worker-2.log', 'django.log']] + \
+                    [os.path.join(self.nginx_dir, name) for name in ['access.log', 'access.log.1.gz', 'error.log']]:
+            open(path, 'w').close()
+
+        settings = self.settings(LOG_VIEWER_FILES=['django.log'], LOG_VIEWER_FILES_DIR=self.app_dir, LOG_VIEWER_SOURCES=[
+            {'directory': self.app_dir, 'pattern': 'celery-worker-*.log', 'format': 'celery_worker'},
+            {'directory': self.nginx_dir, 'pattern': '*', 'format': 'nginx_access'},
+            {'directory': os.path.join(self.temp_dir, 'missing')},
+        ])
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def tearDown(self):
+        clear_log_listings()
+        shutil.rmtree(self.temp_dir)
+
+    def age_directory(self, directory, seconds=60):
+        """Move a directory's modification time back so its listing can be cached."""
+        mtime = os.stat(directory).st_mtime - seconds
+        os.utime(directory, (mtime, mtime))
+
+    def test_discovery(self):
+        log_files = discover_log_files()
+        self.assertEqual(list(log_files), ['django.log', 'celery-worker-1.log', 'celery-worker-2.log',
+                                           'access.log', 'error.log'])
+        self.assertEqual(log_files['access.log'], os.path.join(self.nginx_dir, 'access.log'))
+
+        groups = {f['name']: [r['name'] for r in f['rotational_files']] for f in get_log_files()}
+        self.assertEqual(groups['celery-worker-1.log'], ['celery-worker-1.log', 'celery-worker-1.log.1'])
+        self.assertEqual(groups['access.log'], ['access.log', 'access.log.1.gz'])
+
+        self.assertEqual(get_log_format_name('celery-worker-2.log'), 'celery_worker')
+        self.assertEqual(get_log_format_name('error.log'), 'nginx_access')
+        with self.settings(LOG_VIEWER_FILE_FORMATS={'error.log': 'nginx_error'}):
+            self.assertEqual(get_log_format_name('error.log'), 'nginx_error')
+
+    def test_formats_follow_the_source_that_found_the_file(self):
+        other_dir = os.path.join(self.temp_dir, 'other')
+        os.mkdir(other_dir)
+        for name in ['worker.log', 'access.log']:
+            open(os.path.join(other_dir, name), 'w').close()
+
+        with self.settings(LOG_VIEWER_SOURCES=[
+            {'directory': self.nginx_dir, 'pattern': '*.log', 'format': 'nginx_access'},
+            {'directory': other_dir, 'pattern': '*.log', 'format': 'celery_worker'},
+        ]):
+            self.assertEqual(get_log_format_name('access.log'), 'nginx_access')
+            self.assertEqual(get_log_format_name('worker.log'), 'celery_worker')
+            # Configured files and unlisted names don't take a source's format
+            self.assertEqual(get_log_format_name('django.log'), get_log_format_name('unknown.log'))
+            self.assertNotIn(get_log_format_name('django.log'), ['nginx_access', 'celery_worker'])
+
+    def test_formats_are_not_discovered_per_entry(self):
+        with open(os.path.join(self.app_dir, 'celery-worker-2.log'), 'w') as f:
+            for i in range(30):
+                f.write(f"[2025-08-11 10:00:{i:02d},000: INFO/MainProcess] Task {i} succeeded\n")
+        self.age_directory(self.app_dir)
+        self.age_directory(self.nginx_dir)
+        user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(user)
+
+        url = reverse('admin:log_viewer_ajax', args=['celery-worker-2.log'])
+        with self.settings(LOG_VIEWER_FORMATS=defaults.LOG_VIEWER_FORMATS):
+            self.client.get(url)
+            with mock.patch('mamood_django_admin_log_viewer.sources.discover_log_sources',
+                            wraps=sources.discover_log_sources) as discover:
+                response = self.client.get(url, {'page': 1})
+        self.assertEqual(len(response.json()['log_lines']), 25)
+        # Listing the files for the view, not once per entry for its format
+        self.assertLessEqual(discover.call_count, 2)
+
+        # A new file in a source directory is discovered again
+        open(os.path.join(self.app_dir, 'celery-worker-9.log'), 'w').close()
+        self.age_directory(self.app_dir)
+        self.assertEqual(get_log_format_name('celery-worker-9.log'), 'celery_worker')
+
+    def test_listings_are_cached_until_the_directory_changes(self):
+        self.age_directory(self.app_dir)
+        discover_log_files()
+        with mock.patch('os.scandir', wraps=os.scandir) as scandir:
+            discover_log_files()
+            self.assertEqual(scandir.call_count, 1)  # nginx changed too recently to be cached
+
+            # New worker files show up once the directory changes
+            open(os.path.join(self.app_dir, 'celery-worker-3.log'), 'w').close()
+            self.assertIn('celery-worker-3.log', discover_log_files())
+            self.assertEqual(scandir.call_count, 3)
+
+    def test_rotations_view(self):
+        user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(user)
+        data = self.client.get(reverse('admin:log_viewer_rotations', args=['access.log'])).json()
+        self.assertEqual([f['name'] for f in data['files']], ['access.log', 'access.log.1.gz'])
+        response = self.client.get(reverse('admin:log_viewer_detail', args=['celery-worker-2.log']))
+        self.assertEqual(response.status_code, 200)
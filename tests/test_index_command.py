@@ -0,0 +1,135 @@
+"""
+Django tests for the logviewer_index management command and saved indexes.
+"""
+
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from mamood_django_admin_log_viewer.index import (LogIndex, build_lock, clear_log_indexes, get_cached_log_index,
+                                                  get_index_status, index_file_path)
+
+
+class IndexCommandTestCase(TestCase):
+    """Test cases for pre-building entry indexes with manage.py logviewer_index."""
+
+    def setUp(self):
+        clear_log_indexes()
+        self.temp_dir = tempfile.mkdtemp()
+        self.index_dir = os.path.join(self.temp_dir, 'indexes')
+        self.log_path = os.path.join(self.temp_dir, 'app.log')
+        self.rotation_path = os.path.join(self.temp_dir, 'app.log.1')
+        self.write_entries(self.rotation_path, 0, 10)
+        self.write_entries(self.log_path, 10, 20)
+
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.user)
+        settings = self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir,
+                                 LOG_VIEWER_INDEX_DIR=self.index_dir)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def tearDown(self):
+        clear_log_indexes()
+        shutil.rmtree(self.temp_dir)
+
+    def write_entries(self, path, first, last, mode='w'):
+        with open(path, mode) as f:
+            for i in range(first, last):
+                f.write(f"ERROR 2025-01-01 12:00:{i % 60:02d},000 myapp: entry {i}\n")
+                f.write("    continuation line\n")
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command('logviewer_index', '--jobs', '1', *args, stdout=out, stderr=StringIO())
+        return out.getvalue()
+
+    def test_requires_index_dir(self):
+        with self.settings(LOG_VIEWER_INDEX_DIR=None):
+            with self.assertRaises(CommandError):
+                self.run_command()
+
+    def test_indexes_every_file(self):
+        output = self.run_command()
+        self.assertIn('[1/2]', output)
+        self.assertIn('app.log.1: 10 entries', output)
+        self.assertIn('app.log: 10 entries', output)
+
+        # Rotations are saved under their group's name, like the views look them up
+        for path in (self.log_path, self.rotation_path):
+            index = LogIndex.load(index_file_path(self.index_dir, path, 'app.log'))
+            self.assertEqual(index.total_entries, 10)
+            self.assertEqual(index.total_lines, 20)
+            self.assertEqual(index.level_names, ['ERROR'])
+
+    def test_saved_index_is_loaded(self):
+        self.run_command()
+        saved = LogIndex.load(index_file_path(self.index_dir, self.log_path, 'app.log'))
+
+        index = get_cached_log_index(self.log_path, 'app.log')
+        self.assertIsNotNone(index)
+        self.assertEqual(list(index.offsets), list(saved.offsets))
+        self.assertEqual(index.read_entries(9, 1)[0]['content'], 'entry 19\n    continuation line')
+
+        # Appended entries are scanned on top of the saved index
+        clear_log_indexes()
+        self.write_entries(self.log_path, 20, 25, mode='a')
+        index = get_cached_log_index(self.log_path, 'app.log')
+        self.assertEqual(index.total_entries, 15)
+        self.assertEqual(index.total_lines, 30)
+
+    def test_replaced_file_ignores_saved_index(self):
+        self.run_command()
+        os.remove(self.log_path)
+        self.write_entries(self.log_path, 0, 3)
+        self.assertIsNone(get_cached_log_index(self.log_path, 'app.log'))
+        self.assertEqual(get_index_status(self.log_path, 'app.log'), 'stale')
+
+    def test_status(self):
+        self.assertEqual(get_index_status(self.log_path, 'app.log'), 'none')
+        self.run_command()
+        self.assertEqual(get_index_status(self.log_path, 'app.log'), 'indexed')
+
+        self.write_entries(self.log_path, 20, 21, mode='a')
+        self.assertEqual(get_index_status(self.log_path, 'app.log'), 'stale')
+
+        # Building while any process holds the build lock, which dies with its holder
+        with build_lock(self.index_dir, self.log_path, 'app.log'):
+            self.assertEqual(get_index_status(self.log_path, 'app.log'), 'building')
+        self.assertEqual(get_index_status(self.log_path, 'app.log'), 'stale')
+
+        output = self.run_command()
+        self.assertEqual(get_index_status(self.log_path, 'app.log'), 'indexed')
+        self.assertIn('app.log: 11 entries', output)
+
+    def test_status_in_file_list(self):
+        self.run_command()
+        self.write_entries(self.log_path, 20, 21, mode='a')
+
+        response = self.client.get(reverse('admin:log_viewer_list'))
+        self.assertEqual(response.status_code, 200)
+        log_file = response.context['log_files'][0]
+        self.assertEqual(log_file['index_status'], 'stale')
+        self.assertContains(response, 'index-badge index-stale')
+
+        # Rotations get their own status when the group is expanded
+        rotations = self.client.get(reverse('admin:log_viewer_rotations', args=['app.log'])).json()
+        statuses = {rot_file['name']: rot_file['index_status'] for rot_file in rotations['files']}
+        self.assertEqual(statuses, {'app.log': 'stale', 'app.log.1': 'indexed'})
+
+    def test_watch_extends_indexes(self):
+        self.run_command()
+        self.write_entries(self.log_path, 20, 25, mode='a')
+
+        with mock.patch('time.sleep', side_effect=[None, KeyboardInterrupt]):
+            output = self.run_command('--watch', '--interval', '0')
+        self.assertIn('Stopped watching.', output)
+        index = LogIndex.load(index_file_path(self.index_dir, self.log_path, 'app.log'))
+        self.assertEqual(index.total_entries, 15)
+        self.assertEqual(get_index_status(self.log_path, 'app.log'), 'indexed')
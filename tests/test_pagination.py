@@ -0,0 +1,136 @@
+"""
+Django tests for one-pass log page reads.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from django.test import RequestFactory, TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from mamood_django_admin_log_viewer import views
+from mamood_django_admin_log_viewer.index import clear_log_indexes, get_log_index
+from mamood_django_admin_log_viewer.pagination import read_log_page, read_log_tail, resolve_page
+
+
+class ReadLogPageTestCase(TestCase):
+    """Test cases for read_log_page with and without a cached index."""
+
+    def setUp(self):
+        clear_log_indexes()
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.temp_dir, 'app.log')
+        with open(self.log_path, 'w') as f:
+            for i in range(10):
+                f.write(f"INFO 2025-01-01 12:00:{i:02d},000 myapp: entry {i}\n")
+                if i % 3 == 0:
+                    f.write("Traceback (most recent call last):\n")
+
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        clear_log_indexes()
+        shutil.rmtree(self.temp_dir)
+
+    def messages(self, log_data):
+        return [entry['content'].split('\n')[0] for entry in log_data['entries']]
+
+    def test_resolve_page(self):
+        self.assertEqual(resolve_page(-1, 4), 4)
+        self.assertEqual(resolve_page(-2, 4), 3)
+        self.assertEqual(resolve_page(-9, 4), 1)
+        self.assertEqual(resolve_page(7, 4), 4)
+
+    def test_pages(self):
+        """Positive, negative and out-of-range pages, with their totals, from a single pass."""
+        second = read_log_page(self.log_path, 2, 4)
+        self.assertEqual(self.messages(second), ['entry 4', 'entry 5', 'entry 6', 'entry 7'])
+        self.assertEqual((second['total_entries'], second['total_lines'], second['total_pages']), (10, 14, 3))
+        self.assertEqual((second['actual_start_line'], second['actual_end_line']), (7, 11))
+
+        last = read_log_page(self.log_path, -1, 4)
+        self.assertEqual(self.messages(last), ['entry 8', 'entry 9'])
+        self.assertEqual(last['current_page'], 3)
+        self.assertEqual(self.messages(read_log_page(self.log_path, -2, 4)), self.messages(second))
+        self.assertEqual(read_log_page(self.log_path, -5, 4)['current_page'], 1)
+        self.assertEqual(self.messages(read_log_page(self.log_path, 99, 4)), ['entry 8', 'entry 9'])
+        self.assertNotIn('full_content', last['entries'][0])
+
+    def test_indexed_pages_match_streamed(self):
+        streamed = [read_log_page(self.log_path, page, 4) for page in (1, 2, -1, 99)]
+        get_log_index(self.log_path)
+        indexed = [read_log_page(self.log_path, page, 4) for page in (1, 2, -1, 99)]
+
+        for streamed_page, indexed_page in zip(streamed, indexed):
+            self.assertEqual(self.messages(streamed_page), self.messages(indexed_page))
+            self.assertEqual({key: value for key, value in streamed_page.items() if key != 'entries'},
+                             {key: value for key, value in indexed_page.items() if key != 'entries'})
+
+    def test_empty_file(self):
+        open(self.log_path, 'w').close()
+        log_data = read_log_page(self.log_path, -1, 4)
+        self.assertEqual((log_data['entries'], log_data['total_entries'], log_data['total_pages']), ([], 0, 1))
+
+    def test_views_read_the_file_once(self):
+        """Live and paged views read each byte of the file once."""
+        size = os.path.getsize(self.log_path)
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir,
+                           LOG_VIEWER_PAGE_LENGTH=4, LOG_VIEWER_PROFILING=True):
+            for params in ({'live': 'true'}, {'page': 2}, {'page': -1}):
+                with self.assertLogs('mamood_django_admin_log_viewer.profiling', 'INFO') as logs:
+                    response = self.client.get(reverse('admin:log_viewer_ajax', args=['app.log']), params)
+                self.assertEqual(logs.records[0].log_viewer_profile['bytes_read'], size)
+                self.assertEqual(response.json()['total_pages'], 3)
+            self.assertEqual(response.json()['current_page'], 3)
+
+    def test_unreadable_file(self):
+        # A directory in place of the log file is listed but can't be read
+        os.mkdir(os.path.join(self.temp_dir, 'broken.log'))
+        request = RequestFactory().get('/', {'page': 1})
+        request.user = self.user
+        with self.settings(LOG_VIEWER_FILES=['broken.log'], LOG_VIEWER_FILES_DIR=self.temp_dir):
+            response = views.log_ajax_view(request, 'broken.log')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        self.assertIn('Error reading file', data['log_lines'][0]['content'])
+        self.assertFalse(data['incomplete'])
+
+    def test_tail(self):
+        size = os.path.getsize(self.log_path)
+        with self.settings(LOGVIEWER_INITIAL_NUMBER_OF_CHARS=150):
+            tail = read_log_tail(self.log_path, 4)
+        self.assertTrue(tail['tail'])
+        self.assertTrue(tail['approximate'])
+        self.assertEqual(self.messages(tail)[-1], 'entry 9')
+        # The last line is numbered by the extrapolated total
+        self.assertEqual(tail['actual_end_line'], tail['total_lines'])
+        self.assertEqual(tail['current_page'], tail['total_pages'])
+
+        with self.settings(LOGVIEWER_INITIAL_NUMBER_OF_CHARS=size):
+            self.assertIsNone(read_log_tail(self.log_path, 4))
+        with self.settings(LOGVIEWER_INITIAL_NUMBER_OF_CHARS=None):
+            self.assertIsNone(read_log_tail(self.log_path, 4))
+        with self.settings(LOGVIEWER_INITIAL_NUMBER_OF_CHARS=150):
+            get_log_index(self.log_path)
+            self.assertIsNone(read_log_tail(self.log_path, 4))
+
+    def test_detail_view_renders_the_tail_first(self):
+        size = os.path.getsize(self.log_path)
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir,
+                           LOG_VIEWER_PAGE_LENGTH=4, LOGVIEWER_INITIAL_NUMBER_OF_CHARS=150,
+                           LOG_VIEWER_PROFILING=True):
+            with self.assertLogs('mamood_django_admin_log_viewer.profiling', 'INFO') as logs:
+                response = self.client.get(reverse('admin:log_viewer_detail', args=['app.log']))
+            self.assertLessEqual(logs.records[0].log_viewer_profile['bytes_read'], 150)
+            self.assertTrue(response.context['tail'])
+            self.assertContains(response, 'tail: true')
+            self.assertContains(response, 'entry 9')
+
+            # Pages are read in full
+            response = self.client.get(reverse('admin:log_viewer_detail', args=['app.log']), {'page': 1})
+            self.assertFalse(response.context['tail'])
+            self.assertEqual(response.context['total_entries'], 10)
+        self.assertLess(150, size)
@@ -0,0 +1,92 @@
+"""
+Django tests for log format pattern guards and match-time sampling.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from mamood_django_admin_log_viewer.patterns import clear_pattern_stats, get_pattern_report
+from mamood_django_admin_log_viewer.utils import (get_log_start_pattern, iter_log_entries,
+                                                  parse_log_line_with_format)
+
+# Nested quantifiers: failing to match "aaa…a!" backtracks exponentially
+PATHOLOGICAL_FORMATS = {
+    'pathological': {
+        'pattern': r'(?P<level>[A-Z]+) (?P<message>(a+)+)$',
+        'timestamp_format': None,
+    },
+}
+
+
+class PatternGuardTestCase(TestCase):
+    """Test cases for capping and sampling entry-start pattern matches."""
+
+    def setUp(self):
+        clear_pattern_stats()
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.temp_dir, 'app.log')
+        with open(self.log_path, 'w') as f:
+            f.write("INFO aaaa\n")
+            f.write("a" * 40 + "!\n")
+            f.write("ERROR aaa\n")
+
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        clear_pattern_stats()
+        shutil.rmtree(self.temp_dir)
+
+    def pathological_settings(self, **settings):
+        return self.settings(LOG_VIEWER_FORMATS=PATHOLOGICAL_FORMATS,
+                             LOG_VIEWER_FILE_FORMATS={'app.log': 'pathological'}, **settings)
+
+    def test_unguarded_by_default(self):
+        """Without caps or sampling the plain compiled pattern is used."""
+        self.assertIsInstance(get_log_start_pattern('app.log'), re.Pattern)
+
+    def test_length_cap_bounds_matching(self):
+        """A capped line can't backtrack catastrophically; it becomes a continuation line."""
+        with self.pathological_settings(LOG_VIEWER_MAX_MATCH_LENGTH=16):
+            entries = [lines for _, _, lines in iter_log_entries(self.log_path, 'app.log')]
+
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(entries[0][1], "a" * 40 + "!\n")
+
+    def test_capped_message_is_complete(self):
+        """The message of a capped line still holds the whole rest of the line."""
+        format_config = {'pattern': r'(?P<level>\w+): (?P<message>.*)'}
+        line = "INFO: " + "x" * 50
+
+        with self.settings(LOG_VIEWER_MAX_MATCH_LENGTH=10):
+            parsed = parse_log_line_with_format(line, format_config)
+
+        self.assertEqual(parsed['message'], "x" * 50)
+
+    def test_sampled_matches_reported(self):
+        """Sampled matches over the budget are listed with their line."""
+        with self.pathological_settings(LOG_VIEWER_MAX_MATCH_LENGTH=16, LOG_VIEWER_PATTERN_SAMPLE_INTERVAL=1,
+                                        LOG_VIEWER_SLOW_MATCH_MS=0):
+            list(iter_log_entries(self.log_path, 'app.log'))
+
+        report = get_pattern_report()
+        self.assertEqual(report[0]['format_name'], 'pathological')
+        self.assertEqual(report[0]['samples'], 2)  # the first line is never matched
+        self.assertEqual(report[0]['slow_matches'], 2)
+        self.assertEqual(report[0]['slow_lines'][0]['file'], 'app.log')
+
+    def test_patterns_view(self):
+        """The report page lists sampled formats and can be reset."""
+        with self.pathological_settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir,
+                                        LOG_VIEWER_MAX_MATCH_LENGTH=16, LOG_VIEWER_PATTERN_SAMPLE_INTERVAL=2):
+            self.client.get(reverse('admin:log_viewer_detail', args=['app.log']))
+            url = reverse('admin:log_viewer_patterns')
+            self.assertContains(self.client.get(url), 'pathological')
+
+            self.assertRedirects(self.client.post(url), url)
+            self.assertContains(self.client.get(url), 'No pattern samples yet')
@@ -0,0 +1,48 @@
+"""
+Performance regression guard.
+
+The throughput check is slow and machine dependent, so it only runs with
+``LOG_VIEWER_PERF=1``; see ``benchmarks/guard.py``.
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from django.test import TestCase
+from django.contrib.auth.models import User
+
+from benchmarks.guard import find_regressions, load_baseline, measure_scores
+
+
+class RegressionComparisonTestCase(unittest.TestCase):
+    """Test cases for comparing scores with a baseline."""
+
+    def test_find_regressions(self):
+        """Only drops beyond the tolerance are reported."""
+        baseline = {'tolerance': 0.25, 'scores': {'fast': 1.0, 'slow': 1.0, 'gone': 1.0}}
+        scores = {'fast': 0.8, 'slow': 0.7, 'new': 0.1}
+
+        self.assertEqual(find_regressions(scores, baseline), [('slow', 1.0, 0.7)])
+        self.assertEqual(find_regressions(scores, baseline, tolerance=0.5), [])
+
+
+@unittest.skipUnless(os.environ.get('LOG_VIEWER_PERF'), 'set LOG_VIEWER_PERF=1 to run the performance guard')
+class PerformanceGuardTestCase(TestCase):
+    """Fail when the hot path got slower than the committed baseline allows."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_no_regressions(self):
+        scores = measure_scores(self.client, self.temp_dir)
+        regressions = find_regressions(scores, load_baseline())
+
+        self.assertEqual(regressions, [], 'Throughput regressed below the baseline: ' + ', '.join(
+            f'{case} ({score / expected:.0%} of baseline)' for case, expected, score in regressions
+        ))
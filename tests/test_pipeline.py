@@ -0,0 +1,67 @@
+"""
+Django tests for the streaming log entry pipeline.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+from django.test import TestCase
+
+from mamood_django_admin_log_viewer.utils import (filter_log_entries, format_log_entries, iter_log_entries,
+                                                  iter_log_lines, paginate_log_entries,
+                                                  process_log_lines_with_multiline,
+                                                  read_log_file_multiline_aware)
+
+
+class StreamingPipelineTestCase(TestCase):
+    """Test cases for the lazy reader, grouper, filter, formatter and paginator stages."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.temp_dir, 'app.log')
+        with open(self.log_path, 'w') as f:
+            for i in range(1, 101):
+                f.write(f"INFO 2025-01-01 12:00:{i % 60:02d},000 myapp.views: Request {i}\n")
+                if i % 10 == 0:
+                    f.write("Traceback (most recent call last):\n")
+                    f.write(f"ValueError: bad value {i}\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_stages_are_lazy(self):
+        """Taking a page stops reading at that page instead of consuming the file."""
+        lines = iter_log_lines(self.log_path)
+        entries = iter_log_entries(self.log_path)
+        page = paginate_log_entries(entries, 0, 3)
+
+        self.assertEqual([start_line for _, start_line, _ in page], [1, 2, 3])
+        # The rest of the file is still there to be read
+        self.assertEqual(sum(1 for _ in entries), 97)
+        self.assertEqual(next(lines), (0, "INFO 2025-01-01 12:00:01,000 myapp.views: Request 1\n"))
+        lines.close()
+
+    def test_filter_and_format(self):
+        """Filtered entries keep their own line numbers and offsets."""
+        entries = filter_log_entries(iter_log_entries(self.log_path), re.compile(r'ValueError'))
+        formatted = list(format_log_entries(entries))
+
+        self.assertEqual(len(formatted), 10)
+        self.assertEqual(formatted[0]['line_range'], '10-12')
+        self.assertEqual(formatted[1]['line_range'], '22-24')
+        with open(self.log_path, 'rb') as f:
+            f.seek(formatted[1]['offset'])
+            self.assertTrue(f.readline().endswith(b'Request 20\n'))
+
+    def test_same_entries_as_list_processing(self):
+        """The streaming page matches grouping the whole file in memory."""
+        with open(self.log_path) as f:
+            expected = process_log_lines_with_multiline(f.readlines(), 1)
+
+        log_data = read_log_file_multiline_aware(self.log_path, 25, 50, include_full_content=True)
+        self.assertEqual(log_data['total_entries'], 100)
+        self.assertEqual(log_data['total_lines'], 120)
+        self.assertEqual([entry['full_content'] for entry in log_data['entries']],
+                         [entry['full_content'] for entry in expected[50:75]])
+        self.assertEqual(log_data['actual_start_line'], int(expected[50]['line_range'].split('-')[0]))
@@ -0,0 +1,83 @@
+"""
+Django tests for the opt-in view profiling.
+"""
+
+import os
+import shutil
+import tempfile
+from django.test import SimpleTestCase, TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from mamood_django_admin_log_viewer.profiling import RequestProfile, _current_profile, add_count, phase
+
+
+class PhaseTestCase(SimpleTestCase):
+    """Test cases for phase timing without a request."""
+
+    def test_noop_without_profile(self):
+        """Phases and counters are ignored when nothing is being profiled."""
+        with phase('read'):
+            add_count('bytes_read', 10)
+
+    def test_nested_phases_are_exclusive(self):
+        """Time spent in a nested phase is not counted for the enclosing one."""
+        profile = RequestProfile('view')
+        token = _current_profile.set(profile)
+        try:
+            with phase('read'):
+                with phase('parse'):
+                    add_count('entries_parsed', 3)
+        finally:
+            _current_profile.reset(token)
+
+        self.assertEqual(list(profile.phases), ['parse', 'read'])
+        self.assertEqual(profile.counters['entries_parsed'], 3)
+        self.assertIn('parse;dur=', profile.server_timing())
+
+
+class ProfiledViewTestCase(TestCase):
+    """Test cases for Server-Timing headers and the debug footer."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.temp_dir, 'app.log'), 'w') as f:
+            f.write("INFO 2025-08-11 10:00:00,000 app: started\n")
+            f.write("ERROR 2025-08-11 10:00:01,000 app: failed\n")
+            f.write("Traceback (most recent call last):\n")
+
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.user)
+        self.url = reverse('admin:log_viewer_detail', args=['app.log'])
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_disabled_by_default(self):
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir):
+            response = self.client.get(self.url)
+
+        self.assertNotIn('Server-Timing', response)
+        self.assertNotContains(response, 'profile-footer')
+
+    def test_detail_view_profiled(self):
+        """Phases, bytes read and entries parsed are reported in all three places."""
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir,
+                           LOG_VIEWER_PROFILING=True):
+            with self.assertLogs('mamood_django_admin_log_viewer.profiling', 'INFO') as logs:
+                response = self.client.get(self.url)
+
+        timing = response['Server-Timing']
+        for metric in ('stat;dur=', 'read;dur=', 'parse;dur=', 'render;dur=', 'total;dur='):
+            self.assertIn(metric, timing)
+        self.assertIn('entries_parsed;desc=', timing)
+        self.assertContains(response, 'profile-footer')
+        self.assertEqual(logs.records[0].log_viewer_profile['view'], 'log_detail_view')
+        self.assertGreater(logs.records[0].log_viewer_profile['bytes_read'], 0)
+
+    def test_ajax_view_profiled(self):
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir,
+                           LOG_VIEWER_PROFILING=True):
+            response = self.client.get(reverse('admin:log_viewer_ajax', args=['app.log']))
+
+        self.assertIn('serialize;dur=', response['Server-Timing'])
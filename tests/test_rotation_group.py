@@ -0,0 +1,121 @@
+"""
+Django tests for reading a rotation group as one continuous log.
+"""
+
+import gzip
+import os
+import shutil
+import tempfile
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from mamood_django_admin_log_viewer.utils import get_log_files
+from mamood_django_admin_log_viewer.index import clear_log_indexes, get_cached_log_index, get_log_index
+from mamood_django_admin_log_viewer.rotation import read_group_log
+
+
+class RotationGroupTestCase(TestCase):
+    """Test cases for the virtual rotation group view."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        clear_log_indexes()
+
+        # Oldest rotation is gzipped, each file holds three entries
+        with gzip.open(os.path.join(self.temp_dir, 'app.log.2.gz'), 'wt') as f:
+            f.writelines(self.entries(0))
+        with open(os.path.join(self.temp_dir, 'app.log.1'), 'w') as f:
+            f.writelines(self.entries(3))
+        with open(os.path.join(self.temp_dir, 'app.log'), 'w') as f:
+            f.writelines(self.entries(6))
+
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        clear_log_indexes()
+        shutil.rmtree(self.temp_dir)
+
+    def entries(self, first):
+        lines = []
+        for number in range(first, first + 3):
+            lines.append(f"INFO 2025-08-11 10:00:{number:02d},000 app: entry {number}\n")
+            if number % 3 == 1:
+                lines.append("    continuation line\n")
+        return lines
+
+    def group(self):
+        return get_log_files()[0]
+
+    def messages(self, entries):
+        return [entry['content'].split('\n')[0] for entry in entries]
+
+    def test_pages_cross_rotation_boundaries(self):
+        """Pages run oldest to newest and span file boundaries seamlessly."""
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir):
+            first = read_group_log(self.group(), 4, 1)
+            second = read_group_log(self.group(), 4, 2)
+            last = read_group_log(self.group(), 4, None)
+
+        self.assertEqual(first['total_entries'], 9)
+        self.assertEqual(first['total_lines'], 12)
+        self.assertEqual(first['total_pages'], 3)
+        self.assertFalse(first['approximate'])
+        self.assertEqual(self.messages(first['entries']), ['entry 0', 'entry 1', 'entry 2', 'entry 3'])
+        self.assertEqual([e['source_file'] for e in first['entries']],
+                         ['app.log.2.gz', 'app.log.2.gz', 'app.log.2.gz', 'app.log.1'])
+        self.assertEqual(self.messages(second['entries']), ['entry 4', 'entry 5', 'entry 6', 'entry 7'])
+        # Global line numbers continue across files
+        self.assertEqual((second['actual_start_line'], second['actual_end_line']), (6, 11))
+        self.assertEqual(last['current_page'], 3)
+        self.assertEqual(self.messages(last['entries']), ['entry 8'])
+
+    def test_last_page_indexes_only_the_files_it_spans(self):
+        """On a cold cache, unvisited compressed rotations are estimated instead of indexed."""
+        for rotation, first in ((3, 100), (4, 200)):
+            with gzip.open(os.path.join(self.temp_dir, f'app.log.{rotation}.gz'), 'wt') as f:
+                f.writelines(self.entries(first) * 4)
+
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir), \
+                mock.patch('mamood_django_admin_log_viewer.rotation.build_log_index_in_background') as build:
+            last = read_group_log(self.group(), 3, None)
+
+        self.assertTrue(last['approximate'])
+        self.assertEqual(self.messages(last['entries']), ['entry 6', 'entry 7', 'entry 8'])
+        # Only the smallest compressed rotation is indexed, to measure the others
+        indexed = [name for name in ('app.log.2.gz', 'app.log.3.gz', 'app.log.4.gz')
+                   if get_cached_log_index(os.path.join(self.temp_dir, name), 'app.log') is not None]
+        self.assertEqual(indexed, ['app.log.2.gz'])
+        # The oldest estimated rotation is indexed in the background
+        build.assert_called_once_with(os.path.join(self.temp_dir, 'app.log.4.gz'), 'app.log')
+
+    def test_index_extends_when_file_grows(self):
+        """Appending to a live file extends its index instead of rebuilding it."""
+        path = os.path.join(self.temp_dir, 'app.log')
+        index = get_log_index(path, 'app.log')
+        self.assertEqual(index.total_entries, 3)
+
+        with open(path, 'a') as f:
+            f.write("    late continuation of entry 8\n")
+            f.write("INFO 2025-08-11 10:00:09,000 app: entry 9\n")
+
+        index = get_log_index(path, 'app.log')
+        self.assertEqual(index.total_entries, 4)
+        self.assertEqual(index.total_lines, 6)
+        last_entry = index.read_entries(2, 1)[0]
+        self.assertEqual(last_entry['line_count'], 2)
+
+    def test_group_views(self):
+        """The group page renders and its AJAX endpoint serves the last page in live mode."""
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir,
+                           LOG_VIEWER_PAGE_LENGTH=4):
+            response = self.client.get(reverse('admin:log_viewer_group', args=['app.log']), {'page': 1})
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, 'app.log.2.gz:')
+
+            response = self.client.get(reverse('admin:log_viewer_group_ajax', args=['app.log']))
+            data = response.json()
+            self.assertEqual(data['current_page'], 3)
+            self.assertIn('/app.log/entry/', data['log_lines'][0]['entry_url'])
@@ -0,0 +1,133 @@
+"""
+Django tests for searching log files and their rotations on the server.
+"""
+
+import gzip
+import os
+import re
+import shutil
+import tempfile
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from mamood_django_admin_log_viewer import search
+from mamood_django_admin_log_viewer.budget import ReadBudget
+from mamood_django_admin_log_viewer.index import clear_log_indexes
+from mamood_django_admin_log_viewer.search import compile_search, parse_search_cursor, search_log
+from mamood_django_admin_log_viewer.utils import get_log_files
+
+
+class SearchTestCase(TestCase):
+    """Test cases for searching rotation groups inline and in worker processes."""
+
+    def setUp(self):
+        clear_log_indexes()
+        self.temp_dir = tempfile.mkdtemp()
+        # Oldest rotation first; every third entry is an error
+        for index in (3, 2, 1):
+            with gzip.open(os.path.join(self.temp_dir, f'app.log.{index}.gz'), 'wt') as f:
+                f.writelines(self.entries((3 - index) * 12))
+        with open(os.path.join(self.temp_dir, 'app.log'), 'w') as f:
+            f.writelines(self.entries(36))
+
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.user)
+        settings = self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def tearDown(self):
+        clear_log_indexes()
+        shutil.rmtree(self.temp_dir)
+
+    def entries(self, first, count=12):
+        lines = []
+        for number in range(first, first + count):
+            level = 'ERROR' if number % 3 == 0 else 'INFO'
+            lines.append(f"{level} 2025-08-11 10:{number // 60:02d}:{number % 60:02d},000 app: entry {number}\n")
+        return lines
+
+    def messages(self, entries):
+        return [entry['content'].split('\n')[0] for entry in entries]
+
+    def offset(self, number):
+        """Byte offset of the entry ``number`` in app.log, whose first entry is 36."""
+        return sum(len(line) for line in self.entries(36, number))
+
+    def group(self):
+        return get_log_files()[0]
+
+    def test_results_are_in_file_order(self):
+        for workers in (1, 2):
+            with self.subTest(workers=workers), self.settings(LOG_VIEWER_SEARCH_WORKERS=workers):
+                results = search_log(self.group(), compile_search('error'), None, 5)
+                self.assertEqual(self.messages(results['entries']),
+                                 [f'entry {number}' for number in range(0, 15, 3)])
+                self.assertEqual([entry['source_file'] for entry in results['entries']],
+                                 ['app.log.3.gz'] * 4 + ['app.log.2.gz'])
+                self.assertTrue(results['has_more'])
+                self.assertFalse(results['incomplete'])
+
+                # The next page resumes after the last match instead of scanning from the start
+                regex = compile_search(r'entry 4\d$', regex=True)
+                first = search_log(self.group(), regex, None, 5)
+                self.assertEqual(first['cursor'], f'3:{self.offset(8)}:9')
+                results = search_log(self.group(), regex, parse_search_cursor(first['cursor']), 5)
+                self.assertEqual(self.messages(results['entries']),
+                                 [f'entry {number}' for number in range(45, 48)])
+                self.assertFalse(results['has_more'])
+                self.assertIsNone(results['cursor'])
+                self.assertEqual(results['files_searched'], 4)
+        search._reset_pool()
+
+    def test_incomplete_search_resumes(self):
+        with open(os.path.join(self.temp_dir, 'app.log'), 'w') as f:
+            f.writelines(self.entries(36, 200))
+        regex = compile_search('entry 235')
+
+        # Each scan may only read 150 lines before it runs out of time
+        with self.settings(LOG_VIEWER_SEARCH_WORKERS=1), \
+                mock.patch.object(search, 'ReadBudget', lambda max_seconds: ReadBudget(max_lines=150)):
+            cursor, pages = None, 0
+            while True:
+                results = search_log(self.group(), regex, cursor, 5)
+                pages += 1
+                if results['entries'] or not results['has_more']:
+                    break
+                cursor = parse_search_cursor(results['cursor'])
+        self.assertEqual(self.messages(results['entries']), ['entry 235'])
+        self.assertGreater(pages, 1)
+
+    def test_time_limit(self):
+        with open(os.path.join(self.temp_dir, 'app.log'), 'w') as f:
+            f.writelines(self.entries(0, 3000))
+
+        with self.settings(LOG_VIEWER_SEARCH_WORKERS=1, LOG_VIEWER_SEARCH_CPU_SECONDS=0):
+            results = search_log(self.group(), compile_search('no such entry'), None, 5)
+        self.assertTrue(results['incomplete'])
+        self.assertEqual(results['entries'], [])
+
+    def test_search_view(self):
+        url = reverse('admin:log_viewer_search', args=['app.log'])
+        with self.settings(LOG_VIEWER_SEARCH_WORKERS=1):
+            response = self.client.get(url, {'q': r'entry (1|4)0$', 'regex': '1'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(self.messages(data['log_lines']), ['entry 10', 'entry 40'])
+        self.assertEqual(data['log_lines'][1]['entry_url'],
+                         reverse('admin:log_viewer_entry', args=['app.log', data['log_lines'][1]['offset']])
+                         + '?line=5')
+
+        self.assertEqual(self.client.get(url, {'q': '(', 'regex': '1'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'q': 'entry', 'cursor': '1:x'}).status_code, 400)
+        self.assertEqual(self.client.get(url).status_code, 400)
+        response = self.client.get(reverse('admin:log_viewer_search', args=['missing.log']), {'q': 'x'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_compile_search(self):
+        self.assertTrue(compile_search('a.b').search('A.B'))
+        self.assertFalse(compile_search('a.b').search('axb'))
+        with self.assertRaises(re.error):
+            compile_search('(', regex=True)
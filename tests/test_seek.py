@@ -0,0 +1,114 @@
+"""
+Django tests for jumping to the first log entry at or after a timestamp.
+"""
+
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from mamood_django_admin_log_viewer.utils import get_log_files
+from mamood_django_admin_log_viewer.index import clear_log_indexes
+from mamood_django_admin_log_viewer.seek import find_offset_for_timestamp, seek_log_file
+
+START = datetime(2025, 8, 11, 10, 0, 0)
+
+
+class TimeSeekTestCase(TestCase):
+    """Test cases for the byte-offset binary search over log files."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        clear_log_indexes()
+
+        # Large enough for several binary search steps, one entry every two
+        # seconds and a traceback every tenth entry
+        self.path = os.path.join(self.temp_dir, 'app.log')
+        self.offsets = []
+        offset = 0
+        with open(self.path, 'w') as f:
+            for number in range(5000):
+                timestamp = START + timedelta(seconds=2 * number)
+                text = f"INFO {timestamp:%Y-%m-%d %H:%M:%S},000 app.views: entry {number}\n"
+                if number % 10 == 0:
+                    text += "Traceback (most recent call last):\n    raise ValueError()\n"
+                self.offsets.append(offset)
+                f.write(text)
+                offset += len(text)
+
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        clear_log_indexes()
+        shutil.rmtree(self.temp_dir)
+
+    def test_find_offset_for_timestamp(self):
+        """The search lands on the first entry at or after the target."""
+        for number in (0, 1, 1234, 2500, 4999):
+            exact = START + timedelta(seconds=2 * number)
+            self.assertEqual(find_offset_for_timestamp(self.path, exact, 'app.log'), self.offsets[number])
+            # Between two entries the later one is found
+            between = exact - timedelta(seconds=1)
+            self.assertEqual(find_offset_for_timestamp(self.path, between, 'app.log'), self.offsets[number])
+
+        self.assertEqual(find_offset_for_timestamp(self.path, START - timedelta(days=1), 'app.log'), 0)
+        self.assertIsNone(find_offset_for_timestamp(self.path, START + timedelta(days=1), 'app.log'))
+
+    def test_rotation_picked_by_modification_time(self):
+        """For rotation groups the file is chosen from the file mtimes."""
+        rotated = os.path.join(self.temp_dir, 'app.log.1')
+        with open(rotated, 'w') as f:
+            f.write(f"INFO {START - timedelta(hours=1):%Y-%m-%d %H:%M:%S},000 app.views: old entry\n")
+        old_mtime = (START - timedelta(minutes=59)).timestamp()
+        os.utime(rotated, (old_mtime, old_mtime))
+
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir):
+            group = get_log_files()[0]
+
+        result = seek_log_file(group, START - timedelta(hours=2))
+        self.assertEqual((result['file']['name'], result['offset']), ('app.log.1', 0))
+
+        result = seek_log_file(group, START + timedelta(seconds=20))
+        self.assertEqual((result['file']['name'], result['offset']), ('app.log', self.offsets[10]))
+
+    def test_seek_view_and_offset_page(self):
+        """The seek endpoint links to the page holding the found entry."""
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir,
+                           LOG_VIEWER_PAGE_LENGTH=25):
+            url = reverse('admin:log_viewer_seek', args=['app.log'])
+            data = self.client.get(url, {'time': '2025-08-11T10:10:00'}).json()
+            self.assertEqual(data['offset'], self.offsets[300])
+            self.assertIn(f'?offset={self.offsets[300]}', data['url'])
+
+            response = self.client.get(data['url'])
+            self.assertEqual(response.context['current_page'], 13)
+            self.assertContains(response, 'entry 300')
+
+            # Once indexed, the page number is resolved directly
+            data = self.client.get(url, {'time': '2025-08-11T10:10:00'}).json()
+            self.assertEqual(data['page'], 13)
+
+            self.assertEqual(self.client.get(url, {'time': 'yesterday'}).status_code, 400)
+
+    def test_offset_page_beyond_read_budget(self):
+        """An offset past what the read budget could index opens at that entry, not a page of the partial index."""
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir,
+                           LOG_VIEWER_PAGE_LENGTH=25, LOG_VIEWER_MAX_READ_LINES=1000), \
+                mock.patch('mamood_django_admin_log_viewer.pagination.build_log_index_in_background'):
+            url = reverse('admin:log_viewer_detail', args=['app.log'])
+            response = self.client.get(url, {'offset': self.offsets[4000]})
+            self.assertTrue(response.context['approximate'])
+            self.assertEqual(response.context['log_lines'][0]['content'].split('\n')[0], 'entry 4000')
+            # Estimated from the density of the part indexed so far
+            self.assertAlmostEqual(response.context['current_page'], 4000 // 25 + 1, delta=5)
+
+            # Within the partial index, the page and line numbers are exact
+            response = self.client.get(url, {'offset': self.offsets[310]})
+            self.assertEqual(response.context['current_page'], 13)
+            self.assertEqual(response.context['log_lines'][10]['content'].split('\n')[0], 'entry 310')
+            self.assertEqual(response.context['start_line'], 300 + 2 * 30 + 1)
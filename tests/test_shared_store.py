@@ -0,0 +1,127 @@
+"""
+Django tests for sharing entry indexes and scan results between processes.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
+from django.core.cache import caches
+from django.test import TestCase
+
+from mamood_django_admin_log_viewer.concurrency import ScansBusy, run_scan
+from mamood_django_admin_log_viewer.index import (LogIndex, build_lock, build_log_index_in_background,
+                                                  clear_log_indexes, get_cached_log_index, get_log_index,
+                                                  index_file_path)
+
+
+class SharedIndexTestCase(TestCase):
+    """Test cases for building each index in one process and loading it in the others."""
+
+    def setUp(self):
+        clear_log_indexes()
+        self.temp_dir = tempfile.mkdtemp()
+        self.index_dir = os.path.join(self.temp_dir, 'indexes')
+        self.log_path = os.path.join(self.temp_dir, 'app.log')
+        with open(self.log_path, 'w') as f:
+            for i in range(20):
+                f.write(f"ERROR 2025-01-01 12:00:{i:02d},000 myapp: entry {i}\n")
+        settings = self.settings(LOG_VIEWER_INDEX_DIR=self.index_dir, LOG_VIEWER_INDEX_LOCK_TIMEOUT=0)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def tearDown(self):
+        clear_log_indexes()
+        shutil.rmtree(self.temp_dir)
+
+    def saved_path(self):
+        return index_file_path(self.index_dir, self.log_path, 'app.log')
+
+    def test_built_index_is_saved_for_other_processes(self):
+        self.assertEqual(get_log_index(self.log_path, 'app.log').total_entries, 20)
+        self.assertTrue(os.path.exists(self.saved_path()))
+
+        # Another process loads it without scanning the file
+        clear_log_indexes()
+        with mock.patch.object(LogIndex, '_scan', side_effect=AssertionError('scanned')):
+            self.assertEqual(get_log_index(self.log_path, 'app.log').total_entries, 20)
+
+    def test_request_waits_for_build_in_another_process(self):
+        built = LogIndex(self.log_path, 'app.log').update()
+        locked = threading.Event()
+
+        def other_process():
+            with build_lock(self.index_dir, self.log_path, 'app.log'):
+                locked.set()
+                time.sleep(0.2)
+                built.save(self.index_dir)
+
+        thread = threading.Thread(target=other_process)
+        thread.start()
+        self.assertTrue(locked.wait(5))
+        try:
+            with self.settings(LOG_VIEWER_INDEX_LOCK_TIMEOUT=5), \
+                    mock.patch.object(LogIndex, '_scan', side_effect=AssertionError('scanned')):
+                self.assertEqual(get_log_index(self.log_path, 'app.log').total_entries, 20)
+        finally:
+            thread.join(5)
+
+    def test_degraded_while_another_process_builds(self):
+        with build_lock(self.index_dir, self.log_path, 'app.log'):
+            # A request past the lock timeout scans on its own, without saving
+            self.assertEqual(get_log_index(self.log_path, 'app.log').total_entries, 20)
+            self.assertFalse(os.path.exists(self.saved_path()))
+
+            # Background builds leave the file to the process holding the lock
+            clear_log_indexes()
+            build_log_index_in_background(self.log_path, 'app.log').join(5)
+            self.assertIsNone(get_cached_log_index(self.log_path, 'app.log'))
+
+            # ... and pick up its index once it is saved
+            LogIndex(self.log_path, 'app.log').update().save(self.index_dir)
+        self.assertEqual(get_cached_log_index(self.log_path, 'app.log').total_entries, 20)
+
+
+class SharedResultCacheTestCase(TestCase):
+    """Test cases for sharing scan results through a Django cache."""
+
+    def setUp(self):
+        self.calls = []
+        settings = self.settings(
+            CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                                'LOCATION': 'log-viewer-tests'}},
+            LOG_VIEWER_RESULT_CACHE='default',
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+
+    def scan(self, value, incomplete=False):
+        self.calls.append(value)
+        return {'value': value, 'incomplete': incomplete}
+
+    def test_final_results_are_shared(self):
+        self.assertEqual(run_scan(('app.log', 1), self.scan, 1), {'value': 1, 'incomplete': False})
+        # Served from the cache, as to any other process
+        self.assertEqual(run_scan(('app.log', 1), self.scan, 2), {'value': 1, 'incomplete': False})
+        self.assertEqual(self.calls, [1])
+
+        # Another file generation is scanned again
+        run_scan(('app.log', 2), self.scan, 3)
+        self.assertEqual(self.calls, [1, 3])
+
+    def test_shared_results_need_no_scan_slot(self):
+        run_scan(('app.log', 1), self.scan, 1)
+        with self.settings(LOG_VIEWER_MAX_CONCURRENT_SCANS=0):
+            self.assertEqual(run_scan(('app.log', 1), self.scan, 2), {'value': 1, 'incomplete': False})
+            with self.assertRaises(ScansBusy):
+                run_scan(('app.log', 2), self.scan, 3)
+        self.assertEqual(self.calls, [1])
+
+    def test_incomplete_results_are_not_shared(self):
+        run_scan(('app.log', 1), self.scan, 1, incomplete=True)
+        run_scan(('app.log', 1), self.scan, 2, incomplete=True)
+        self.assertEqual(self.calls, [1, 2])
@@ -0,0 +1,131 @@
+"""
+Django tests for aggregated log statistics.
+"""
+
+import os
+import shutil
+import tempfile
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from unittest import mock
+
+from mamood_django_admin_log_viewer import index as index_module
+from mamood_django_admin_log_viewer.index import LogIndex, clear_log_indexes
+from mamood_django_admin_log_viewer.stats import compute_log_stats, get_log_stats
+from mamood_django_admin_log_viewer.utils import get_message_template
+
+
+class LogStatsTestCase(TestCase):
+    """Test cases for statistics computed from the entry index."""
+
+    def setUp(self):
+        clear_log_indexes()
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.temp_dir, 'app.log')
+        self.write_log([
+            "INFO 2025-08-11 08:00:00,000 views: Request 1 took 10ms\n",
+            "INFO 2025-08-11 10:00:00,000 views: Request 2 took 12ms\n",
+            "ERROR 2025-08-11 10:00:30,000 db: Query failed for user 'bob'\n",
+            "Traceback (most recent call last):\n",
+            "INFO 2025-08-11 10:01:10,000 views: Request 3 took 9ms\n",
+            "WARNING 2025-08-11 10:02:00,000 db: Slow query 250ms\n",
+        ])
+
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        clear_log_indexes()
+        shutil.rmtree(self.temp_dir)
+
+    def write_log(self, lines, mode='w'):
+        with open(self.log_path, mode) as f:
+            f.writelines(lines)
+
+    def test_message_templates(self):
+        """Variable parts of messages are masked."""
+        self.assertEqual(get_message_template("Request 12 took 10ms"), "Request * took *ms")
+        self.assertEqual(get_message_template("Query failed for user 'bob'"), "Query failed for user *")
+
+    def test_counts_and_top_lists(self):
+        """Levels, loggers and message templates are counted per entry."""
+        stats = get_log_stats(self.log_path)
+
+        self.assertEqual(stats['total_entries'], 5)
+        self.assertEqual(stats['level_counts'], {'INFO': 3, 'ERROR': 1, 'WARNING': 1})
+        self.assertEqual(stats['top_loggers'], [{'name': 'views', 'count': 3}, {'name': 'db', 'count': 2}])
+        self.assertEqual(stats['top_templates'][0], {'name': 'Request * took *ms', 'count': 3})
+
+    def test_window_and_histogram(self):
+        """Only the window before the newest entry is bucketed."""
+        stats = get_log_stats(self.log_path, bucket_seconds=60, hours=0.5)
+
+        self.assertEqual(stats['total_entries'], 4)
+        self.assertEqual(stats['buckets'][-3:], [
+            '2025-08-11T10:00:00', '2025-08-11T10:01:00', '2025-08-11T10:02:00',
+        ])
+        self.assertEqual(stats['histogram']['INFO'][-3:], [1, 1, 0])
+        self.assertEqual(stats['histogram']['ERROR'][-3:], [1, 0, 0])
+        self.assertEqual(stats['histogram']['WARNING'][-3:], [0, 0, 1])
+
+    def test_cached_per_generation(self):
+        """Results are reused until the file changes, then extended."""
+        first = get_log_stats(self.log_path)
+        self.assertIs(get_log_stats(self.log_path), first)
+
+        self.write_log(["CRITICAL 2025-08-11 10:03:00,000 db: Connection lost\n"], mode='a')
+        updated = get_log_stats(self.log_path)
+
+        self.assertEqual(updated['total_entries'], 6)
+        self.assertEqual(updated['level_counts']['CRITICAL'], 1)
+
+    def test_entries_before_first_timestamp(self):
+        """Leading entries without a timestamp are counted but not placed in time."""
+        self.write_log(["Starting up\n"] + open(self.log_path).readlines())
+        stats = get_log_stats(self.log_path, bucket_seconds=3600)
+
+        self.assertEqual(stats['total_entries'], 6)
+        self.assertEqual(stats['buckets'], ['2025-08-11T08:00:00', '2025-08-11T09:00:00', '2025-08-11T10:00:00'])
+        self.assertEqual(stats['histogram']['INFO'], [1, 0, 2])
+        self.assertEqual(get_log_stats(self.log_path, hours=0.5)['total_entries'], 4)
+
+    def test_aggregates_extended_incrementally(self):
+        """Counts kept while appending match a fresh index, and templates are capped."""
+        index = LogIndex(self.log_path).update()
+        with mock.patch.object(index_module, 'MAX_TEMPLATES', 3):
+            self.write_log(["INFO 2025-08-11 10:02:30,000 db: Slow query 90ms\n",
+                            "INFO 2025-08-11 10:59:00,000 jobs: Queue drained\n",
+                            "Traceback (most recent call last):\n",
+                            "ERROR 2025-08-11 11:30:00,000 jobs: Retry scheduled\n"], mode='a')
+            index.update()
+            fresh = LogIndex(self.log_path).update()
+
+        self.assertIn('(other messages)', index.template_names)
+        self.assertLessEqual(len(index.template_names), 4)
+        for hours in (None, 1, 3):
+            with self.subTest(hours=hours):
+                self.assertEqual(compute_log_stats(index, hours=hours), compute_log_stats(fresh, hours=hours))
+        stats = compute_log_stats(index, bucket_seconds=1800, hours=1)
+        self.assertEqual(stats['total_entries'], 2)
+        self.assertEqual(stats['level_counts'], {'INFO': 1, 'ERROR': 1})
+        self.assertEqual(stats['bucket_seconds'], 1800)
+
+    def test_stats_view(self):
+        """The statistics endpoint returns JSON and validates its parameters."""
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir):
+            url = reverse('admin:log_viewer_stats', args=['app.log'])
+            response = self.client.get(url, {'bucket': '3600', 'top': '1'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['top_loggers'], [{'name': 'views', 'count': 3}])
+            self.assertEqual(response.json()['bucket_seconds'], 3600)
+
+            for hours in ('soon', 'nan', 'inf', '-inf', '-2', '0'):
+                with self.subTest(hours=hours):
+                    self.assertEqual(self.client.get(url, {'hours': hours}).status_code, 400)
+            missing = reverse('admin:log_viewer_stats', args=['missing.log'])
+            self.assertEqual(self.client.get(missing).status_code, 404)
+
+            response = self.client.get(reverse('admin:log_viewer_detail', args=['app.log']))
+            self.assertContains(response, 'stats-chart')
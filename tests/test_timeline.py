@@ -0,0 +1,122 @@
+"""
+Django tests for the merged multi-file timeline.
+"""
+
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+from mamood_django_admin_log_viewer.utils import get_log_files
+from mamood_django_admin_log_viewer import timeline
+from mamood_django_admin_log_viewer.budget import ReadBudget, read_budget
+from mamood_django_admin_log_viewer.timeline import read_timeline
+
+
+class TimelineTestCase(TestCase):
+    """Test cases for merging several log files by timestamp."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+        self.write_log('app.log.1', [
+            "INFO 2025-08-11 10:00:00,000 app: app rotated 1\n",
+            "INFO 2025-08-11 10:00:04,000 app: app rotated 2\n",
+        ])
+        self.write_log('app.log', [
+            "INFO 2025-08-11 10:00:10,000 app: app current 1\n",
+            "ERROR 2025-08-11 10:00:12,000 app: app current 2\n",
+            "Traceback (most recent call last):\n",
+            "ValueError: boom\n",
+        ])
+        self.write_log('worker.log', [
+            "INFO 2025-08-11 10:00:02,000 worker: worker 1\n",
+            "INFO 2025-08-11 10:00:11,000 worker: worker 2\n",
+        ])
+
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_log(self, name, lines):
+        with open(os.path.join(self.temp_dir, name), 'w') as f:
+            f.writelines(lines)
+
+    def messages(self, entries):
+        return [entry['content'].split('\n')[0] for entry in entries]
+
+    def test_entries_merged_by_timestamp(self):
+        """Entries from all files and rotations come out in chronological order."""
+        with self.settings(LOG_VIEWER_FILES=['app.log', 'worker.log'], LOG_VIEWER_FILES_DIR=self.temp_dir):
+            timeline = read_timeline(get_log_files(), page_length=25)
+
+        self.assertEqual(self.messages(timeline['entries']), [
+            'app rotated 1', 'worker 1', 'app rotated 2', 'app current 1', 'worker 2', 'app current 2',
+        ])
+        self.assertEqual(timeline['entries'][1]['source'], 'worker.log')
+        self.assertEqual(timeline['entries'][0]['source_file'], 'app.log.1')
+        self.assertTrue(timeline['entries'][-1]['is_multiline'])
+        self.assertFalse(timeline['has_more'])
+
+    def test_pagination_and_since(self):
+        """Pages and the since filter are applied to the merged stream."""
+        with self.settings(LOG_VIEWER_FILES=['app.log', 'worker.log'], LOG_VIEWER_FILES_DIR=self.temp_dir):
+            log_files = get_log_files()
+            first_page = read_timeline(log_files, page=1, page_length=4)
+            second_page = read_timeline(log_files, page=2, page_length=4)
+            since = read_timeline(log_files, page_length=25, since=datetime(2025, 8, 11, 10, 0, 10))
+            worker_only = read_timeline(log_files, names=['worker.log'], page_length=25)
+
+        self.assertTrue(first_page['has_more'])
+        self.assertEqual(self.messages(second_page['entries']), ['worker 2', 'app current 2'])
+        self.assertEqual(self.messages(since['entries']), ['app current 1', 'worker 2', 'app current 2'])
+        self.assertEqual(self.messages(worker_only['entries']), ['worker 1', 'worker 2'])
+
+    def test_since_seeks_past_earlier_entries(self):
+        """Entries before since are neither parsed nor formatted, and only the page is formatted."""
+        self.write_log('app.log', [f"INFO 2025-08-11 10:{i // 60:02d}:{i % 60:02d},000 app: entry {i}\n"
+                                   for i in range(600)])
+        os.remove(os.path.join(self.temp_dir, 'app.log.1'))
+
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir), \
+                mock.patch.object(timeline, 'format_log_entry_lines',
+                                  wraps=timeline.format_log_entry_lines) as format_entry, \
+                mock.patch.object(timeline, '_parse_entry_timestamp',
+                                  wraps=timeline._parse_entry_timestamp) as parse_timestamp:
+            result = read_timeline(get_log_files(), page_length=5, since=datetime(2025, 8, 11, 10, 9, 50))
+
+        self.assertEqual(self.messages(result['entries']), [f'entry {i}' for i in range(590, 595)])
+        self.assertTrue(result['has_more'])
+        self.assertEqual(format_entry.call_count, 5)
+        self.assertLessEqual(parse_timestamp.call_count, 6)
+
+    def test_timeline_views(self):
+        """The timeline page renders and its AJAX endpoint honors the query parameters."""
+        with self.settings(LOG_VIEWER_FILES=['app.log', 'worker.log'], LOG_VIEWER_FILES_DIR=self.temp_dir):
+            response = self.client.get(reverse('admin:log_viewer_timeline'))
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, 'app.log.1')
+
+            response = self.client.get(reverse('admin:log_viewer_timeline_ajax'),
+                                       {'files': 'worker.log', 'since': '2025-08-11T10:00:05'})
+            self.assertEqual(self.messages(response.json()['log_lines']), ['worker 2'])
+
+    def test_since_counts_lines_within_read_budget(self):
+        """Counting the lines before a seeked entry is charged to the read budget."""
+        self.write_log('app.log', [f"INFO 2025-08-11 10:{i // 60:02d}:{i % 60:02d},000 app: entry {i}\n"
+                                   for i in range(600)])
+        os.remove(os.path.join(self.temp_dir, 'app.log.1'))
+
+        with self.settings(LOG_VIEWER_FILES=['app.log'], LOG_VIEWER_FILES_DIR=self.temp_dir), \
+                read_budget(ReadBudget(max_bytes=1000)) as budget:
+            result = read_timeline(get_log_files(), page_length=5, since=datetime(2025, 8, 11, 10, 9, 50))
+
+        self.assertTrue(budget.exhausted)
+        self.assertTrue(result['incomplete'])
+        self.assertEqual(result['entries'], [])